@@ -0,0 +1,98 @@
+"""Incremental parsing of `POST /jobs/bulk` request bodies.
+
+`jobs.py` feeds the raw `request.stream()` chunks to `iter_bulk_batches`, which
+splits them into lines as they arrive and turns each line into a canonical
+PubMed URL with `normalize_pubmed_url` (bare PMIDs are accepted too).  Lines
+that cannot be used are reported individually instead of failing the request,
+and accepted URLs are handed back `batch_size` at a time so the route can
+append them to the repository while the rest of the body is still uploading.
+
+Two body formats are understood: plain text with one URL or PMID per line, and
+NDJSON whose lines are a JSON string, a number, or an object with a `url` or
+`pmid` field.
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+from dataclasses import dataclass, field
+from typing import AsyncIterator
+
+from ..services.resolver.exceptions import ResolverError
+from ..services.resolver.url_utils import normalize_pubmed_url, pubmed_article_url
+
+
+MAX_LINE_CHARS = 4_096
+
+
+class BulkFormatError(ValueError):
+    """Raised when the body cannot be split into lines at all."""
+
+
+@dataclass(slots=True)
+class BulkBatch:
+    urls: list[str] = field(default_factory=list)
+    # (1-based line number, reason) for each rejected line.
+    rejected: list[tuple[int, str]] = field(default_factory=list)
+
+
+async def iter_bulk_batches(
+    chunks: AsyncIterator[bytes], *, ndjson: bool, batch_size: int = 5_000
+) -> AsyncIterator[BulkBatch]:
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    partial = ""
+    line_number = 0
+    batch = BulkBatch()
+    async for chunk in chunks:
+        lines = (partial + decoder.decode(chunk)).split("\n")
+        partial = lines.pop()
+        if len(partial) > MAX_LINE_CHARS:
+            raise BulkFormatError(
+                f"Line {line_number + 1} is longer than {MAX_LINE_CHARS} characters"
+            )
+        for line in lines:
+            line_number += 1
+            _add_line(batch, line_number, line, ndjson)
+        if len(batch.urls) >= batch_size:
+            yield batch
+            batch = BulkBatch()
+    partial += decoder.decode(b"", final=True)
+    if partial:
+        _add_line(batch, line_number + 1, partial, ndjson)
+    if batch.urls or batch.rejected:
+        yield batch
+
+
+def parse_entry(line: str, *, ndjson: bool) -> str:
+    """Return the canonical PubMed URL for one body line or raise `ValueError`."""
+
+    value = line.strip()
+    if ndjson:
+        try:
+            decoded = json.loads(value)
+        except json.JSONDecodeError as exc:
+            raise ValueError("Invalid JSON") from exc
+        if isinstance(decoded, dict):
+            decoded = decoded.get("url", decoded.get("pmid"))
+        if isinstance(decoded, int) and not isinstance(decoded, bool):
+            decoded = str(decoded)
+        if not isinstance(decoded, str):
+            raise ValueError("Expected a PubMed URL or PMID")
+        value = decoded.strip()
+    if value.isascii() and value.isdigit():
+        return pubmed_article_url(value)
+    try:
+        url, _ = normalize_pubmed_url(value)
+    except ResolverError as exc:
+        raise ValueError(str(exc)) from exc
+    return url
+
+
+def _add_line(batch: BulkBatch, line_number: int, line: str, ndjson: bool) -> None:
+    if not line.strip():
+        return
+    try:
+        batch.urls.append(parse_entry(line, ndjson=ndjson))
+    except ValueError as exc:
+        batch.rejected.append((line_number, str(exc)))
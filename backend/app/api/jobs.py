@@ -1,102 +1,936 @@
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+import asyncio
+import logging
+from functools import lru_cache
+from typing import AsyncIterator, Iterable
 
-from .schemas.jobs import JobCreate, JobCreated, JobItemStatus, JobState, JobStatus, map_job_record
+import httpx
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    status,
+)
+from fastapi.responses import StreamingResponse
+
+from .bulk import BulkFormatError, iter_bulk_batches
+from .exports import iter_csv, iter_ndjson, iter_zip
+from .schemas.jobs import (
+    ExportFormat,
+    JobBulkCreated,
+    JobCreate,
+    JobCreated,
+    JobItemStatus,
+    JobState,
+    JobChanges,
+    JobStatus,
+    JobSummary,
+    RejectedLine,
+    map_job_changes,
+    map_job_page,
+    map_job_summary,
+)
 from ..core.config import get_settings
-from ..repositories.jobs_repo import InMemoryJobsRepository, JobItemRecord
-from ..services.resolver import PubmedResolverManager, build_default_resolver
+from ..repositories.jobs_repo import InMemoryJobsRepository, JobItemRecord, JobsRepository
+from ..repositories.sqlite_jobs_repo import SqliteJobsRepository
+from ..services.download import BlobStore, DownloadError, PdfDownloader
+from ..services.resolver import (
+    AsyncPubmedResolverManager,
+    build_default_async_resolver,
+    build_rate_limiter,
+    build_robots_policy,
+)
 from ..services.resolver.manager import ResolverConfig
+from ..services.resolver.prebaked_responses import MOCK_PDF_BYTES, MOCK_SEARCH_RESULTS
+from ..services.resolver.rate_limit import HostRateLimiter
+from ..services.resolver.retry import RetryPolicy
+from ..services.resolver.url_utils import pubmed_article_url
+from ..services.queue import SqliteTaskQueue, TaskQueue
+from ..services.scheduler import FairScheduler
+from ..services.search import PmidSearcher, PubmedSearchClient, SearchError, StaticSearchClient
 
 
 router = APIRouter()
+_LOGGER = logging.getLogger(__name__)
 
-
-jobs_repo = InMemoryJobsRepository()
+_FINISHED_STATES = frozenset(
+    {JobState.done.value, JobState.failed.value, JobState.cancelled.value}
+)
+_MAX_CHANGES_PER_RESPONSE = 1_000
+_ITEM_PAGE_SIZE = 500
+_MAX_REJECTED_LINES_REPORTED = 100
+_BULK_CONTENT_TYPES = {
+    "text/plain": False,
+    "application/x-ndjson": True,
+    "application/ndjson": True,
+    "application/jsonl": True,
+}
 
 
-def _build_resolver() -> PubmedResolverManager:
+def resolver_config() -> ResolverConfig:
     settings = get_settings()
-    config = ResolverConfig(
+    return ResolverConfig(
         timeout=settings.resolver_timeout_seconds,
         retries=settings.resolver_retries,
         user_agent=settings.resolver_user_agent,
         mock_mode=settings.resolver_mock_mode,
+        host_requests_per_second=settings.resolver_host_requests_per_second,
+        host_burst=settings.resolver_host_burst,
+        host_max_in_flight=settings.resolver_host_max_in_flight,
+        host_rate_overrides=settings.resolver_host_rate_overrides,
+        max_connections=settings.resolver_max_connections,
+        max_keepalive_connections=settings.resolver_max_keepalive_connections,
+        cache_dir=settings.resolver_cache_dir,
+        cache_ttl_seconds=settings.resolver_cache_ttl_seconds,
+        cache_max_bytes=settings.resolver_cache_max_bytes,
+        resolution_cache_path=settings.resolution_cache_path,
+        resolution_ttl_seconds=settings.resolution_ttl_seconds,
+        resolution_failure_ttl_seconds=settings.resolution_failure_ttl_seconds,
+        parser_backend=settings.resolver_parser_backend,
+        streaming_parse=settings.resolver_streaming_parse,
+        streaming_stop_at_pmcid=settings.resolver_streaming_stop_at_pmcid,
+        pmc_fast_path=settings.resolver_pmc_fast_path,
+        idconv_enabled=settings.resolver_idconv_enabled,
+        idconv_url=settings.resolver_idconv_url,
+        idconv_batch_size=settings.resolver_idconv_batch_size,
+        idconv_tool=settings.ncbi_tool,
+        idconv_email=settings.ncbi_email,
+        race_branches=settings.resolver_race_branches,
+        external_max_candidates=settings.resolver_external_max_candidates,
+        external_max_depth=settings.resolver_external_max_depth,
+        external_max_bytes=settings.resolver_external_max_bytes,
+        external_timeout=settings.resolver_external_timeout_seconds,
+        publisher_rules=settings.resolver_publisher_rules,
+        respect_robots=settings.resolver_respect_robots,
+        robots_cache_path=settings.resolver_robots_cache_path,
+        robots_ttl_seconds=settings.resolver_robots_ttl_seconds,
+        robots_failure_ttl_seconds=settings.resolver_robots_failure_ttl_seconds,
+        robots_max_hosts=settings.resolver_robots_max_hosts,
+        robots_max_crawl_delay=settings.resolver_robots_max_crawl_delay_seconds,
+    )
+
+
+def build_retry_policy() -> RetryPolicy:
+    settings = get_settings()
+    return RetryPolicy(
+        max_attempts=settings.retry_max_attempts,
+        base_delay=settings.retry_base_delay_seconds,
+        max_delay=settings.retry_max_delay_seconds,
+        job_budget=settings.retry_job_budget,
+    )
+
+
+def build_jobs_repo() -> JobsRepository:
+    settings = get_settings()
+    if settings.jobs_backend == "sqlite":
+        return SqliteJobsRepository(
+            settings.jobs_db_path,
+            batch_size=settings.jobs_write_batch_size,
+            flush_interval=settings.jobs_write_flush_seconds,
+        )
+    if settings.jobs_backend == "memory":
+        return InMemoryJobsRepository()
+    raise ValueError(f"Unknown jobs backend: {settings.jobs_backend}")
+
+
+def _build_searcher(rate_limiter: HostRateLimiter) -> PmidSearcher:
+    settings = get_settings()
+    if settings.resolver_mock_mode:
+        return StaticSearchClient(MOCK_SEARCH_RESULTS)
+    return PubmedSearchClient(
+        base_url=settings.search_base_url,
+        batch_size=settings.search_batch_size,
+        timeout=settings.resolver_timeout_seconds,
+        user_agent=settings.resolver_user_agent,
+        tool=settings.ncbi_tool,
+        email=settings.ncbi_email,
+        api_key=settings.search_api_key,
+        rate_limiter=rate_limiter,
+    )
+
+
+def build_task_queue() -> TaskQueue | None:
+    settings = get_settings()
+    if settings.jobs_dispatch == "inline":
+        return None
+    if settings.jobs_dispatch != "queue":
+        raise ValueError(f"Unknown jobs dispatch mode: {settings.jobs_dispatch}")
+    if settings.jobs_backend == "memory":
+        raise ValueError("Queue dispatch needs a jobs backend shared with the workers")
+    return SqliteTaskQueue(settings.queue_db_path)
+
+
+def build_resolver(rate_limiter: HostRateLimiter | None = None) -> AsyncPubmedResolverManager:
+    return build_default_async_resolver(config=resolver_config(), rate_limiter=rate_limiter)
+
+
+def build_downloader(rate_limiter: HostRateLimiter | None = None) -> PdfDownloader | None:
+    settings = get_settings()
+    if not settings.downloads_enabled:
+        return None
+    transport = None
+    robots = None
+    if settings.resolver_mock_mode:
+        transport = httpx.MockTransport(
+            lambda request: httpx.Response(
+                200, content=MOCK_PDF_BYTES, headers={"Content-Type": "application/pdf"}
+            )
+        )
+    else:
+        robots = build_robots_policy(resolver_config(), rate_limiter)
+    return PdfDownloader(
+        get_blob_store(),
+        timeout=settings.resolver_timeout_seconds,
+        user_agent=settings.resolver_user_agent,
+        max_bytes=settings.download_max_bytes,
+        chunk_size=settings.download_chunk_bytes,
+        rate_limiter=rate_limiter,
+        robots=robots,
+        transport=transport,
     )
-    return build_default_resolver(config=config)
 
 
-resolver_manager = _build_resolver()
+# Components are built on first use so that `app.worker` can import the job
+# pipeline without constructing the API process's resolver and repository.
+@lru_cache()
+def _ncbi_rate_limiter() -> HostRateLimiter:
+    return build_rate_limiter(resolver_config())
+
+
+@lru_cache()
+def get_jobs_repo() -> JobsRepository:
+    return build_jobs_repo()
+
+
+@lru_cache()
+def get_resolver() -> AsyncPubmedResolverManager:
+    return build_resolver(_ncbi_rate_limiter())
+
+
+@lru_cache()
+def get_searcher() -> PmidSearcher:
+    return _build_searcher(_ncbi_rate_limiter())
+
+
+@lru_cache()
+def get_task_queue() -> TaskQueue | None:
+    return build_task_queue()
+
+
+@lru_cache()
+def get_blob_store() -> BlobStore:
+    return BlobStore(get_settings().download_dir)
+
+
+@lru_cache()
+def get_downloader() -> PdfDownloader | None:
+    return build_downloader(_ncbi_rate_limiter())
+
+
+@lru_cache()
+def get_retry_policy() -> RetryPolicy:
+    return build_retry_policy()
 
 
-def get_jobs_repo() -> InMemoryJobsRepository:
-    return jobs_repo
+@lru_cache()
+def get_scheduler() -> FairScheduler:
+    return FairScheduler(workers=get_settings().job_scheduler_workers)
 
 
-def get_resolver() -> PubmedResolverManager:
-    return resolver_manager
+async def close_clients() -> None:
+    """Close the HTTP clients of the components built so far (app shutdown)."""
 
+    for getter in (get_resolver, get_downloader, get_searcher):
+        if not getter.cache_info().currsize:
+            continue
+        aclose = getattr(getter(), "aclose", None)
+        getter.cache_clear()
+        if callable(aclose):
+            await aclose()
 
-def _resolve_job(job_id: str, repo: InMemoryJobsRepository, resolver: PubmedResolverManager) -> None:
-    repo.set_state(job_id, JobState.running.value)
-    items = repo.list_items(job_id)
-    for item in items:
-        _process_item(job_id, item, repo, resolver)
-    final_record = repo.get(job_id)
-    if final_record is None:
+
+def effective_concurrency(requested: int | None) -> int:
+    settings = get_settings()
+    value = settings.job_default_concurrency if requested is None else requested
+    return max(1, min(value, settings.job_max_concurrency))
+
+
+def effective_max_results(requested: int) -> int:
+    return max(1, min(requested, get_settings().search_max_results))
+
+
+async def _resolve_job(
+    job_id: str,
+    repo: JobsRepository,
+    resolver: AsyncPubmedResolverManager,
+    concurrency: int = 1,
+    *,
+    priority: int = 1,
+    scheduler: FairScheduler | None = None,
+    downloader: PdfDownloader | None = None,
+    retry_policy: RetryPolicy | None = None,
+) -> None:
+    async def batches() -> AsyncIterator[list[JobItemRecord]]:
+        # Page through the job instead of copying every item up front.
+        start = 0
+        while True:
+            items = await asyncio.to_thread(
+                repo.page_items, job_id, start=start, limit=_ITEM_PAGE_SIZE
+            )
+            if not items:
+                return
+            yield items
+            start = items[-1].index + 1
+
+    await _run_job(
+        job_id,
+        repo,
+        resolver,
+        concurrency,
+        batches(),
+        priority=priority,
+        scheduler=scheduler,
+        downloader=downloader,
+        retry_policy=retry_policy,
+    )
+
+
+async def _search_job(
+    job_id: str,
+    query: str,
+    max_results: int,
+    repo: JobsRepository,
+    resolver: AsyncPubmedResolverManager,
+    searcher: PmidSearcher,
+    concurrency: int = 1,
+    *,
+    priority: int = 1,
+    scheduler: FairScheduler | None = None,
+    downloader: PdfDownloader | None = None,
+    retry_policy: RetryPolicy | None = None,
+) -> None:
+    async def batches() -> AsyncIterator[list[JobItemRecord]]:
+        async for pmids in searcher.iter_pmids(query, max_results=max_results):
+            urls = [pubmed_article_url(pmid) for pmid in pmids]
+            yield await asyncio.to_thread(repo.append_items, job_id, urls)
+
+    await _run_job(
+        job_id,
+        repo,
+        resolver,
+        concurrency,
+        batches(),
+        priority=priority,
+        scheduler=scheduler,
+        downloader=downloader,
+        retry_policy=retry_policy,
+    )
+
+
+async def _run_job(
+    job_id: str,
+    repo: JobsRepository,
+    resolver: AsyncPubmedResolverManager,
+    concurrency: int,
+    batches: AsyncIterator[list[JobItemRecord]],
+    *,
+    priority: int = 1,
+    scheduler: FairScheduler | None = None,
+    downloader: PdfDownloader | None = None,
+    retry_policy: RetryPolicy | None = None,
+) -> None:
+    """Feed the job's items to `scheduler`, or to a private pool when none is given.
+
+    Repository calls run in a thread: with the SQLite backend they block on
+    the write lock and the database's busy timeout.
+    """
+
+    if await asyncio.to_thread(repo.state, job_id) == JobState.cancelled.value:
         return
+    own_scheduler = scheduler is None
+    if scheduler is None:
+        scheduler = FairScheduler(workers=concurrency)
+    await asyncio.to_thread(repo.set_state, job_id, JobState.running.value)
+
+    async def run(entry: tuple[JobItemRecord, str | None, int]) -> None:
+        item, pmc_id, attempt = entry
+        delay = await process_item(
+            job_id,
+            item,
+            repo,
+            resolver,
+            pmc_id,
+            downloader=downloader,
+            retry_policy=retry_policy,
+            attempt=attempt,
+        )
+        if delay is not None:
+            # The item stays pending and comes back without holding a worker.
+            scheduled.add_later(delay, [(item, pmc_id, attempt + 1)])
+
+    scheduled = scheduler.submit(job_id, run=run, weight=priority, max_in_flight=concurrency)
+    # PMC IDs are looked up one converter request's worth at a time, so the
+    # first items resolve while the rest of a large batch is still converted.
+    lookup_size = max(1, get_settings().resolver_idconv_batch_size)
+    source_failed = False
+    try:
+        async for items in batches:
+            for start in range(0, len(items), lookup_size):
+                if scheduled.cancelled:
+                    break
+                chunk = items[start : start + lookup_size]
+                pmc_ids = await lookup_pmc_ids(resolver, (item.url for item in chunk))
+                scheduled.add((item, pmc_ids.get(item.url), 1) for item in chunk)
+            if scheduled.cancelled:
+                break
+    except Exception:
+        _LOGGER.exception("Reading the items of job %s failed", job_id)
+        source_failed = True
+    finally:
+        scheduled.close()
+        await scheduled.wait()
+        if own_scheduler:
+            await scheduler.stop()
+        if retry_policy is not None:
+            retry_policy.forget(job_id)
+    if source_failed:
+        # Everything scheduled has run; what is still pending never will.
+        await asyncio.to_thread(
+            _fail_pending_items, job_id, repo, "Job input could not be read"
+        )
+    await asyncio.to_thread(finish_job, job_id, repo, source_failed=source_failed)
+
+
+async def lookup_pmc_ids(
+    resolver: AsyncPubmedResolverManager, urls: Iterable[str]
+) -> dict[str, str]:
+    """PMC IDs for `urls`, best effort: a failed lookup only costs the fast path."""
+
+    try:
+        return await resolver.lookup_pmc_ids(urls)
+    except Exception:
+        _LOGGER.exception("PMC ID lookup failed; resolving without it")
+        return {}
+
+
+def _fail_pending_items(job_id: str, repo: JobsRepository, reason: str) -> None:
+    start = 0
+    while True:
+        items = repo.page_items(
+            job_id, start=start, limit=_ITEM_PAGE_SIZE, status=JobItemStatus.pending.value
+        )
+        if not items:
+            return
+        for item in items:
+            repo.update_item(job_id, item.index, status=JobItemStatus.failed.value, reason=reason)
+        start = items[-1].index + 1
+
+
+def finish_job(job_id: str, repo: JobsRepository, *, source_failed: bool = False) -> bool:
+    """Set the final job state; returns False while items are still pending."""
+
+    summary = repo.summary(job_id)
+    if summary is None or summary.state == JobState.cancelled.value:
+        return True
+    if summary.counts.get(JobItemStatus.pending.value):
+        return False
     final_state = (
         JobState.failed.value
-        if any(item.status == JobItemStatus.failed.value for item in final_record.items)
+        if source_failed or summary.counts.get(JobItemStatus.failed.value)
         else JobState.done.value
     )
     repo.set_state(job_id, final_state)
+    return True
+
+
+def item_task(job_id: str, item: JobItemRecord) -> dict:
+    return {"kind": "item", "job_id": job_id, "index": item.index, "url": item.url}
+
+
+def finish_task(job_id: str, *, source_failed: bool = False) -> dict:
+    return {"kind": "finish", "job_id": job_id, "source_failed": source_failed}
 
 
-def _process_item(
+# Queued tasks are leased lowest rank first.  A job's n-th item is ranked
+# `start + n / priority`, where `start` is the lowest rank still queued when the
+# job arrives, so workers interleave jobs by priority (stride scheduling) and a
+# late small job is not stuck behind an earlier bulk one.
+def _rank(start: float, position: int, priority: int) -> float:
+    return start + (position + 1) / priority
+
+
+def _enqueue_job(
+    job_id: str, items: list[JobItemRecord], queue: TaskQueue, *, priority: int = 1
+) -> None:
+    start = queue.min_rank()
+    queue.enqueue(
+        [*(item_task(job_id, item) for item in items), finish_task(job_id)],
+        ranks=[
+            *(_rank(start, item.index, priority) for item in items),
+            _rank(start, len(items), priority),
+        ],
+    )
+
+
+async def _enqueue_search_job(
     job_id: str,
-    item: JobItemRecord,
-    repo: InMemoryJobsRepository,
-    resolver: PubmedResolverManager,
+    query: str,
+    max_results: int,
+    repo: JobsRepository,
+    searcher: PmidSearcher,
+    queue: TaskQueue,
+    *,
+    priority: int = 1,
 ) -> None:
+    start = await asyncio.to_thread(queue.min_rank)
+    total = 0
+    # Anything but a clean end of the search (including a bug, which is left
+    # to propagate) still finishes the job, as failed.
+    source_failed = True
     try:
-        result = resolver.resolve(item.url)
+        async for pmids in searcher.iter_pmids(query, max_results=max_results):
+            if await asyncio.to_thread(repo.state, job_id) == JobState.cancelled.value:
+                break
+            urls = [pubmed_article_url(pmid) for pmid in pmids]
+            items = await asyncio.to_thread(repo.append_items, job_id, urls)
+            await asyncio.to_thread(
+                queue.enqueue,
+                [item_task(job_id, item) for item in items],
+                ranks=[_rank(start, item.index, priority) for item in items],
+            )
+            total += len(items)
+        source_failed = False
+    except SearchError:
+        _LOGGER.exception("Search for job %s failed", job_id)
+    finally:
+        await asyncio.to_thread(
+            queue.enqueue,
+            [finish_task(job_id, source_failed=source_failed)],
+            ranks=[_rank(start, total, priority)],
+        )
+
+
+async def process_item(
+    job_id: str,
+    item: JobItemRecord,
+    repo: JobsRepository,
+    resolver: AsyncPubmedResolverManager,
+    pmc_id: str | None = None,
+    *,
+    downloader: PdfDownloader | None = None,
+    retry_policy: RetryPolicy | None = None,
+    attempt: int = 1,
+) -> float | None:
+    """Resolve (and download) one item and record the outcome.
+
+    A transient failure that `retry_policy` allows another attempt leaves the
+    item pending and returns the delay before that attempt; the caller
+    re-queues the item instead of sleeping.
+    """
+
+    try:
+        result = await resolver.resolve(item.url, pmc_id=pmc_id)
+        if result.retryable:
+            delay = _retry_delay(job_id, retry_policy, attempt, result.retry_after)
+            if delay is not None:
+                return delay
         pdf_url = result.pdf_url
+        if pdf_url and downloader is not None:
+            return await _download_item(
+                job_id, item, repo, downloader, pdf_url, retry_policy=retry_policy, attempt=attempt
+            )
         status_value = (
             JobItemStatus.resolved.value if pdf_url else JobItemStatus.failed.value
         )
-        repo.update_item(
+        await asyncio.to_thread(
+            repo.update_item,
             job_id,
-            item.url,
+            item.index,
             status=status_value,
             pdf_url=pdf_url,
             reason=result.reason,
         )
-    except Exception as exc:  # pragma: no cover - placeholder error handling
-        repo.update_item(
+    except Exception as exc:
+        await asyncio.to_thread(
+            repo.update_item,
+            job_id,
+            item.index,
+            status=JobItemStatus.failed.value,
+            reason=str(exc),
+        )
+    return None
+
+
+async def _download_item(
+    job_id: str,
+    item: JobItemRecord,
+    repo: JobsRepository,
+    downloader: PdfDownloader,
+    pdf_url: str,
+    *,
+    retry_policy: RetryPolicy | None = None,
+    attempt: int = 1,
+) -> float | None:
+    try:
+        blob = await downloader.download(pdf_url)
+    except DownloadError as exc:
+        if exc.transient:
+            delay = _retry_delay(job_id, retry_policy, attempt, exc.retry_after)
+            if delay is not None:
+                return delay
+        await asyncio.to_thread(
+            repo.update_item,
             job_id,
-            item.url,
+            item.index,
             status=JobItemStatus.failed.value,
+            pdf_url=pdf_url,
             reason=str(exc),
         )
+        return None
+    await asyncio.to_thread(
+        repo.update_item,
+        job_id,
+        item.index,
+        status=JobItemStatus.downloaded.value,
+        pdf_url=pdf_url,
+        sha256=blob.sha256,
+        size_bytes=blob.size,
+    )
+    return None
+
+
+def _retry_delay(
+    job_id: str, policy: RetryPolicy | None, attempt: int, retry_after: float | None = None
+) -> float | None:
+    if policy is None:
+        return None
+    return policy.schedule(job_id, attempt, retry_after=retry_after)
 
 
 @router.post("", response_model=JobCreated, status_code=status.HTTP_201_CREATED)
 def create_job(
     job_request: JobCreate,
     background_tasks: BackgroundTasks,
-    repo: InMemoryJobsRepository = Depends(get_jobs_repo),
-    pdf_resolver: PubmedResolverManager = Depends(get_resolver),
+    repo: JobsRepository = Depends(get_jobs_repo),
+    pdf_resolver: AsyncPubmedResolverManager = Depends(get_resolver),
+    searcher: PmidSearcher = Depends(get_searcher),
+    queue: TaskQueue | None = Depends(get_task_queue),
+    scheduler: FairScheduler = Depends(get_scheduler),
+    downloader: PdfDownloader | None = Depends(get_downloader),
+    retry_policy: RetryPolicy = Depends(get_retry_policy),
 ) -> JobCreated:
-    record = repo.create([str(url) for url in job_request.urls])
-    background_tasks.add_task(_resolve_job, record.id, repo, pdf_resolver)
+    concurrency = effective_concurrency(job_request.concurrency)
+    if queue is not None:
+        return _create_queued_job(job_request, background_tasks, repo, searcher, queue)
+    options = {
+        "priority": job_request.priority,
+        "scheduler": scheduler,
+        "downloader": downloader,
+        "retry_policy": retry_policy,
+    }
+    if job_request.query is not None:
+        record = repo.create([])
+        background_tasks.add_task(
+            _search_job,
+            record.id,
+            job_request.query,
+            effective_max_results(job_request.max_results),
+            repo,
+            pdf_resolver,
+            searcher,
+            concurrency,
+            **options,
+        )
+        return JobCreated(id=record.id)
+    record = repo.create([str(url) for url in job_request.urls or []])
+    background_tasks.add_task(
+        _resolve_job, record.id, repo, pdf_resolver, concurrency, **options
+    )
     return JobCreated(id=record.id)
 
 
+@router.post("/bulk", response_model=JobBulkCreated, status_code=status.HTTP_201_CREATED)
+async def create_bulk_job(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    concurrency: int | None = Query(None, ge=1),
+    priority: int = Query(1, ge=1, le=10),
+    repo: JobsRepository = Depends(get_jobs_repo),
+    pdf_resolver: AsyncPubmedResolverManager = Depends(get_resolver),
+    queue: TaskQueue | None = Depends(get_task_queue),
+    scheduler: FairScheduler = Depends(get_scheduler),
+    downloader: PdfDownloader | None = Depends(get_downloader),
+    retry_policy: RetryPolicy = Depends(get_retry_policy),
+) -> JobBulkCreated:
+    """Create a job from a streamed body of PubMed URLs or PMIDs, one per line.
+
+    Accepts `text/plain` or NDJSON.  Lines are validated as they arrive and
+    appended to the job in batches; unusable lines are reported, not fatal.
+    """
+
+    media_type = request.headers.get("content-type", "text/plain").split(";")[0].strip()
+    if media_type not in _BULK_CONTENT_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send text/plain or application/x-ndjson",
+        )
+    job_id: str | None = None
+    accepted = 0
+    rejected: list[RejectedLine] = []
+    rejected_total = 0
+    # SQLite-backed repositories and queues block, so their calls run in a
+    # thread while the body keeps streaming on the event loop.
+    start_rank = await asyncio.to_thread(queue.min_rank) if queue is not None else 0.0
+    try:
+        async for batch in iter_bulk_batches(
+            request.stream(), ndjson=_BULK_CONTENT_TYPES[media_type]
+        ):
+            rejected_total += len(batch.rejected)
+            for line, reason in batch.rejected[: _MAX_REJECTED_LINES_REPORTED - len(rejected)]:
+                rejected.append(RejectedLine(line=line, reason=reason))
+            if not batch.urls:
+                continue
+            if job_id is None:
+                job_id = (await asyncio.to_thread(repo.create, [])).id
+            items = await asyncio.to_thread(repo.append_items, job_id, batch.urls)
+            accepted += len(items)
+            if queue is not None:
+                await asyncio.to_thread(
+                    queue.enqueue,
+                    [item_task(job_id, item) for item in items],
+                    ranks=[_rank(start_rank, item.index, priority) for item in items],
+                )
+    except Exception as exc:
+        # A half-received job never runs; queue workers skip its tasks.
+        if job_id is not None:
+            await asyncio.to_thread(repo.set_state, job_id, JobState.cancelled.value)
+        if isinstance(exc, BulkFormatError):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)
+            ) from exc
+        raise
+    if job_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={
+                "message": "No PubMed URLs or PMIDs in body",
+                "rejected": [line.model_dump() for line in rejected],
+            },
+        )
+    if queue is not None:
+        await asyncio.to_thread(
+            queue.enqueue, [finish_task(job_id)], ranks=[_rank(start_rank, accepted, priority)]
+        )
+    else:
+        background_tasks.add_task(
+            _resolve_job,
+            job_id,
+            repo,
+            pdf_resolver,
+            effective_concurrency(concurrency),
+            priority=priority,
+            scheduler=scheduler,
+            downloader=downloader,
+            retry_policy=retry_policy,
+        )
+    return JobBulkCreated(
+        id=job_id, accepted=accepted, rejected_total=rejected_total, rejected=rejected
+    )
+
+
+def _create_queued_job(
+    job_request: JobCreate,
+    background_tasks: BackgroundTasks,
+    repo: JobsRepository,
+    searcher: PmidSearcher,
+    queue: TaskQueue,
+) -> JobCreated:
+    if job_request.query is not None:
+        record = repo.create([])
+        background_tasks.add_task(
+            _enqueue_search_job,
+            record.id,
+            job_request.query,
+            effective_max_results(job_request.max_results),
+            repo,
+            searcher,
+            queue,
+            priority=job_request.priority,
+        )
+        return JobCreated(id=record.id)
+    record = repo.create([str(url) for url in job_request.urls or []])
+    _enqueue_job(record.id, record.items, queue, priority=job_request.priority)
+    return JobCreated(id=record.id)
+
+
+@router.delete("/{job_id}", response_model=JobSummary)
+async def cancel_job(
+    job_id: str,
+    repo: JobsRepository = Depends(get_jobs_repo),
+    scheduler: FairScheduler = Depends(get_scheduler),
+) -> JobSummary:
+    """Stop a job: queued items are dropped, items already resolving finish.
+
+    Cancelling a job that has already finished leaves it unchanged.
+    """
+
+    state = await asyncio.to_thread(repo.state, job_id)
+    if state is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    if state not in _FINISHED_STATES:
+        await asyncio.to_thread(repo.set_state, job_id, JobState.cancelled.value)
+        scheduled = scheduler.get(job_id)
+        if scheduled is not None:
+            scheduled.cancel()
+    summary = await asyncio.to_thread(repo.summary, job_id)
+    if summary is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return map_job_summary(summary)
+
+
 @router.get("/{job_id}", response_model=JobStatus)
 def get_job(
     job_id: str,
-    repo: InMemoryJobsRepository = Depends(get_jobs_repo),
+    cursor: int = Query(0, ge=0, description="Index of the first item to return"),
+    limit: int = Query(500, ge=1, le=5_000),
+    item_status: JobItemStatus | None = Query(None, alias="status"),
+    repo: JobsRepository = Depends(get_jobs_repo),
 ) -> JobStatus:
-    record = repo.get(job_id)
-    if record is None:
+    summary = repo.summary(job_id)
+    if summary is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    status_filter = item_status.value if item_status is not None else None
+    items = repo.page_items(job_id, start=cursor, limit=limit + 1, status=status_filter)
+    next_cursor = items[limit].index if len(items) > limit else None
+    return map_job_page(summary, items[:limit], next_cursor)
+
+
+@router.get("/{job_id}/summary", response_model=JobSummary)
+def get_job_summary(
+    job_id: str,
+    repo: JobsRepository = Depends(get_jobs_repo),
+) -> JobSummary:
+    summary = repo.summary(job_id)
+    if summary is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
-    return map_job_record(record)
+    return map_job_summary(summary)
+
+
+_EXPORT_MEDIA_TYPES = {
+    ExportFormat.csv: "text/csv; charset=utf-8",
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.zip: "application/zip",
+}
+
+
+@router.get("/{job_id}/export")
+def export_job(
+    job_id: str,
+    export_format: ExportFormat = Query(ExportFormat.csv, alias="format"),
+    repo: JobsRepository = Depends(get_jobs_repo),
+    store: BlobStore = Depends(get_blob_store),
+) -> StreamingResponse:
+    """Stream the job's items as CSV or NDJSON, or its downloaded PDFs as a ZIP."""
+
+    if repo.version(job_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    if export_format is ExportFormat.zip:
+        body = iter_zip(repo, job_id, store)
+    elif export_format is ExportFormat.ndjson:
+        body = iter_ndjson(repo, job_id)
+    else:
+        body = iter_csv(repo, job_id)
+    return StreamingResponse(
+        body,
+        media_type=_EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="job-{job_id}.{export_format.value}"'
+        },
+    )
+
+
+@router.get("/{job_id}/changes", response_model=JobChanges)
+async def get_job_changes(
+    job_id: str,
+    since: int = Query(0, ge=0, description="Last `version` the client has seen"),
+    wait: float = Query(0.0, ge=0.0, description="Seconds to hold the request open for news"),
+    limit: int = Query(_MAX_CHANGES_PER_RESPONSE, ge=1, le=_MAX_CHANGES_PER_RESPONSE),
+    repo: JobsRepository = Depends(get_jobs_repo),
+) -> JobChanges:
+    settings = get_settings()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + min(wait, settings.job_longpoll_max_seconds)
+    while True:
+        version = await asyncio.to_thread(repo.version, job_id)
+        if version is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+        if version > since or loop.time() >= deadline:
+            break
+        await asyncio.sleep(settings.job_events_poll_seconds)
+    changes = await asyncio.to_thread(repo.changes_since, job_id, since, limit=limit)
+    if changes is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return map_job_changes(changes)
+
+
+@router.get("/{job_id}/events")
+async def stream_job_events(
+    job_id: str,
+    request: Request,
+    since: int = Query(0, ge=0),
+    last_event_id: str | None = Header(None),
+    repo: JobsRepository = Depends(get_jobs_repo),
+) -> StreamingResponse:
+    if await asyncio.to_thread(repo.version, job_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    cursor = int(last_event_id) if last_event_id and last_event_id.isdigit() else since
+    return StreamingResponse(
+        _job_events(job_id, cursor, repo, request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _job_events(
+    job_id: str, cursor: int, repo: JobsRepository, request: Request
+) -> AsyncIterator[str]:
+    settings = get_settings()
+    loop = asyncio.get_running_loop()
+    last_sent = loop.time()
+    # Job state only changes together with the version, so it is re-read only
+    # when there is something new to send.
+    state: str | None = None
+    while not await request.is_disconnected():
+        version = await asyncio.to_thread(repo.version, job_id)
+        if version is None:
+            return
+        if version > cursor:
+            changes = await asyncio.to_thread(
+                repo.changes_since, job_id, cursor, limit=_MAX_CHANGES_PER_RESPONSE
+            )
+            if changes is None:
+                return
+            cursor, state = changes.cursor, changes.summary.state
+            last_sent = loop.time()
+            yield _sse("progress", map_job_changes(changes).model_dump_json(), event_id=cursor)
+            if changes.has_more:
+                continue
+        elif state is None:
+            summary = await asyncio.to_thread(repo.summary, job_id)
+            if summary is None:
+                return
+            state = summary.state
+        if state in _FINISHED_STATES:
+            yield _sse("end", "{}", event_id=cursor)
+            return
+        if loop.time() - last_sent >= settings.job_events_keepalive_seconds:
+            last_sent = loop.time()
+            yield ": keep-alive\n\n"
+        await asyncio.sleep(settings.job_events_poll_seconds)
+
+
+def _sse(event: str, data: str, *, event_id: int) -> str:
+    return f"id: {event_id}\nevent: {event}\ndata: {data}\n\n"
@@ -2,12 +2,16 @@ from __future__ import annotations
 
 from datetime import datetime
 from enum import Enum
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Annotated
 
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, Field, HttpUrl, WithJsonSchema, model_validator
 
 if TYPE_CHECKING:  # pragma: no cover
-    from app.repositories.jobs_repo import JobItemRecord, JobRecord
+    from app.repositories.jobs_repo import (
+        JobChangesRecord,
+        JobItemRecord,
+        JobSummaryRecord,
+    )
 
 
 class StrEnum(str, Enum):
@@ -20,19 +24,31 @@ class JobState(StrEnum):
     running = "running"
     done = "done"
     failed = "failed"
+    cancelled = "cancelled"
 
 
 class JobItemStatus(StrEnum):
     pending = "pending"
     resolved = "resolved"
+    downloaded = "downloaded"
     failed = "failed"
 
 
+# Job item URLs are plain strings rather than `HttpUrl`: submitted URLs were
+# validated by `JobCreate` and `pdf_url` comes from the resolver, so items are
+# built with `model_construct` instead of re-validating every URL on each poll.
+# The JSON schema still describes them as URIs.
+_UriStr = Annotated[str, WithJsonSchema({"type": "string", "format": "uri"})]
+
+
 class JobItem(BaseModel):
-    url: HttpUrl
+    index: int
+    url: _UriStr
     status: JobItemStatus = JobItemStatus.pending
-    pdf_url: HttpUrl | None = None
+    pdf_url: _UriStr | None = None
     reason: str | None = None
+    sha256: str | None = None
+    size_bytes: int | None = None
 
 
 class JobStatus(BaseModel):
@@ -40,29 +56,129 @@ class JobStatus(BaseModel):
     created_at: datetime
     state: JobState
     items: list[JobItem]
+    next_cursor: int | None = Field(
+        None, description="Pass as `cursor` to fetch the next page; null on the last page"
+    )
+
+
+class JobSummary(BaseModel):
+    id: str
+    created_at: datetime
+    state: JobState
+    version: int
+    total: int
+    counts: dict[JobItemStatus, int]
+
+
+class JobChanges(JobSummary):
+    items: list[JobItem] = Field(description="Items changed since the requested version")
+    has_more: bool = Field(
+        description="More changes are pending; ask again from `version` straight away"
+    )
 
 
 class JobCreate(BaseModel):
-    urls: list[HttpUrl] = Field(..., min_length=1, description="PubMed URLs to resolve")
+    urls: list[HttpUrl] | None = Field(
+        None, min_length=1, description="PubMed URLs to resolve"
+    )
+    query: str | None = Field(
+        None, min_length=1, description="PubMed search whose results become the job's items"
+    )
+    max_results: int = Field(
+        1_000,
+        ge=1,
+        description="Upper bound on PMIDs taken from `query`; capped by the server-side limit",
+    )
+    concurrency: int | None = Field(
+        None,
+        ge=1,
+        description="Items resolved in parallel; capped by the server-side limit",
+    )
+    priority: int = Field(
+        1,
+        ge=1,
+        le=10,
+        description="Share of the workers this job gets relative to other running jobs",
+    )
+
+    @model_validator(mode="after")
+    def _require_one_source(self) -> "JobCreate":
+        if (self.urls is None) == (self.query is None):
+            raise ValueError("Provide exactly one of 'urls' or 'query'")
+        return self
 
 
 class JobCreated(BaseModel):
     id: str
 
 
-def map_job_record(record: "JobRecord") -> JobStatus:
+class RejectedLine(BaseModel):
+    line: int
+    reason: str
+
+
+class JobBulkCreated(JobCreated):
+    accepted: int
+    rejected_total: int
+    rejected: list[RejectedLine] = Field(
+        description="The first rejected lines; `rejected_total` counts all of them"
+    )
+
+
+class ExportFormat(StrEnum):
+    csv = "csv"
+    ndjson = "ndjson"
+    zip = "zip"
+
+
+def map_job_page(
+    summary: "JobSummaryRecord", items: list["JobItemRecord"], next_cursor: int | None
+) -> JobStatus:
     return JobStatus(
-        id=record.id,
-        created_at=record.created_at,
-        state=JobState(record.state),
-        items=[_map_job_item(item) for item in record.items],
+        id=summary.id,
+        created_at=summary.created_at,
+        state=JobState(summary.state),
+        items=[map_job_item(item) for item in items],
+        next_cursor=next_cursor,
     )
 
 
-def _map_job_item(item: "JobItemRecord") -> JobItem:
-    return JobItem(
+def map_job_summary(summary: "JobSummaryRecord") -> JobSummary:
+    return JobSummary(
+        id=summary.id,
+        created_at=summary.created_at,
+        state=JobState(summary.state),
+        version=summary.version,
+        total=summary.total,
+        counts=_map_counts(summary),
+    )
+
+
+def map_job_changes(changes: "JobChangesRecord") -> JobChanges:
+    summary = changes.summary
+    return JobChanges(
+        id=summary.id,
+        created_at=summary.created_at,
+        state=JobState(summary.state),
+        version=changes.cursor,
+        total=summary.total,
+        counts=_map_counts(summary),
+        items=[map_job_item(item) for item in changes.items],
+        has_more=changes.has_more,
+    )
+
+
+def _map_counts(summary: "JobSummaryRecord") -> dict[JobItemStatus, int]:
+    return {status: summary.counts.get(status.value, 0) for status in JobItemStatus}
+
+
+def map_job_item(item: "JobItemRecord") -> JobItem:
+    return JobItem.model_construct(
+        index=item.index,
         url=item.url,
         status=JobItemStatus(item.status),
         pdf_url=item.pdf_url,
         reason=item.reason,
+        sha256=item.sha256,
+        size_bytes=item.size_bytes,
     )
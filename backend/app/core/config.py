@@ -6,9 +6,95 @@ class AppSettings(BaseSettings):
     app_name: str = "PubMed PDF Scraper API"
     cors_origins: list[str] = ["http://localhost:3000"]
     resolver_timeout_seconds: float = 10.0
+    # In-place retries of transient fetch errors, after a short jittered backoff.
     resolver_retries: int = 1
     resolver_user_agent: str = "pubmed-pdf-scraper/0.1"
     resolver_mock_mode: bool = False
+    # Identify this client to NCBI E-utilities and the ID Converter API.
+    ncbi_tool: str | None = "pubmed-pdf-scraper"
+    ncbi_email: str | None = None
+    # NCBI allows three requests per second per client without an API key.
+    resolver_host_requests_per_second: float = 3.0
+    resolver_host_burst: int = 3
+    resolver_host_max_in_flight: int = 4
+    resolver_host_rate_overrides: dict[str, float] = {}
+    resolver_max_connections: int = 100
+    resolver_max_keepalive_connections: int = 20
+    resolver_cache_dir: str | None = None
+    resolver_cache_ttl_seconds: float = 86_400.0
+    resolver_cache_max_bytes: int = 256 * 1024 * 1024
+    resolution_cache_path: str | None = None
+    resolution_ttl_seconds: float = 7 * 86_400.0
+    resolution_failure_ttl_seconds: float = 6 * 3_600.0
+    # "bs4" (reference), "selectolax" (fast, optional package) or "auto".
+    resolver_parser_backend: str = "auto"
+    # Stream PubMed pages and stop reading after the full-text links block.
+    resolver_streaming_parse: bool = True
+    resolver_streaming_stop_at_pmcid: bool = False
+    # Try /articles/PMC{id}/pdf/ with a HEAD/ranged GET before scraping PMC.
+    resolver_pmc_fast_path: bool = True
+    # Run the PMC and external branches concurrently when an article has both;
+    # faster when PMC has no PDF, at the cost of external requests PMC makes moot.
+    resolver_race_branches: bool = False
+    # External crawl: top-k candidates per hop, hop depth, and a per-item budget.
+    resolver_external_max_candidates: int = 3
+    resolver_external_max_depth: int = 2
+    resolver_external_max_bytes: int = 4 * 1024 * 1024
+    resolver_external_timeout_seconds: float = 20.0
+    # Derive PDF URLs for known publishers from the landing-page URL or DOI.
+    resolver_publisher_rules: bool = True
+    # Honour robots.txt; answers are cached per origin and shared between the
+    # API and worker processes through resolver_robots_cache_path (set it to
+    # an empty string to keep them in-process only).
+    resolver_respect_robots: bool = True
+    resolver_robots_cache_path: str | None = "data/robots.sqlite3"
+    resolver_robots_ttl_seconds: float = 86_400.0
+    resolver_robots_failure_ttl_seconds: float = 300.0
+    resolver_robots_max_hosts: int = 1_024
+    resolver_robots_max_crawl_delay_seconds: float = 10.0
+    # Look up PMC IDs for a whole job via the NCBI ID Converter before resolving.
+    resolver_idconv_enabled: bool = True
+    resolver_idconv_url: str = "https://www.ncbi.nlm.nih.gov/pmc/utils/idconv/v1.0/"
+    resolver_idconv_batch_size: int = 200
+    search_base_url: str = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/"
+    search_batch_size: int = 5_000
+    search_max_results: int = 10_000
+    search_api_key: str | None = None
+    # "memory" keeps jobs in-process; "sqlite" persists them at jobs_db_path.
+    jobs_backend: str = "memory"
+    jobs_db_path: str = "data/jobs.sqlite3"
+    jobs_write_batch_size: int = 64
+    jobs_write_flush_seconds: float = 0.2
+    # "inline" resolves jobs inside the API process; "queue" hands items to
+    # `python -m app.worker` through the task queue (needs jobs_backend=sqlite).
+    jobs_dispatch: str = "inline"
+    queue_db_path: str = "data/queue.sqlite3"
+    queue_visibility_timeout_seconds: float = 120.0
+    queue_max_attempts: int = 3
+    worker_processes: int = 2
+    worker_concurrency: int = 8
+    worker_poll_seconds: float = 1.0
+    # Progress streaming: repository poll interval, SSE keep-alive and long-poll cap.
+    job_events_poll_seconds: float = 0.5
+    job_events_keepalive_seconds: float = 15.0
+    job_longpoll_max_seconds: float = 30.0
+    job_default_concurrency: int = 3
+    job_max_concurrency: int = 5
+    # Inline jobs share this many resolver workers, split by job priority.
+    job_scheduler_workers: int = 10
+    # Items that failed transiently (timeouts, 429, 5xx) are re-queued with
+    # full-jitter exponential backoff; attempts include the first one, and each
+    # job may spend at most retry_job_budget retries.  Queue workers also stop
+    # at queue_max_attempts.
+    retry_max_attempts: int = 3
+    retry_base_delay_seconds: float = 2.0
+    retry_max_delay_seconds: float = 120.0
+    retry_job_budget: int = 100
+    # Download stage: resolved PDFs are streamed into content-addressed storage.
+    downloads_enabled: bool = False
+    download_dir: str = "data/pdfs"
+    download_max_bytes: int = 100 * 1024 * 1024
+    download_chunk_bytes: int = 64 * 1024
 
     model_config = SettingsConfigDict(env_file=".env", case_sensitive=True)
 
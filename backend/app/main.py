@@ -1,11 +1,23 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from fastapi import Depends, FastAPI
 
 from .api import jobs
 from .core.config import get_settings
+from .services.resolver import AsyncPubmedResolverManager
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    jobs.get_scheduler().start()
+    yield
+    await jobs.get_scheduler().stop()
+    await jobs.close_clients()
 
 
 settings = get_settings()
-app = FastAPI(title=settings.app_name, version="0.1.0")
+app = FastAPI(title=settings.app_name, version="0.1.0", lifespan=lifespan)
 
 app.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
 
@@ -13,3 +25,16 @@ app.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
 @app.get("/healthz")
 def healthcheck() -> dict[str, bool]:
     return {"ok": True}
+
+
+@app.get("/stats")
+def resolver_stats(
+    resolver: AsyncPubmedResolverManager = Depends(jobs.get_resolver),
+) -> dict[str, dict[str, int]]:
+    """How many resolutions and page fetches were served by another caller."""
+
+    report = {"resolve": resolver.inflight_stats.as_dict()}
+    fetch_stats = resolver.fetch_inflight_stats
+    if fetch_stats is not None:
+        report["fetch"] = fetch_stats.as_dict()
+    return report
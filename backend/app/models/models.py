@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 
 
@@ -11,6 +11,8 @@ class PubmedArticleMetadata:
     pmid: str
     pmc_id: Optional[str] = None
     external_fulltext_url: Optional[str] = None
+    # Every external full-text link, best first; `external_fulltext_url` is the head.
+    external_candidates: list[str] = field(default_factory=list)
 
 
 @dataclass(slots=True)
@@ -1,18 +1,27 @@
 from __future__ import annotations
 
+from bisect import bisect_right
+from collections import Counter
 from dataclasses import dataclass, field, replace
 from datetime import datetime, timezone
+from itertools import islice
 from threading import Lock
-from typing import Dict, Iterable, List
+from typing import Dict, Iterable, List, Protocol
 from uuid import uuid4
 
 
 @dataclass(slots=True)
 class JobItemRecord:
     url: str
+    index: int = 0
     status: str = "pending"
     pdf_url: str | None = None
     reason: str | None = None
+    # Job version at which this item last changed.
+    version: int = 0
+    # Set once the PDF is in the download store.
+    sha256: str | None = None
+    size_bytes: int | None = None
 
 
 @dataclass(slots=True)
@@ -21,62 +30,276 @@ class JobRecord:
     created_at: datetime
     state: str
     items: list[JobItemRecord] = field(default_factory=list)
+    # Bumped by every append_items, update_item and set_state.
+    version: int = 0
 
 
-class InMemoryJobsRepository:
+@dataclass(slots=True)
+class JobSummaryRecord:
+    id: str
+    created_at: datetime
+    state: str
+    counts: dict[str, int] = field(default_factory=dict)
+    version: int = 0
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+
+@dataclass(slots=True)
+class JobChangesRecord:
+    """Items changed after some version, and the version to ask from next."""
+
+    summary: JobSummaryRecord
+    items: list[JobItemRecord]
+    cursor: int
+
+    @property
+    def has_more(self) -> bool:
+        return self.cursor < self.summary.version
+
+
+class JobsRepository(Protocol):
+    def create(self, urls: list[str]) -> JobRecord:
+        ...
+
+    def append_items(self, job_id: str, urls: Iterable[str]) -> List[JobItemRecord]:
+        ...
+
+    def get(self, job_id: str) -> JobRecord | None:
+        ...
+
+    def list_items(self, job_id: str) -> List[JobItemRecord]:
+        ...
+
+    def item_positions(self, job_id: str, url: str) -> List[int]:
+        """Indexes of every item in the job with this URL."""
+        ...
+
+    def page_items(
+        self, job_id: str, *, start: int = 0, limit: int, status: str | None = None
+    ) -> List[JobItemRecord]:
+        """Up to `limit` items with index >= `start`, optionally of one status."""
+        ...
+
+    def summary(self, job_id: str) -> JobSummaryRecord | None:
+        """Job header and per-status item counts, without reading the items."""
+        ...
+
+    def version(self, job_id: str) -> int | None:
+        ...
+
+    def state(self, job_id: str) -> str | None:
+        ...
+
+    def changes_since(
+        self, job_id: str, version: int, *, limit: int
+    ) -> JobChangesRecord | None:
+        """Up to `limit` items changed after `version`, oldest change first."""
+        ...
+
+    def set_state(self, job_id: str, state: str) -> None:
+        ...
+
+    def update_item(
+        self,
+        job_id: str,
+        index: int,
+        *,
+        status: str,
+        pdf_url: str | None = None,
+        reason: str | None = None,
+        sha256: str | None = None,
+        size_bytes: int | None = None,
+    ) -> None:
+        ...
+
+
+class _JobSlot:
+    """One job plus the lock, URL index, status counts and change log for it."""
+
+    __slots__ = ("lock", "job", "positions", "counts", "changes")
+
+    def __init__(self, job: JobRecord) -> None:
+        self.lock = Lock()
+        self.job = job
+        self.positions: Dict[str, List[int]] = {}
+        self.counts: Counter[str] = Counter()
+        # (version, index) per item change, in version order.
+        self.changes: List[tuple[int, int]] = []
+        self.index_items(job.items)
+
+    def index_items(self, items: Iterable[JobItemRecord]) -> None:
+        # Bulk submissions index 100k items at a time, so this stays inlined.
+        positions, counts, changes = self.positions, self.counts, self.changes
+        version = self.job.version
+        for item in items:
+            positions.setdefault(item.url, []).append(item.index)
+            counts[item.status] += 1
+            version += 1
+            item.version = version
+            changes.append((version, item.index))
+        self.job.version = version
+
+    def record_change(self, item: JobItemRecord) -> None:
+        self.job.version += 1
+        item.version = self.job.version
+        self.changes.append((item.version, item.index))
+
+    def summary(self) -> JobSummaryRecord:
+        return JobSummaryRecord(
+            id=self.job.id,
+            created_at=self.job.created_at,
+            state=self.job.state,
+            counts={status: count for status, count in self.counts.items() if count},
+            version=self.job.version,
+        )
+
+
+class InMemoryJobsRepository(JobsRepository):
+    """Process-local repository; each job has its own lock."""
+
     def __init__(self) -> None:
-        self._jobs: Dict[str, JobRecord] = {}
+        self._jobs: Dict[str, _JobSlot] = {}
+        # Guards only the job table; item reads and writes take the job's lock.
         self._lock = Lock()
 
     def create(self, urls: list[str]) -> JobRecord:
+        job = JobRecord(
+            id=uuid4().hex,
+            created_at=datetime.now(timezone.utc),
+            state="queued",
+            items=[JobItemRecord(url=url, index=index) for index, url in enumerate(urls)],
+        )
         with self._lock:
-            job_id = uuid4().hex
-            job = JobRecord(
-                id=job_id,
-                created_at=datetime.now(timezone.utc),
-                state="queued",
-                items=[JobItemRecord(url=url) for url in urls],
-            )
-            self._jobs[job_id] = job
-            return job
+            self._jobs[job.id] = _JobSlot(job)
+        return job
+
+    def append_items(self, job_id: str, urls: Iterable[str]) -> List[JobItemRecord]:
+        slot = self._jobs.get(job_id)
+        if slot is None:
+            return []
+        with slot.lock:
+            start = len(slot.job.items)
+            items = [
+                JobItemRecord(url=url, index=start + offset) for offset, url in enumerate(urls)
+            ]
+            slot.job.items.extend(items)
+            slot.index_items(items)
+            return [
+                JobItemRecord(url=item.url, index=item.index, version=item.version)
+                for item in items
+            ]
 
     def get(self, job_id: str) -> JobRecord | None:
-        with self._lock:
-            job = self._jobs.get(job_id)
-            if job is None:
-                return None
-            return replace(job, items=[replace(item) for item in job.items])
+        slot = self._jobs.get(job_id)
+        if slot is None:
+            return None
+        with slot.lock:
+            return replace(slot.job, items=[replace(item) for item in slot.job.items])
 
     def list_items(self, job_id: str) -> List[JobItemRecord]:
-        with self._lock:
-            job = self._jobs.get(job_id)
-            if job is None:
-                return []
-            return [replace(item) for item in job.items]
+        slot = self._jobs.get(job_id)
+        if slot is None:
+            return []
+        with slot.lock:
+            return [replace(item) for item in slot.job.items]
+
+    def item_positions(self, job_id: str, url: str) -> List[int]:
+        slot = self._jobs.get(job_id)
+        if slot is None:
+            return []
+        with slot.lock:
+            return list(slot.positions.get(url, ()))
+
+    def page_items(
+        self, job_id: str, *, start: int = 0, limit: int, status: str | None = None
+    ) -> List[JobItemRecord]:
+        slot = self._jobs.get(job_id)
+        if slot is None:
+            return []
+        page: List[JobItemRecord] = []
+        with slot.lock:
+            for item in islice(slot.job.items, max(0, start), None):
+                if len(page) >= limit:
+                    break
+                if status is None or item.status == status:
+                    page.append(replace(item))
+        return page
+
+    def summary(self, job_id: str) -> JobSummaryRecord | None:
+        slot = self._jobs.get(job_id)
+        if slot is None:
+            return None
+        with slot.lock:
+            return slot.summary()
+
+    def version(self, job_id: str) -> int | None:
+        slot = self._jobs.get(job_id)
+        if slot is None:
+            return None
+        with slot.lock:
+            return slot.job.version
+
+    def state(self, job_id: str) -> str | None:
+        slot = self._jobs.get(job_id)
+        if slot is None:
+            return None
+        with slot.lock:
+            return slot.job.state
+
+    def changes_since(
+        self, job_id: str, version: int, *, limit: int
+    ) -> JobChangesRecord | None:
+        slot = self._jobs.get(job_id)
+        if slot is None:
+            return None
+        with slot.lock:
+            summary = slot.summary()
+            start = bisect_right(slot.changes, version, key=lambda change: change[0])
+            items: List[JobItemRecord] = []
+            for change_version, index in islice(slot.changes, start, None):
+                item = slot.job.items[index]
+                # Older log entries for an item that has changed again are stale.
+                if item.version != change_version:
+                    continue
+                if len(items) >= limit:
+                    return JobChangesRecord(summary, items, cursor=items[-1].version)
+                items.append(replace(item))
+        return JobChangesRecord(summary, items, cursor=summary.version)
 
     def set_state(self, job_id: str, state: str) -> None:
-        with self._lock:
-            job = self._jobs.get(job_id)
-            if job is None:
-                return
-            job.state = state
+        slot = self._jobs.get(job_id)
+        if slot is None:
+            return
+        with slot.lock:
+            slot.job.state = state
+            slot.job.version += 1
 
     def update_item(
         self,
         job_id: str,
-        url: str,
+        index: int,
         *,
         status: str,
         pdf_url: str | None = None,
         reason: str | None = None,
+        sha256: str | None = None,
+        size_bytes: int | None = None,
     ) -> None:
-        with self._lock:
-            job = self._jobs.get(job_id)
-            if job is None:
+        slot = self._jobs.get(job_id)
+        if slot is None:
+            return
+        with slot.lock:
+            if not 0 <= index < len(slot.job.items):
                 return
-            for item in job.items:
-                if item.url == url:
-                    item.status = status
-                    item.pdf_url = pdf_url
-                    item.reason = reason
-                    break
+            item = slot.job.items[index]
+            slot.counts[item.status] -= 1
+            slot.counts[status] += 1
+            item.status = status
+            item.pdf_url = pdf_url
+            item.reason = reason
+            item.sha256 = sha256
+            item.size_bytes = size_bytes
+            slot.record_change(item)
@@ -0,0 +1,342 @@
+"""SQLite-backed `JobsRepository` that survives restarts.
+
+Stores the same `JobRecord`/`JobItemRecord` model as `jobs_repo.py` in two
+tables, with items keyed by `(job_id, position)` and indexed on
+`(job_id, url)` for `item_positions`; `update_item` addresses an item by its
+position, i.e. its primary key.  Every change stamps the item with the job's
+next `version`, and `(job_id, version)` is indexed so `changes_since` reads only
+what changed.  The database runs in WAL mode with
+`synchronous=NORMAL`, and item updates are buffered and written in one
+transaction per batch (when the buffer fills, after `flush_interval` seconds,
+or before any read), so concurrent resolver workers do not pay a commit per
+item.  Reads always see every update accepted so far.  Writes take the write
+lock up front (`BEGIN IMMEDIATE`) and wait up to `busy_timeout` seconds for
+other processes sharing the file; a batch that still fails to commit is kept
+and retried with the next flush rather than dropped.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Iterator, List
+from uuid import uuid4
+
+from .jobs_repo import (
+    JobChangesRecord,
+    JobItemRecord,
+    JobRecord,
+    JobsRepository,
+    JobSummaryRecord,
+)
+
+
+_LOGGER = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    state TEXT NOT NULL,
+    version INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS job_items (
+    job_id TEXT NOT NULL REFERENCES jobs (id),
+    position INTEGER NOT NULL,
+    url TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    pdf_url TEXT,
+    reason TEXT,
+    version INTEGER NOT NULL DEFAULT 0,
+    sha256 TEXT,
+    size_bytes INTEGER,
+    PRIMARY KEY (job_id, position)
+);
+CREATE INDEX IF NOT EXISTS job_items_job_url ON job_items (job_id, url);
+CREATE INDEX IF NOT EXISTS job_items_job_status ON job_items (job_id, status, position);
+CREATE INDEX IF NOT EXISTS job_items_job_version ON job_items (job_id, version);
+"""
+
+# Columns added after the first release, created on open for older databases.
+_ADDED_ITEM_COLUMNS = {"sha256": "TEXT", "size_bytes": "INTEGER"}
+
+_ITEM_COLUMNS = "position, url, status, pdf_url, reason, version, sha256, size_bytes"
+
+_INSERT_JOB = "INSERT INTO jobs (id, created_at, state, version) VALUES (?, ?, ?, ?)"
+_INSERT_ITEM = "INSERT INTO job_items (job_id, position, url, version) VALUES (?, ?, ?, ?)"
+_SELECT_JOB = "SELECT created_at, state, version FROM jobs WHERE id = ?"
+_SELECT_VERSION = "SELECT version FROM jobs WHERE id = ?"
+_SELECT_STATE = "SELECT state FROM jobs WHERE id = ?"
+_SELECT_ITEMS = f"SELECT {_ITEM_COLUMNS} FROM job_items WHERE job_id = ? ORDER BY position"
+_SELECT_PAGE = (
+    f"SELECT {_ITEM_COLUMNS} FROM job_items "
+    "WHERE job_id = ? AND position >= ? ORDER BY position LIMIT ?"
+)
+_SELECT_STATUS_PAGE = (
+    f"SELECT {_ITEM_COLUMNS} FROM job_items "
+    "WHERE job_id = ? AND status = ? AND position >= ? ORDER BY position LIMIT ?"
+)
+_SELECT_CHANGES = (
+    f"SELECT {_ITEM_COLUMNS} FROM job_items "
+    "WHERE job_id = ? AND version > ? ORDER BY version LIMIT ?"
+)
+_COUNT_STATUSES = "SELECT status, COUNT(*) FROM job_items WHERE job_id = ? GROUP BY status"
+_SELECT_POSITIONS = "SELECT position FROM job_items WHERE job_id = ? AND url = ? ORDER BY position"
+_NEXT_POSITION = "SELECT COALESCE(MAX(position) + 1, 0) FROM job_items WHERE job_id = ?"
+_UPDATE_STATE = "UPDATE jobs SET state = ?, version = version + 1 WHERE id = ?"
+_UPDATE_VERSION = "UPDATE jobs SET version = ? WHERE id = ?"
+_UPDATE_ITEM = (
+    "UPDATE job_items SET status = ?, pdf_url = ?, reason = ?, sha256 = ?, size_bytes = ?, "
+    "version = ? WHERE job_id = ? AND position = ?"
+)
+
+
+class SqliteJobsRepository(JobsRepository):
+    """Durable jobs repository with batched item writes."""
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        batch_size: int = 64,
+        flush_interval: float = 0.2,
+        busy_timeout: float = 30.0,
+    ) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._batch_size = max(1, batch_size)
+        self._lock = threading.Lock()
+        self._pending: list[
+            tuple[str, str | None, str | None, str | None, int | None, str, int]
+        ] = []
+        self._db = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None, timeout=busy_timeout
+        )
+        self._db.execute(f"PRAGMA busy_timeout={int(busy_timeout * 1000)}")
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(job_items)")}
+        for column, column_type in _ADDED_ITEM_COLUMNS.items():
+            if column not in columns:
+                self._db.execute(f"ALTER TABLE job_items ADD COLUMN {column} {column_type}")
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._flush_periodically, args=(flush_interval,), daemon=True
+        )
+        self._flusher.start()
+
+    def create(self, urls: list[str]) -> JobRecord:
+        job = JobRecord(
+            id=uuid4().hex,
+            created_at=datetime.now(timezone.utc),
+            state="queued",
+            items=[
+                JobItemRecord(url=url, index=index, version=index + 1)
+                for index, url in enumerate(urls)
+            ],
+            version=len(urls),
+        )
+        with self._lock, self._transaction():
+            self._db.execute(
+                _INSERT_JOB, (job.id, job.created_at.isoformat(), job.state, job.version)
+            )
+            self._db.executemany(
+                _INSERT_ITEM, ((job.id, item.index, item.url, item.version) for item in job.items)
+            )
+        return job
+
+    def append_items(self, job_id: str, urls: Iterable[str]) -> List[JobItemRecord]:
+        with self._lock, self._transaction():
+            row = self._db.execute(_SELECT_VERSION, (job_id,)).fetchone()
+            if row is None:
+                return []
+            (version,) = row
+            (start,) = self._db.execute(_NEXT_POSITION, (job_id,)).fetchone()
+            items = [
+                JobItemRecord(url=url, index=start + offset, version=version + offset + 1)
+                for offset, url in enumerate(urls)
+            ]
+            self._db.executemany(
+                _INSERT_ITEM, ((job_id, item.index, item.url, item.version) for item in items)
+            )
+            self._db.execute(_UPDATE_VERSION, (version + len(items), job_id))
+        return items
+
+    def get(self, job_id: str) -> JobRecord | None:
+        with self._lock:
+            self._flush()
+            row = self._db.execute(_SELECT_JOB, (job_id,)).fetchone()
+            if row is None:
+                return None
+            items = self._select_items(job_id)
+        created_at, state, version = row
+        return JobRecord(
+            id=job_id,
+            created_at=datetime.fromisoformat(created_at),
+            state=state,
+            items=items,
+            version=version,
+        )
+
+    def list_items(self, job_id: str) -> List[JobItemRecord]:
+        with self._lock:
+            self._flush()
+            return self._select_items(job_id)
+
+    def item_positions(self, job_id: str, url: str) -> List[int]:
+        with self._lock:
+            rows = self._db.execute(_SELECT_POSITIONS, (job_id, url)).fetchall()
+        return [position for (position,) in rows]
+
+    def page_items(
+        self, job_id: str, *, start: int = 0, limit: int, status: str | None = None
+    ) -> List[JobItemRecord]:
+        if status is None:
+            query, params = _SELECT_PAGE, (job_id, start, limit)
+        else:
+            query, params = _SELECT_STATUS_PAGE, (job_id, status, start, limit)
+        with self._lock:
+            self._flush()
+            return _to_items(self._db.execute(query, params))
+
+    def summary(self, job_id: str) -> JobSummaryRecord | None:
+        with self._lock:
+            self._flush()
+            return self._summary(job_id)
+
+    def version(self, job_id: str) -> int | None:
+        with self._lock:
+            self._flush()
+            row = self._db.execute(_SELECT_VERSION, (job_id,)).fetchone()
+        return None if row is None else row[0]
+
+    def state(self, job_id: str) -> str | None:
+        with self._lock:
+            row = self._db.execute(_SELECT_STATE, (job_id,)).fetchone()
+        return None if row is None else row[0]
+
+    def changes_since(
+        self, job_id: str, version: int, *, limit: int
+    ) -> JobChangesRecord | None:
+        with self._lock:
+            self._flush()
+            summary = self._summary(job_id)
+            if summary is None:
+                return None
+            items = _to_items(self._db.execute(_SELECT_CHANGES, (job_id, version, limit + 1)))
+        if len(items) > limit:
+            items = items[:limit]
+            return JobChangesRecord(summary, items, cursor=items[-1].version)
+        return JobChangesRecord(summary, items, cursor=summary.version)
+
+    def set_state(self, job_id: str, state: str) -> None:
+        with self._lock:
+            self._flush()
+            self._db.execute(_UPDATE_STATE, (state, job_id))
+
+    def update_item(
+        self,
+        job_id: str,
+        index: int,
+        *,
+        status: str,
+        pdf_url: str | None = None,
+        reason: str | None = None,
+        sha256: str | None = None,
+        size_bytes: int | None = None,
+    ) -> None:
+        with self._lock:
+            self._pending.append((status, pdf_url, reason, sha256, size_bytes, job_id, index))
+            if len(self._pending) >= self._batch_size:
+                self._flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def close(self) -> None:
+        self._closed.set()
+        self._flusher.join()
+        with self._lock:
+            self._flush()
+            self._db.close()
+
+    def _summary(self, job_id: str) -> JobSummaryRecord | None:
+        row = self._db.execute(_SELECT_JOB, (job_id,)).fetchone()
+        if row is None:
+            return None
+        counts = dict(self._db.execute(_COUNT_STATUSES, (job_id,)).fetchall())
+        created_at, state, version = row
+        return JobSummaryRecord(
+            id=job_id,
+            created_at=datetime.fromisoformat(created_at),
+            state=state,
+            counts=counts,
+            version=version,
+        )
+
+    def _select_items(self, job_id: str) -> List[JobItemRecord]:
+        return _to_items(self._db.execute(_SELECT_ITEMS, (job_id,)))
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        versions: dict[str, int] = {}
+        rows = []
+        # The batch stays pending until it has committed, so a failed write
+        # is retried by the next flush instead of being lost.
+        with self._transaction():
+            for status, pdf_url, reason, sha256, size_bytes, job_id, index in self._pending:
+                if job_id not in versions:
+                    row = self._db.execute(_SELECT_VERSION, (job_id,)).fetchone()
+                    if row is None:
+                        continue
+                    versions[job_id] = row[0]
+                versions[job_id] += 1
+                rows.append(
+                    (status, pdf_url, reason, sha256, size_bytes, versions[job_id], job_id, index)
+                )
+            self._db.executemany(_UPDATE_ITEM, rows)
+            self._db.executemany(
+                _UPDATE_VERSION, ((version, job_id) for job_id, version in versions.items())
+            )
+        self._pending = []
+
+    def _flush_periodically(self, interval: float) -> None:
+        while not self._closed.wait(interval):
+            try:
+                self.flush()
+            except Exception:
+                # The batch is still pending; keep the flusher alive and retry.
+                _LOGGER.exception("Flushing buffered job item updates failed")
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self._db.execute("COMMIT")
+
+
+def _to_items(rows: Iterable[tuple]) -> List[JobItemRecord]:
+    return [
+        JobItemRecord(
+            url=url,
+            index=index,
+            status=status,
+            pdf_url=pdf_url,
+            reason=reason,
+            version=version,
+            sha256=sha256,
+            size_bytes=size_bytes,
+        )
+        for index, url, status, pdf_url, reason, version, sha256, size_bytes in rows
+    ]
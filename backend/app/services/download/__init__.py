@@ -0,0 +1,17 @@
+"""Download stage run after an item's PDF URL is resolved.
+
+`app.api.jobs` hands each resolved `pdf_url` to `PdfDownloader`, which streams
+the file into the content-addressed `BlobStore` (see `storage.py`) and returns
+its SHA-256 and size for the job item.  Enabled with `downloads_enabled`.
+"""
+
+from .downloader import DownloadError, PdfDownloader
+from .storage import BlobStore, StagedBlob, StoredBlob
+
+__all__ = [
+    "BlobStore",
+    "DownloadError",
+    "PdfDownloader",
+    "StagedBlob",
+    "StoredBlob",
+]
@@ -0,0 +1,130 @@
+"""Streaming download of resolved PDF URLs into a `BlobStore`.
+
+`PdfDownloader.download` reads the response in `chunk_size` pieces and writes
+each one straight to a `StagedBlob`, so memory use does not depend on the file
+size.  The download is rejected as soon as it is known to be bad: a non-2xx
+status, a `Content-Length` over `max_bytes`, a body that outgrows `max_bytes`,
+or first bytes that are not the `%PDF-` magic (publishers often answer a PDF
+link with an HTML login page).  Requests share the resolver's
+`HostRateLimiter`, and with a `RobotsPolicy` (`resolver/robots.py`) a URL that
+robots.txt disallows is never requested: it fails with the policy's own
+"Disallowed by robots.txt" reason.  Errors a later attempt may not hit (429, 5xx, timeouts and
+connection failures) raise a `DownloadError` marked `transient`, which the job
+runners retry by re-queueing the item (`resolver/retry.py`).
+"""
+
+from __future__ import annotations
+
+from contextlib import nullcontext
+
+import httpx
+
+from ..resolver.exceptions import RobotsDisallowedError
+from ..resolver.rate_limit import HostRateLimiter, parse_retry_after
+from ..resolver.retry import is_transient, is_transient_status
+from ..resolver.robots import RobotsPolicy, RobotsResponse
+from .storage import BlobStore, StoredBlob
+
+
+_PDF_MAGIC = b"%PDF-"
+
+
+class DownloadError(Exception):
+    """Raised when a URL does not yield an acceptable PDF."""
+
+    def __init__(
+        self, message: str, *, transient: bool = False, retry_after: float | None = None
+    ) -> None:
+        super().__init__(message)
+        self.transient = transient
+        self.retry_after = retry_after
+
+
+class PdfDownloader:
+    """Downloads PDFs into content-addressed storage."""
+
+    def __init__(
+        self,
+        store: BlobStore,
+        *,
+        timeout: float,
+        user_agent: str,
+        max_bytes: int,
+        chunk_size: int = 64 * 1024,
+        rate_limiter: HostRateLimiter | None = None,
+        robots: RobotsPolicy | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self._store = store
+        self._max_bytes = max_bytes
+        self._chunk_size = chunk_size
+        self._rate_limiter = rate_limiter
+        self._robots = robots
+        self._client = httpx.AsyncClient(
+            timeout=timeout,
+            headers={"User-Agent": user_agent, "Accept": "application/pdf,*/*;q=0.8"},
+            follow_redirects=True,
+            transport=transport,
+        )
+
+    @property
+    def store(self) -> BlobStore:
+        return self._store
+
+    async def download(self, url: str) -> StoredBlob:
+        if self._robots is not None:
+            try:
+                await self._robots.acheck(url, self._fetch_robots)
+            except RobotsDisallowedError as exc:
+                raise DownloadError(
+                    exc.reason, transient=exc.transient, retry_after=exc.retry_after
+                ) from exc
+        try:
+            with self._store.stage() as staged:
+                limit = self._rate_limiter.alimit(url) if self._rate_limiter else nullcontext()
+                async with limit, self._client.stream("GET", url) as response:
+                    if not response.is_success:
+                        raise DownloadError(
+                            f"Download failed with HTTP {response.status_code}",
+                            transient=is_transient_status(response.status_code),
+                            retry_after=parse_retry_after(response.headers.get("Retry-After")),
+                        )
+                    declared = response.headers.get("Content-Length", "")
+                    if declared.isdigit() and int(declared) > self._max_bytes:
+                        raise DownloadError(self._too_large())
+                    head = b""
+                    async for chunk in response.aiter_bytes(self._chunk_size):
+                        if len(head) < len(_PDF_MAGIC):
+                            head += chunk[: len(_PDF_MAGIC)]
+                            if len(head) >= len(_PDF_MAGIC) and not head.startswith(_PDF_MAGIC):
+                                raise DownloadError(_not_a_pdf(response))
+                        if staged.size + len(chunk) > self._max_bytes:
+                            raise DownloadError(self._too_large())
+                        staged.write(chunk)
+                if not head.startswith(_PDF_MAGIC):
+                    raise DownloadError(_not_a_pdf(response))
+                return self._store.commit(staged)
+        except httpx.HTTPError as exc:
+            raise DownloadError(
+                f"Download failed: {exc.__class__.__name__}", transient=is_transient(exc)
+            ) from exc
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def _fetch_robots(self, url: str) -> RobotsResponse:
+        try:
+            limit = self._rate_limiter.alimit(url) if self._rate_limiter else nullcontext()
+            async with limit:
+                response = await self._client.get(url)
+        except httpx.HTTPError:
+            return None, ""
+        return response.status_code, response.text
+
+    def _too_large(self) -> str:
+        return f"PDF larger than {self._max_bytes} bytes"
+
+
+def _not_a_pdf(response: httpx.Response) -> str:
+    content_type = response.headers.get("Content-Type", "unknown")
+    return f"Downloaded file is not a PDF ({content_type.split(';')[0]})"
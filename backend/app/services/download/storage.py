@@ -0,0 +1,96 @@
+"""Content-addressed storage for downloaded PDFs.
+
+`downloader.py` streams a response into a `StagedBlob` (a temp file under
+`<root>/tmp`) that hashes the bytes as they are written, then `BlobStore.commit`
+moves it to `<root>/blobs/<sha[:2]>/<sha>.pdf`.  A blob that already exists is
+kept and the new copy discarded, so identical PDFs reached through different
+articles or jobs are stored once.  The move is an atomic `os.replace` on the
+same filesystem, so concurrent processes committing the same bytes never leave
+a partial file behind.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+
+@dataclass(frozen=True, slots=True)
+class StoredBlob:
+    """A committed file; `existed` is True when the bytes were already stored."""
+
+    sha256: str
+    size: int
+    path: Path
+    existed: bool = False
+
+
+class StagedBlob:
+    """Temp file that tracks the SHA-256 and size of everything written to it."""
+
+    def __init__(self, file: BinaryIO, path: Path) -> None:
+        self.path = path
+        self.size = 0
+        self._file = file
+        self._digest = hashlib.sha256()
+
+    def write(self, chunk: bytes) -> None:
+        self._file.write(chunk)
+        self._digest.update(chunk)
+        self.size += len(chunk)
+
+    def close(self) -> None:
+        self._file.close()
+
+    @property
+    def sha256(self) -> str:
+        return self._digest.hexdigest()
+
+
+class BlobStore:
+    """Stores files under their SHA-256 below `root`."""
+
+    def __init__(self, root: str | os.PathLike[str]) -> None:
+        self._root = Path(root)
+        self._blobs = self._root / "blobs"
+        self._tmp = self._root / "tmp"
+        self._blobs.mkdir(parents=True, exist_ok=True)
+        self._tmp.mkdir(parents=True, exist_ok=True)
+
+    def path_for(self, sha256: str) -> Path:
+        return self._blobs / sha256[:2] / f"{sha256}.pdf"
+
+    def exists(self, sha256: str) -> bool:
+        return self.path_for(sha256).is_file()
+
+    def open(self, sha256: str) -> BinaryIO:
+        return self.path_for(sha256).open("rb")
+
+    @contextmanager
+    def stage(self) -> Iterator[StagedBlob]:
+        """Yield a temp file to write into; it is deleted unless committed."""
+
+        fd, name = tempfile.mkstemp(dir=self._tmp, suffix=".part")
+        path = Path(name)
+        try:
+            with os.fdopen(fd, "wb") as file:
+                yield StagedBlob(file, path)
+        finally:
+            path.unlink(missing_ok=True)
+
+    def commit(self, staged: StagedBlob) -> StoredBlob:
+        """Move a fully written `StagedBlob` into place, reusing an existing copy."""
+
+        staged.close()
+        sha256 = staged.sha256
+        target = self.path_for(sha256)
+        if target.is_file():
+            return StoredBlob(sha256, staged.size, target, existed=True)
+        target.parent.mkdir(exist_ok=True)
+        os.replace(staged.path, target)
+        return StoredBlob(sha256, staged.size, target)
@@ -0,0 +1,13 @@
+"""Durable task queue decoupling job execution from the API process.
+
+With `jobs_dispatch = "queue"`, `app.api.jobs` turns each job item into a task
+on a `TaskQueue` instead of resolving it in-process, and `python -m app.worker`
+processes lease those tasks, resolve them and ack them.  A lease hides a task
+for a visibility timeout; tasks whose worker dies before acking reappear once
+it expires, so work survives crashes and restarts of either side.
+"""
+
+from .base import LeasedTask, TaskQueue
+from .sqlite_queue import SqliteTaskQueue
+
+__all__ = ["LeasedTask", "SqliteTaskQueue", "TaskQueue"]
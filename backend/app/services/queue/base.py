@@ -0,0 +1,62 @@
+"""Queue protocol shared by the API (producer) and `app.worker` (consumer).
+
+Payloads are small JSON-serialisable dicts; `app.api.jobs` defines their shape.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Iterable, Protocol
+
+
+@dataclass(frozen=True, slots=True)
+class LeasedTask:
+    """A task handed to one worker until it is acked, released or its lease expires.
+
+    `attempts` counts every delivery; `releases` the ones a worker handed back
+    on purpose, so `attempts - releases` deliveries ended with a lost lease.
+    """
+
+    id: int
+    payload: dict[str, Any]
+    attempts: int
+    lease_token: str
+    releases: int = 0
+
+
+class TaskQueue(Protocol):
+    def enqueue(
+        self,
+        payloads: Iterable[dict[str, Any]],
+        *,
+        delay: float = 0.0,
+        ranks: Iterable[float] | None = None,
+    ) -> int:
+        """Add tasks and return how many were added.
+
+        Visible tasks are leased lowest rank first; `ranks` pairs up with
+        `payloads` and defaults to 0 for every task.
+        """
+        ...
+
+    def lease(self, *, limit: int, visibility_timeout: float) -> list[LeasedTask]:
+        """Claim up to `limit` visible tasks, hiding them for `visibility_timeout`."""
+        ...
+
+    def ack(self, task: LeasedTask) -> bool:
+        """Delete a finished task; False if the lease had already been lost."""
+        ...
+
+    def release(self, task: LeasedTask, *, delay: float = 0.0) -> bool:
+        """Give a task back, visible again after `delay` seconds; counted in `releases`."""
+        ...
+
+    def extend(self, task: LeasedTask, *, visibility_timeout: float) -> bool:
+        ...
+
+    def pending_count(self) -> int:
+        ...
+
+    def min_rank(self) -> float:
+        """Lowest rank still queued (0 when empty): where newly ranked work starts."""
+        ...
@@ -0,0 +1,148 @@
+"""`TaskQueue` on a single SQLite table, safe to share between processes.
+
+A task is visible while `available_at <= now`, and visible tasks are leased
+lowest `rank` first (then oldest first); `app.api.jobs` ranks items so that
+jobs interleave in proportion to their priority.  Leasing stamps a fresh
+`lease_token` and pushes `available_at` out by the visibility timeout inside a
+`BEGIN IMMEDIATE` transaction, so two processes can never claim the same task;
+ack/release/extend only succeed while the caller's token is still current.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from itertools import repeat
+from pathlib import Path
+from typing import Any, Callable, Iterable
+from uuid import uuid4
+
+from .base import LeasedTask, TaskQueue
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    payload TEXT NOT NULL,
+    available_at REAL NOT NULL,
+    lease_token TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    rank REAL NOT NULL DEFAULT 0,
+    releases INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS tasks_available_at ON tasks (available_at);
+"""
+_RANK_INDEX = "CREATE INDEX IF NOT EXISTS tasks_rank ON tasks (rank, id)"
+
+_INSERT = "INSERT INTO tasks (payload, available_at, rank) VALUES (?, ?, ?)"
+_LEASE = (
+    "UPDATE tasks SET available_at = ?, lease_token = ?, attempts = attempts + 1 "
+    "WHERE id IN (SELECT id FROM tasks WHERE available_at <= ? ORDER BY rank, id LIMIT ?) "
+    "RETURNING rank, id, payload, attempts, releases"
+)
+_ACK = "DELETE FROM tasks WHERE id = ? AND lease_token = ?"
+_RELEASE = (
+    "UPDATE tasks SET available_at = ?, lease_token = NULL, releases = releases + 1 "
+    "WHERE id = ? AND lease_token = ?"
+)
+_EXTEND = "UPDATE tasks SET available_at = ? WHERE id = ? AND lease_token = ?"
+_COUNT = "SELECT COUNT(*) FROM tasks"
+_MIN_RANK = "SELECT COALESCE(MIN(rank), 0) FROM tasks"
+
+
+class SqliteTaskQueue(TaskQueue):
+    """Lease/ack task queue stored in SQLite (WAL)."""
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None, timeout=30.0
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(tasks)")}
+        if "rank" not in columns:
+            self._db.execute("ALTER TABLE tasks ADD COLUMN rank REAL NOT NULL DEFAULT 0")
+        if "releases" not in columns:
+            self._db.execute("ALTER TABLE tasks ADD COLUMN releases INTEGER NOT NULL DEFAULT 0")
+        self._db.execute(_RANK_INDEX)
+
+    def enqueue(
+        self,
+        payloads: Iterable[dict[str, Any]],
+        *,
+        delay: float = 0.0,
+        ranks: Iterable[float] | None = None,
+    ) -> int:
+        available_at = self._clock() + delay
+        rows = [
+            (json.dumps(payload), available_at, rank)
+            for payload, rank in zip(payloads, repeat(0.0) if ranks is None else ranks)
+        ]
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.executemany(_INSERT, rows)
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+        return len(rows)
+
+    def lease(self, *, limit: int, visibility_timeout: float) -> list[LeasedTask]:
+        now = self._clock()
+        token = uuid4().hex
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._db.execute(
+                    _LEASE, (now + visibility_timeout, token, now, limit)
+                ).fetchall()
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+        rows.sort()
+        return [
+            LeasedTask(task_id, json.loads(payload), attempts, token, releases)
+            for _rank, task_id, payload, attempts, releases in rows
+        ]
+
+    def ack(self, task: LeasedTask) -> bool:
+        return self._apply(_ACK, (task.id, task.lease_token))
+
+    def release(self, task: LeasedTask, *, delay: float = 0.0) -> bool:
+        return self._apply(_RELEASE, (self._clock() + delay, task.id, task.lease_token))
+
+    def extend(self, task: LeasedTask, *, visibility_timeout: float) -> bool:
+        return self._apply(
+            _EXTEND, (self._clock() + visibility_timeout, task.id, task.lease_token)
+        )
+
+    def pending_count(self) -> int:
+        with self._lock:
+            (count,) = self._db.execute(_COUNT).fetchone()
+        return count
+
+    def min_rank(self) -> float:
+        with self._lock:
+            (rank,) = self._db.execute(_MIN_RANK).fetchone()
+        return rank
+
+    def close(self) -> None:
+        self._db.close()
+
+    def _apply(self, statement: str, params: tuple) -> bool:
+        with self._lock:
+            return self._db.execute(statement, params).rowcount == 1
@@ -8,16 +8,28 @@ so they stay agnostic of lower-level details implemented across
 `fetcher.py`, `html_parser.py`, `pmc.py`, and `external.py`.
 """
 
-from .manager import PubmedResolverManager, ResolverConfig, build_default_resolver
+from .manager import (
+    AsyncPubmedResolverManager,
+    PubmedResolverManager,
+    ResolverConfig,
+    build_default_async_resolver,
+    build_default_resolver,
+    build_rate_limiter,
+    build_robots_policy,
+)
 from .results import PdfResolutionResult, ResolutionSource
 from .exceptions import ResolverError
 
 __all__ = [
+    "AsyncPubmedResolverManager",
     "PubmedResolverManager",
     "PdfResolutionResult",
     "ResolutionSource",
     "ResolverError",
     "ResolverConfig",
+    "build_default_async_resolver",
     "build_default_resolver",
+    "build_rate_limiter",
+    "build_robots_policy",
 ]
 
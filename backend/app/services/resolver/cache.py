@@ -0,0 +1,273 @@
+"""On-disk HTTP response cache layered over the resolver fetchers.
+
+`CachingHtmlFetcher` (and its asyncio twin) implement the same protocols as the
+fetchers in `fetcher.py`, so `manager.py` can wrap either the HTTPX or the mock
+fetcher without the parser/extractor modules noticing.  Bodies live in a
+`ResponseCacheStore`: zlib-compressed files named after the SHA-256 of the
+canonical URL (`url_utils.canonicalize_url`), indexed by a small SQLite table
+that tracks validators, per-entry expiry and last access for LRU eviction.
+Expired entries are revalidated with conditional GETs when the wrapped fetcher
+supports `fetch_conditional`.  Freshness follows the origin's `Cache-Control`:
+`max-age` (including 0) overrides the default TTL, `no-cache` pages are stored
+but revalidated before each use, and `no-store` pages are never written.
+Expiry is measured on the store's clock.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from .fetcher import AsyncHtmlFetcher, FetchResponse, HtmlFetcher
+from .url_utils import canonicalize_url
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    expires_at REAL NOT NULL,
+    size INTEGER NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+"""
+
+
+@dataclass(slots=True)
+class CachedResponse:
+    """A stored page body with the validators captured when it was fetched."""
+
+    url: str
+    body: str
+    etag: str | None
+    last_modified: str | None
+    expires_at: float
+
+    def is_fresh(self, now: float) -> bool:
+        return self.expires_at > now
+
+    @property
+    def revalidatable(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+
+class ResponseCacheStore:
+    """Size-bounded, compressed body store keyed by canonical URL."""
+
+    def __init__(
+        self,
+        root: str | os.PathLike[str],
+        *,
+        max_bytes: int,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._root = Path(root)
+        self._root.mkdir(parents=True, exist_ok=True)
+        self._max_bytes = max_bytes
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            self._root / "index.sqlite3", check_same_thread=False, isolation_level=None
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    def get(self, url: str) -> CachedResponse | None:
+        key = _cache_key(url)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT url, etag, last_modified, expires_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            try:
+                body = zlib.decompress(self._body_path(key).read_bytes()).decode("utf-8")
+            except (OSError, zlib.error):
+                self._delete(key)
+                return None
+            self._db.execute(
+                "UPDATE entries SET accessed_at = ? WHERE key = ?", (self._clock(), key)
+            )
+        stored_url, etag, last_modified, expires_at = row
+        return CachedResponse(stored_url, body, etag, last_modified, expires_at)
+
+    def put(
+        self,
+        url: str,
+        body: str,
+        *,
+        ttl: float,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        key = _cache_key(url)
+        payload = zlib.compress(body.encode("utf-8"))
+        path = self._body_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # A unique temp file per write: threads (and their ids) of different
+        # processes sharing the cache directory can otherwise collide.
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(payload)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        now = self._clock()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries "
+                "(key, url, etag, last_modified, expires_at, size, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, canonicalize_url(url), etag, last_modified, now + ttl, len(payload), now),
+            )
+            self._evict()
+
+    def refresh(
+        self,
+        url: str,
+        *,
+        ttl: float,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        """Extend an entry's lifetime after a `304 Not Modified`."""
+
+        now = self._clock()
+        with self._lock:
+            self._db.execute(
+                "UPDATE entries SET expires_at = ?, accessed_at = ?, "
+                "etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified) "
+                "WHERE key = ?",
+                (now + ttl, now, etag, last_modified, _cache_key(url)),
+            )
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            (total,) = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return total
+
+    def now(self) -> float:
+        return self._clock()
+
+    def close(self) -> None:
+        self._db.close()
+
+    def _evict(self) -> None:
+        (total,) = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        while total > self._max_bytes:
+            victims = self._db.execute(
+                "SELECT key, size FROM entries ORDER BY accessed_at LIMIT 64"
+            ).fetchall()
+            if not victims:
+                return
+            for key, size in victims:
+                self._delete(key)
+                total -= size
+                if total <= self._max_bytes:
+                    return
+
+    def _delete(self, key: str) -> None:
+        self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+        self._body_path(key).unlink(missing_ok=True)
+
+    def _body_path(self, key: str) -> Path:
+        return self._root / key[:2] / f"{key}.html.z"
+
+
+class CachingHtmlFetcher(HtmlFetcher):
+    """Serves pages from a `ResponseCacheStore`, revalidating when stale."""
+
+    def __init__(self, inner: HtmlFetcher, store: ResponseCacheStore, *, ttl: float) -> None:
+        self._inner = inner
+        self._store = store
+        self._ttl = ttl
+
+    def fetch(self, url: str) -> str:
+        cached = self._store.get(url)
+        if cached is not None and cached.is_fresh(self._store.now()):
+            return cached.body
+        response = self._fetch_upstream(url, cached)
+        return _store_response(self._store, url, cached, response, self._ttl)
+
+    def _fetch_upstream(self, url: str, cached: CachedResponse | None) -> FetchResponse:
+        fetch_conditional = getattr(self._inner, "fetch_conditional", None)
+        if not callable(fetch_conditional):
+            return FetchResponse(text=self._inner.fetch(url))
+        if cached is not None and cached.revalidatable:
+            return fetch_conditional(url, etag=cached.etag, last_modified=cached.last_modified)
+        return fetch_conditional(url)
+
+    def close(self) -> None:
+        close_method = getattr(self._inner, "close", None)
+        if callable(close_method):
+            close_method()
+        self._store.close()
+
+
+class AsyncCachingHtmlFetcher(AsyncHtmlFetcher):
+    """Asyncio counterpart of `CachingHtmlFetcher`; store I/O runs in threads."""
+
+    def __init__(self, inner: AsyncHtmlFetcher, store: ResponseCacheStore, *, ttl: float) -> None:
+        self._inner = inner
+        self._store = store
+        self._ttl = ttl
+
+    async def fetch(self, url: str) -> str:
+        cached = await asyncio.to_thread(self._store.get, url)
+        if cached is not None and cached.is_fresh(self._store.now()):
+            return cached.body
+        response = await self._fetch_upstream(url, cached)
+        return await asyncio.to_thread(
+            _store_response, self._store, url, cached, response, self._ttl
+        )
+
+    async def _fetch_upstream(self, url: str, cached: CachedResponse | None) -> FetchResponse:
+        fetch_conditional = getattr(self._inner, "fetch_conditional", None)
+        if not callable(fetch_conditional):
+            return FetchResponse(text=await self._inner.fetch(url))
+        if cached is not None and cached.revalidatable:
+            return await fetch_conditional(
+                url, etag=cached.etag, last_modified=cached.last_modified
+            )
+        return await fetch_conditional(url)
+
+    async def aclose(self) -> None:
+        close_method = getattr(self._inner, "aclose", None)
+        if callable(close_method):
+            await close_method()
+        self._store.close()
+
+
+def _store_response(
+    store: ResponseCacheStore,
+    url: str,
+    cached: CachedResponse | None,
+    response: FetchResponse,
+    default_ttl: float,
+) -> str:
+    ttl = float(response.max_age) if response.max_age is not None else default_ttl
+    if response.not_modified and cached is not None:
+        store.refresh(url, ttl=ttl, etag=response.etag, last_modified=response.last_modified)
+        return cached.body
+    if response.no_store:
+        return response.text
+    store.put(url, response.text, ttl=ttl, etag=response.etag, last_modified=response.last_modified)
+    return response.text
+
+
+def _cache_key(url: str) -> str:
+    return hashlib.sha256(canonicalize_url(url).encode("utf-8")).hexdigest()
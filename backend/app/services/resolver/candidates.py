@@ -0,0 +1,65 @@
+"""Scoring table that orders full-text link candidates.
+
+`html_parser.py` ranks the external links of a PubMed page with `rank_links`,
+and the crawler in `external.py` ranks the links it finds on landing pages the
+same way, so the per-item crawl budget goes to the likeliest PDF sources first.
+Scores come from the URL shape and the anchor text; ties keep document order,
+so the same page always yields the same ranking.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Iterable
+
+
+@dataclass(frozen=True, slots=True)
+class LinkCandidate:
+    """An absolute link URL together with the text of its anchor."""
+
+    url: str
+    text: str = ""
+
+
+_URL_SCORES: tuple[tuple[re.Pattern[str], int], ...] = (
+    (re.compile(r"\.pdf(?:$|[?#])", re.IGNORECASE), 60),
+    (re.compile(r"/(?:e?pdf|pdfft|pdfdirect)(?:/|$|\?)", re.IGNORECASE), 40),
+    (re.compile(r"^https?://(?:dx\.)?doi\.org/", re.IGNORECASE), 30),
+    (re.compile(r"/(?:full|fulltext|full-text)(?:/|$|\?)", re.IGNORECASE), 10),
+    (re.compile(r"europepmc\.org|scholar\.google\.|ncbi\.nlm\.nih\.gov/", re.IGNORECASE), -20),
+)
+
+_TEXT_SCORES: tuple[tuple[str, int], ...] = (
+    ("pdf", 40),
+    ("full text", 25),
+    ("full-text", 25),
+    ("publisher", 20),
+    ("journal", 15),
+    ("doi", 10),
+    ("free", 5),
+    ("supplement", -30),
+    ("citation", -30),
+    ("abstract", -30),
+    ("sign in", -30),
+    ("subscribe", -30),
+)
+
+
+def score_link(candidate: LinkCandidate) -> int:
+    """Higher scores mean the link is more likely to lead to the article PDF."""
+
+    score = sum(points for pattern, points in _URL_SCORES if pattern.search(candidate.url))
+    text = " ".join(candidate.text.lower().split())
+    return score + sum(points for word, points in _TEXT_SCORES if word in text)
+
+
+def rank_links(candidates: Iterable[LinkCandidate]) -> list[str]:
+    """Unique candidate URLs, best first; equal scores keep their input order."""
+
+    best: dict[str, int] = {}
+    for candidate in candidates:
+        score = score_link(candidate)
+        if score > best.get(candidate.url, score - 1):
+            best[candidate.url] = score
+    return sorted(best, key=best.__getitem__, reverse=True)
@@ -13,9 +13,35 @@ class ResolverError(Exception):
 
 
 class FetchError(ResolverError):
-    """Raised when fetching HTML fails."""
+    """Raised when fetching HTML fails.
+
+    `transient` tells callers whether a later retry could succeed (see
+    `retry.py`); `retry_after` is the delay the server asked for, if any.
+    """
+
+    def __init__(
+        self, message: str = "", *, transient: bool = False, retry_after: float | None = None
+    ) -> None:
+        super().__init__(message)
+        self.transient = transient
+        self.retry_after = retry_after
 
 
 class ParseError(ResolverError):
     """Raised when parsing HTML content fails."""
 
+
+class RobotsDisallowedError(FetchError):
+    """Raised instead of fetching a URL that robots.txt disallows.
+
+    `transient` is set when robots.txt itself was unreachable, so the block
+    only lasts until it can be fetched again.
+    """
+
+    reason = "Disallowed by robots.txt"
+
+    def __init__(
+        self, url: str, *, transient: bool = False, retry_after: float | None = None
+    ) -> None:
+        super().__init__(self.reason, transient=transient, retry_after=retry_after)
+        self.url = url
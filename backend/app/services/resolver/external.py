@@ -1,59 +1,296 @@
 """External landing page branch for detecting PDF downloads.
 
-When `html_parser.py` returns an external full-text link, `manager.py` invokes
-this module.  It shares the same fetcher abstraction (`fetcher.py`) and emits
-`PdfResolutionResult` instances (`results.py`), allowing the manager to compare
-PMC vs external outcomes consistently.
+When `html_parser.py` returns external full-text links, `manager.py` invokes
+this module.  It shares the fetcher abstraction (`fetcher.py`) and emits
+`PdfResolutionResult` instances (`results.py`), so the manager can compare PMC
+and external outcomes consistently.  `ExternalPdfLocator` drives an
+`HtmlFetcher`; `AsyncExternalPdfLocator` is its asyncio counterpart.
+
+Each locator runs a small crawl bounded by a `CrawlBudget`.  The top-ranked
+candidates are fetched first (concurrently in the async locator).  One more
+hop then follows meta refreshes and PDF links that turned out to be viewer
+pages.  With a `PdfProber`, every PDF link is checked before it is accepted,
+so the crawl stops at the first URL that really serves a PDF.  The prober also
+enables the `PublisherRuleRegistry` (`publisher_rules.py`): a URL matching a
+publisher rule is rewritten to its PDF URL, and if the probe confirms it the
+page fetch is skipped.  Derived URLs are only guesses (paywalled articles match
+the same patterns), so without a prober the rules are not consulted.
 """
 
 from __future__ import annotations
 
-from urllib.parse import urljoin
-
-from bs4 import BeautifulSoup
+import asyncio
+import re
+import time
+from typing import NamedTuple, Sequence
+from urllib.parse import urljoin, urlsplit
 
-from .fetcher import HtmlFetcher
+from .candidates import LinkCandidate, rank_links
+from .exceptions import ResolverError
+from .fetcher import AsyncHtmlFetcher, AsyncPdfProber, HtmlFetcher, PdfProber
+from .html_backends import DEFAULT_HTML_BACKEND, HtmlBackend, HtmlDocument
+from .publisher_rules import PublisherRuleRegistry
 from .results import PdfResolutionResult, ResolutionSource
 
 
+_REFRESH_URL = re.compile(r"url\s*=\s*['\"]?([^'\"]+)", re.IGNORECASE)
+
+
+class CrawlBudget(NamedTuple):
+    """Per-item limits for the external crawl."""
+
+    max_candidates: int = 3
+    max_depth: int = 2
+    max_bytes: int = 4 * 1024 * 1024
+    timeout: float = 20.0
+
+
+class _PageFindings(NamedTuple):
+    pdf_links: list[str]
+    follow: list[str]
+
+
 class ExternalPdfLocator:
-    """Attempts to locate a PDF link on an external landing page."""
+    """Attempts to locate a PDF link on external landing pages."""
 
-    def __init__(self, fetcher: HtmlFetcher) -> None:
+    def __init__(
+        self,
+        fetcher: HtmlFetcher,
+        backend: HtmlBackend | None = None,
+        *,
+        prober: PdfProber | None = None,
+        budget: CrawlBudget | None = None,
+        rules: PublisherRuleRegistry | None = None,
+    ) -> None:
         self._fetcher = fetcher
+        self._backend = backend or DEFAULT_HTML_BACKEND
+        self._prober = prober
+        self._budget = budget or CrawlBudget()
+        self._rules = rules
 
     def resolve(self, url: str) -> PdfResolutionResult:
-        html = self._fetcher.fetch(url)
-        pdf_url = self._find_pdf_link(html, base_url=url)
-        if pdf_url:
-            return PdfResolutionResult.success(ResolutionSource.external, pdf_url)
-        return PdfResolutionResult.failure("PDF link not discovered on landing page")
+        return self.resolve_candidates([url])
 
-    @staticmethod
-    def _find_pdf_link(html: str, *, base_url: str) -> str | None:
-        soup = BeautifulSoup(html, "html.parser")
-
-        # Look for direct anchors ending with .pdf
-        for anchor in soup.select('a[href$=".pdf"]'):
-            href = anchor.get("href")
-            if href:
-                return urljoin(base_url, href)
-
-        # Look for anchors mentioning PDF
-        for anchor in soup.find_all("a"):
-            text = (anchor.get_text() or "").strip().lower()
-            if "pdf" in text:
-                href = anchor.get("href")
-                if href:
-                    return urljoin(base_url, href)
-
-        # Handle meta refresh
-        meta_refresh = soup.find("meta", attrs={"http-equiv": "refresh"})
-        if meta_refresh:
-            content = meta_refresh.get("content")
-            if content and "url=" in content.lower():
-                _, _, target = content.partition("url=")
-                return urljoin(base_url, target.strip())
+    def resolve_candidates(self, urls: Sequence[str]) -> PdfResolutionResult:
+        crawl = _Crawl(self._budget, urls)
+        while hop := crawl.next_hop():
+            for url in hop:
+                if crawl.expired:
+                    return crawl.failure()
+                pdf_url = self._visit(url, crawl)
+                if pdf_url:
+                    return PdfResolutionResult.success(ResolutionSource.external, pdf_url)
+        return crawl.failure()
 
+    def _visit(self, url: str, crawl: _Crawl) -> str | None:
+        derived = self._rules.match(url) if self._rules and self._prober else None
+        if derived is not None:
+            pdf_url = self._prober.probe_pdf(derived.pdf_url)
+            self._rules.record(derived, hit=pdf_url is not None)
+            if pdf_url:
+                return pdf_url
+        if not crawl.can_fetch:
+            return None
+        try:
+            html = self._fetcher.fetch(url)
+        except ResolverError as exc:
+            crawl.error = exc
+            return None
+        crawl.record(html)
+        findings = _inspect(self._backend.parse(html, links_only=True), base_url=url)
+        checked = findings.pdf_links[: self._budget.max_candidates]
+        if self._prober is None:
+            crawl.follow(findings.follow)
+            return checked[0] if checked else None
+        for link in checked:
+            pdf_url = self._prober.probe_pdf(link)
+            if pdf_url:
+                return pdf_url
+        # A PDF link that does not serve a PDF is usually a viewer page; look inside.
+        crawl.follow(checked + findings.follow)
         return None
 
+
+class AsyncExternalPdfLocator:
+    """Async variant of `ExternalPdfLocator` that fetches each hop concurrently."""
+
+    def __init__(
+        self,
+        fetcher: AsyncHtmlFetcher,
+        backend: HtmlBackend | None = None,
+        *,
+        prober: AsyncPdfProber | None = None,
+        budget: CrawlBudget | None = None,
+        rules: PublisherRuleRegistry | None = None,
+    ) -> None:
+        self._fetcher = fetcher
+        self._backend = backend or DEFAULT_HTML_BACKEND
+        self._prober = prober
+        self._budget = budget or CrawlBudget()
+        self._rules = rules
+
+    async def resolve(self, url: str) -> PdfResolutionResult:
+        return await self.resolve_candidates([url])
+
+    async def resolve_candidates(self, urls: Sequence[str]) -> PdfResolutionResult:
+        crawl = _Crawl(self._budget, urls)
+        try:
+            async with asyncio.timeout(self._budget.timeout):
+                while hop := crawl.next_hop():
+                    pdf_url = await self._visit_hop(hop, crawl)
+                    if pdf_url:
+                        return PdfResolutionResult.success(ResolutionSource.external, pdf_url)
+        except TimeoutError:
+            crawl.timed_out = True
+        return crawl.failure()
+
+    async def _visit_hop(self, hop: list[str], crawl: _Crawl) -> str | None:
+        tasks = [asyncio.create_task(self._visit(url, crawl)) for url in hop]
+        order = {task: index for index, task in enumerate(tasks)}
+        follow: list[list[str]] = [[] for _ in tasks]
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=order.__getitem__):
+                    pdf_url, follow[order[task]] = task.result()
+                    if pdf_url:
+                        return pdf_url
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        # Queue the next hop in candidate order, whatever order pages arrived in.
+        for links in follow:
+            crawl.follow(links)
+        return None
+
+    async def _visit(self, url: str, crawl: _Crawl) -> tuple[str | None, list[str]]:
+        derived = self._rules.match(url) if self._rules and self._prober else None
+        if derived is not None:
+            pdf_url = await self._prober.probe_pdf(derived.pdf_url)
+            self._rules.record(derived, hit=pdf_url is not None)
+            if pdf_url:
+                return pdf_url, []
+        if not crawl.can_fetch:
+            return None, []
+        try:
+            html = await self._fetcher.fetch(url)
+        except ResolverError as exc:
+            crawl.error = exc
+            return None, []
+        crawl.record(html)
+        findings = _inspect(self._backend.parse(html, links_only=True), base_url=url)
+        checked = findings.pdf_links[: self._budget.max_candidates]
+        if self._prober is None:
+            return (checked[0] if checked else None), findings.follow
+        for link in checked:
+            pdf_url = await self._prober.probe_pdf(link)
+            if pdf_url:
+                return pdf_url, []
+        return None, checked + findings.follow
+
+
+class _Crawl:
+    """Frontier and budget bookkeeping for one item's external crawl."""
+
+    __slots__ = (
+        "_budget",
+        "_pending",
+        "_seen",
+        "_depth",
+        "_started",
+        "bytes_read",
+        "pages",
+        "error",
+        "timed_out",
+    )
+
+    def __init__(self, budget: CrawlBudget, urls: Sequence[str]) -> None:
+        self._budget = budget
+        self._pending = list(urls)
+        self._seen: set[str] = set()
+        self._depth = 0
+        self._started = time.monotonic()
+        self.bytes_read = 0
+        self.pages = 0
+        self.error: ResolverError | None = None
+        self.timed_out = False
+
+    @property
+    def can_fetch(self) -> bool:
+        return self.bytes_read < self._budget.max_bytes
+
+    @property
+    def expired(self) -> bool:
+        if time.monotonic() - self._started >= self._budget.timeout:
+            self.timed_out = True
+        return self.timed_out
+
+    def next_hop(self) -> list[str]:
+        """The next batch of unseen URLs, or [] once the depth or bytes run out."""
+
+        hop: list[str] = []
+        if self._depth < self._budget.max_depth and self.can_fetch:
+            for url in self._pending:
+                if len(hop) == self._budget.max_candidates:
+                    break
+                if url not in self._seen:
+                    self._seen.add(url)
+                    hop.append(url)
+        self._pending = []
+        self._depth += 1
+        return hop
+
+    def follow(self, urls: Sequence[str]) -> None:
+        self._pending.extend(urls)
+
+    def record(self, html: str) -> None:
+        self.pages += 1
+        self.bytes_read += len(html.encode("utf-8", "replace"))
+
+    def failure(self) -> PdfResolutionResult:
+        if self.timed_out:
+            return PdfResolutionResult.failure("External crawl budget exhausted")
+        if self.pages == 0 and self.error is not None:
+            # Nothing could be fetched at all: surface the error as before.
+            raise self.error
+        return PdfResolutionResult.failure("PDF link not discovered on landing page")
+
+
+def _inspect(document: HtmlDocument, *, base_url: str) -> _PageFindings:
+    """PDF links on a landing page, likeliest first, plus pages worth a hop."""
+
+    pdf_links: list[str] = []
+    follow: list[str] = []
+
+    # Highwire-style metadata names the PDF explicitly.
+    citation_pdf = (document.meta_content("name", "citation_pdf_url") or "").strip()
+    if citation_pdf:
+        pdf_links.append(urljoin(base_url, citation_pdf))
+
+    # Anchors ending with .pdf or mentioning PDF, ranked like PubMed's links so
+    # a "Download PDF" link beats a supplement that happens to be a PDF.
+    anchors = [
+        LinkCandidate(urljoin(base_url, anchor.href), anchor.text)
+        for anchor in document.links('a[href$=".pdf"]')
+        if anchor.href
+    ]
+    anchors.extend(
+        LinkCandidate(urljoin(base_url, anchor.href), anchor.text)
+        for anchor in document.links("a")
+        if anchor.href and "pdf" in anchor.text.lower()
+    )
+    pdf_links.extend(rank_links(anchors))
+
+    # Handle meta refresh: a PDF target is the answer, anything else is a hop.
+    match = _REFRESH_URL.search(document.meta_content("http-equiv", "refresh") or "")
+    if match:
+        target = urljoin(base_url, match.group(1).strip())
+        if urlsplit(target).path.lower().endswith(".pdf"):
+            pdf_links.append(target)
+        else:
+            follow.append(target)
+
+    return _PageFindings(list(dict.fromkeys(pdf_links)), follow)
@@ -1,20 +1,75 @@
 """Network fetch helpers shared by resolver components.
 
-The resolver manager (`manager.py`) injects the `HtmlFetcher` protocol into the
-HTML parser (`html_parser.py`) and the PMC/external extractors (`pmc.py`,
-`external.py`).  This module centralises HTTPX configuration for production
-requests (`HttpxHtmlFetcher`) and provides the deterministic `MockHtmlFetcher`
-used by unit tests and mock-mode wiring.
+The resolver manager (`manager.py`) injects these fetchers into the HTML parser
+(`html_parser.py`) and the PMC/external extractors (`pmc.py`, `external.py`).
+The protocols describe what each consumer needs: `HtmlFetcher` for plain page
+bodies, `ConditionalHtmlFetcher` for the validators `cache.py` revalidates
+with, `StreamingHtmlFetcher` for bodies read only until a callback has seen
+enough (`html_parser.PubmedStreamScanner`), and `PdfProber` for the cheap
+"does this URL serve a PDF?" check (a HEAD, falling back to a ranged GET for
+the `%PDF-` magic bytes).  Each protocol has an `Async*` twin for the asyncio
+resolver stack.
+
+`HttpxHtmlFetcher` and `AsyncHttpxHtmlFetcher` implement all of them on
+`httpx.Client` and `httpx.AsyncClient`.  They share request building, response
+classification and the retry decision, and differ only in how they do I/O.
+Every request passes an optional `RobotsPolicy` (`robots.py`), which raises
+`RobotsDisallowedError` (or makes `probe_pdf` answer None) for disallowed
+URLs, and an optional `HostRateLimiter` (`rate_limit.py`), which 429/503
+responses slow down.  Only transient failures (`retry.is_transient`) are
+retried in place, after a short jittered backoff.  The `FetchError` finally
+raised says whether the failure was transient, so the job runners can re-queue
+the item for later.  `MockHtmlFetcher` and `AsyncMockHtmlFetcher` serve canned
+pages for unit tests and mock-mode wiring.
 """
 
 from __future__ import annotations
 
+import asyncio
+import re
 import time
-from typing import Protocol
+from contextlib import asynccontextmanager, closing, nullcontext
+from dataclasses import dataclass
+from typing import (
+    TYPE_CHECKING,
+    AsyncContextManager,
+    AsyncIterator,
+    Callable,
+    ContextManager,
+    Protocol,
+)
 
 import httpx
 
 from .exceptions import FetchError
+from .rate_limit import HostRateLimiter, parse_retry_after
+from .retry import RetryPolicy, fetch_error, is_transient, retry_after
+
+if TYPE_CHECKING:
+    from .robots import RobotsPolicy, RobotsResponse
+
+
+_THROTTLE_STATUS_CODES = frozenset({429, 503})
+_MAX_AGE_PATTERN = re.compile(r"(?<![-\w])max-age=(\d+)")
+_PDF_MAGIC = b"%PDF-"
+_AMBIGUOUS_CONTENT_TYPES = frozenset({"", "application/octet-stream", "binary/octet-stream"})
+# In-place retries only smooth over blips; longer outages are retried by
+# re-queueing the item (see `retry.py`), so these delays stay short.
+_INLINE_RETRY_POLICY = RetryPolicy(base_delay=0.5, max_delay=5.0)
+
+
+@dataclass(slots=True)
+class FetchResponse:
+    """HTML body plus the validators needed to revalidate it later."""
+
+    text: str = ""
+    not_modified: bool = False
+    etag: str | None = None
+    last_modified: str | None = None
+    # From Cache-Control: `no-cache` arrives as max_age=0 (store, but revalidate
+    # before every use); `no-store` means the body must not be cached at all.
+    max_age: int | None = None
+    no_store: bool = False
 
 
 class HtmlFetcher(Protocol):
@@ -22,35 +77,200 @@ class HtmlFetcher(Protocol):
         ...
 
 
-class HttpxHtmlFetcher(HtmlFetcher):
+class AsyncHtmlFetcher(Protocol):
+    async def fetch(self, url: str) -> str:
+        ...
+
+
+class ConditionalHtmlFetcher(HtmlFetcher, Protocol):
+    def fetch_conditional(
+        self, url: str, *, etag: str | None = None, last_modified: str | None = None
+    ) -> FetchResponse:
+        ...
+
+
+class AsyncConditionalHtmlFetcher(AsyncHtmlFetcher, Protocol):
+    async def fetch_conditional(
+        self, url: str, *, etag: str | None = None, last_modified: str | None = None
+    ) -> FetchResponse:
+        ...
+
+
+class StreamingHtmlFetcher(Protocol):
+    def fetch_partial(self, url: str, consume: Callable[[str], bool]) -> None:
+        """Feed decoded chunks to `consume` until it returns True."""
+        ...
+
+
+class AsyncStreamingHtmlFetcher(Protocol):
+    async def fetch_partial(self, url: str, consume: Callable[[str], bool]) -> None:
+        ...
+
+
+class PdfProber(Protocol):
+    def probe_pdf(self, url: str) -> str | None:
+        """Return the final URL if `url` serves a PDF, otherwise None."""
+        ...
+
+
+class AsyncPdfProber(Protocol):
+    async def probe_pdf(self, url: str) -> str | None:
+        ...
+
+
+class _HttpxFetcher:
+    """Request building and response handling shared by the HTTPX fetchers.
+
+    Subclasses only add the I/O: sending the built requests on their client,
+    sleeping between attempts and reading streamed bodies.
+    """
+
+    _client: httpx.Client | httpx.AsyncClient
+
+    def __init__(
+        self,
+        *,
+        retries: int,
+        rate_limiter: HostRateLimiter | None,
+        robots: RobotsPolicy | None,
+        retry_policy: RetryPolicy | None,
+    ) -> None:
+        self._retries = max(0, retries)
+        self._retry_policy = retry_policy or _INLINE_RETRY_POLICY
+        self._rate_limiter = rate_limiter
+        self._robots = robots
+
+    def _page_request(
+        self, url: str, *, etag: str | None = None, last_modified: str | None = None
+    ) -> httpx.Request:
+        headers = _conditional_headers(etag, last_modified)
+        return self._client.build_request("GET", url, headers=headers)
+
+    def _head_request(self, url: str) -> httpx.Request:
+        return self._client.build_request("HEAD", url)
+
+    def _magic_request(self, url: str) -> httpx.Request:
+        return self._client.build_request("GET", url, headers=_MAGIC_RANGE)
+
+    def _received(self, url: str, response: httpx.Response) -> httpx.Response:
+        """Report 429/503 responses to the rate limiter before handling them."""
+
+        if self._rate_limiter is not None and response.status_code in _THROTTLE_STATUS_CODES:
+            retry_after_seconds = parse_retry_after(response.headers.get("Retry-After"))
+            self._rate_limiter.penalize(url, retry_after_seconds)
+        return response
+
+    def _retry_delay(self, error: httpx.HTTPError, attempt: int) -> float:
+        """Backoff before retrying `error` in place; raises once it should surface."""
+
+        if attempt >= self._retries or not is_transient(error):
+            raise fetch_error(error)
+        return self._retry_policy.backoff(attempt + 1, retry_after=retry_after(error))
+
+
+class HttpxHtmlFetcher(_HttpxFetcher, ConditionalHtmlFetcher, StreamingHtmlFetcher, PdfProber):
     """Fetches HTML content using httpx with retry support."""
 
+    _client: httpx.Client
+
     def __init__(
         self,
         *,
         timeout: float,
         retries: int,
         user_agent: str,
+        rate_limiter: HostRateLimiter | None = None,
+        limits: httpx.Limits | None = None,
+        transport: httpx.BaseTransport | None = None,
+        robots: RobotsPolicy | None = None,
+        retry_policy: RetryPolicy | None = None,
     ) -> None:
-        self._retries = max(0, retries)
+        super().__init__(
+            retries=retries, rate_limiter=rate_limiter, robots=robots, retry_policy=retry_policy
+        )
         self._client = httpx.Client(
             timeout=timeout,
             headers={"User-Agent": user_agent},
             follow_redirects=True,
+            limits=limits or httpx.Limits(),
+            transport=transport,
         )
 
     def fetch(self, url: str) -> str:
-        last_error: Exception | None = None
-        for attempt in range(self._retries + 1):
+        return self.fetch_conditional(url).text
+
+    def fetch_conditional(
+        self, url: str, *, etag: str | None = None, last_modified: str | None = None
+    ) -> FetchResponse:
+        self._check_robots(url)
+        request = self._page_request(url, etag=etag, last_modified=last_modified)
+        attempt = 0
+        while True:
             try:
-                response = self._client.get(url)
-                response.raise_for_status()
-                return response.text
+                with self._limit(url):
+                    response = self._client.send(request)
+                return _to_fetch_response(self._received(url, response))
             except httpx.HTTPError as exc:
-                last_error = exc
-                if attempt < self._retries:
-                    time.sleep(0.5 * (attempt + 1))
-        raise FetchError(str(last_error))
+                time.sleep(self._retry_delay(exc, attempt))
+                attempt += 1
+
+    def fetch_partial(self, url: str, consume: Callable[[str], bool]) -> None:
+        self._check_robots(url)
+        request = self._page_request(url)
+        attempt = 0
+        while True:
+            consumed = False
+            try:
+                with self._limit(url), self._stream(request) as response:
+                    self._received(url, response).raise_for_status()
+                    for chunk in response.iter_text():
+                        consumed = True
+                        if consume(chunk):
+                            break
+                return
+            except httpx.HTTPError as exc:
+                if consumed:
+                    raise fetch_error(exc)
+                time.sleep(self._retry_delay(exc, attempt))
+                attempt += 1
+
+    def probe_pdf(self, url: str) -> str | None:
+        if not self._robots_allow(url):
+            return None
+        try:
+            with self._limit(url):
+                response = self._received(url, self._client.send(self._head_request(url)))
+            verdict = _pdf_verdict(response)
+            if verdict is not None:
+                return str(response.url) if verdict else None
+            with self._limit(url), self._stream(self._magic_request(url)) as response:
+                head = b""
+                if response.is_success:
+                    head = next(response.iter_bytes(len(_PDF_MAGIC)), b"")
+                return _magic_verdict(response, head)
+        except httpx.HTTPError:
+            return None
+
+    def _limit(self, url: str) -> ContextManager[None]:
+        return self._rate_limiter.limit(url) if self._rate_limiter else nullcontext()
+
+    def _stream(self, request: httpx.Request) -> ContextManager[httpx.Response]:
+        return closing(self._client.send(request, stream=True))
+
+    def _check_robots(self, url: str) -> None:
+        if self._robots is not None:
+            self._robots.check(url, self._fetch_robots)
+
+    def _robots_allow(self, url: str) -> bool:
+        return self._robots is None or self._robots.allows(url, self._fetch_robots)
+
+    def _fetch_robots(self, url: str) -> RobotsResponse:
+        try:
+            with self._limit(url):
+                response = self._client.get(url)
+        except httpx.HTTPError:
+            return None, ""
+        return response.status_code, response.text
 
     def close(self) -> None:
         self._client.close()
@@ -62,6 +282,178 @@ class HttpxHtmlFetcher(HtmlFetcher):
         self.close()
 
 
+class AsyncHttpxHtmlFetcher(
+    _HttpxFetcher, AsyncConditionalHtmlFetcher, AsyncStreamingHtmlFetcher, AsyncPdfProber
+):
+    """Fetches HTML content using `httpx.AsyncClient` with retry support."""
+
+    _client: httpx.AsyncClient
+
+    def __init__(
+        self,
+        *,
+        timeout: float,
+        retries: int,
+        user_agent: str,
+        rate_limiter: HostRateLimiter | None = None,
+        limits: httpx.Limits | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        robots: RobotsPolicy | None = None,
+        retry_policy: RetryPolicy | None = None,
+    ) -> None:
+        super().__init__(
+            retries=retries, rate_limiter=rate_limiter, robots=robots, retry_policy=retry_policy
+        )
+        self._client = httpx.AsyncClient(
+            timeout=timeout,
+            headers={"User-Agent": user_agent},
+            follow_redirects=True,
+            limits=limits or httpx.Limits(),
+            transport=transport,
+        )
+
+    async def fetch(self, url: str) -> str:
+        return (await self.fetch_conditional(url)).text
+
+    async def fetch_conditional(
+        self, url: str, *, etag: str | None = None, last_modified: str | None = None
+    ) -> FetchResponse:
+        await self._check_robots(url)
+        request = self._page_request(url, etag=etag, last_modified=last_modified)
+        attempt = 0
+        while True:
+            try:
+                async with self._limit(url):
+                    response = await self._client.send(request)
+                return _to_fetch_response(self._received(url, response))
+            except httpx.HTTPError as exc:
+                await asyncio.sleep(self._retry_delay(exc, attempt))
+                attempt += 1
+
+    async def fetch_partial(self, url: str, consume: Callable[[str], bool]) -> None:
+        await self._check_robots(url)
+        request = self._page_request(url)
+        attempt = 0
+        while True:
+            consumed = False
+            try:
+                async with self._limit(url), self._stream(request) as response:
+                    self._received(url, response).raise_for_status()
+                    async for chunk in response.aiter_text():
+                        consumed = True
+                        if consume(chunk):
+                            break
+                return
+            except httpx.HTTPError as exc:
+                if consumed:
+                    raise fetch_error(exc)
+                await asyncio.sleep(self._retry_delay(exc, attempt))
+                attempt += 1
+
+    async def probe_pdf(self, url: str) -> str | None:
+        if not await self._robots_allow(url):
+            return None
+        try:
+            async with self._limit(url):
+                response = self._received(url, await self._client.send(self._head_request(url)))
+            verdict = _pdf_verdict(response)
+            if verdict is not None:
+                return str(response.url) if verdict else None
+            async with self._limit(url), self._stream(self._magic_request(url)) as response:
+                head = b""
+                if response.is_success:
+                    head = await anext(response.aiter_bytes(len(_PDF_MAGIC)), b"")
+                return _magic_verdict(response, head)
+        except httpx.HTTPError:
+            return None
+
+    def _limit(self, url: str) -> AsyncContextManager[None]:
+        return self._rate_limiter.alimit(url) if self._rate_limiter else nullcontext()
+
+    @asynccontextmanager
+    async def _stream(self, request: httpx.Request) -> AsyncIterator[httpx.Response]:
+        response = await self._client.send(request, stream=True)
+        try:
+            yield response
+        finally:
+            await response.aclose()
+
+    async def _check_robots(self, url: str) -> None:
+        if self._robots is not None:
+            await self._robots.acheck(url, self._fetch_robots)
+
+    async def _robots_allow(self, url: str) -> bool:
+        return self._robots is None or await self._robots.aallows(url, self._fetch_robots)
+
+    async def _fetch_robots(self, url: str) -> RobotsResponse:
+        try:
+            async with self._limit(url):
+                response = await self._client.get(url)
+        except httpx.HTTPError:
+            return None, ""
+        return response.status_code, response.text
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def __aenter__(self) -> "AsyncHttpxHtmlFetcher":  # pragma: no cover - context sugar
+        return self
+
+    async def __aexit__(self, *_) -> None:  # pragma: no cover - context sugar
+        await self.aclose()
+
+
+def _conditional_headers(etag: str | None, last_modified: str | None) -> dict[str, str]:
+    headers: dict[str, str] = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+
+def _to_fetch_response(response: httpx.Response) -> FetchResponse:
+    not_modified = response.status_code == 304
+    if not not_modified:
+        response.raise_for_status()
+    cache_control = response.headers.get("Cache-Control", "").lower()
+    directives = {part.split("=", 1)[0].strip() for part in cache_control.split(",")}
+    match = _MAX_AGE_PATTERN.search(cache_control)
+    max_age = int(match.group(1)) if match else None
+    if "no-cache" in directives:
+        max_age = 0
+    return FetchResponse(
+        text="" if not_modified else response.text,
+        not_modified=not_modified,
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+        max_age=max_age,
+        no_store="no-store" in directives,
+    )
+
+
+_MAGIC_RANGE = {"Range": f"bytes=0-{len(_PDF_MAGIC) - 1}"}
+
+
+def _pdf_verdict(response: httpx.Response) -> bool | None:
+    """Judge a HEAD response; None means "check the magic bytes instead"."""
+    if response.status_code in (405, 501):
+        return None
+    if not response.is_success:
+        return False
+    content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+    if content_type == "application/pdf":
+        return True
+    return None if content_type in _AMBIGUOUS_CONTENT_TYPES else False
+
+
+def _magic_verdict(response: httpx.Response, head: bytes) -> str | None:
+    """Judge the first bytes of a ranged GET, answering like `probe_pdf`."""
+    if response.is_success and head.startswith(_PDF_MAGIC):
+        return str(response.url)
+    return None
+
+
 class MockHtmlFetcher(HtmlFetcher):
     """Returns canned responses for deterministic resolver testing."""
 
@@ -73,3 +465,14 @@ class MockHtmlFetcher(HtmlFetcher):
             raise FetchError(f"No mock response configured for {url}")
         return self._responses[url]
 
+
+class AsyncMockHtmlFetcher(AsyncHtmlFetcher):
+    """Async counterpart of `MockHtmlFetcher` for the asyncio resolver stack."""
+
+    def __init__(self, responses: dict[str, str]) -> None:
+        self._responses = responses
+
+    async def fetch(self, url: str) -> str:
+        if url not in self._responses:
+            raise FetchError(f"No mock response configured for {url}")
+        return self._responses[url]
@@ -0,0 +1,128 @@
+"""Pluggable DOM backends for the resolver's HTML extractors.
+
+`html_parser.py`, `pmc.py` and `external.py` only ever ask two questions of a
+page: "what is the content of this `<meta>`?" and "which links match this CSS
+selector?".  `HtmlDocument` captures exactly that surface so the extractors can
+run on either backend:
+
+- `SoupBackend` — BeautifulSoup with the stdlib `html.parser`; the reference
+  implementation.  When a caller only needs links and meta tags it parses
+  through a `SoupStrainer` so the tree is never built for the rest of the page.
+- `SelectolaxBackend` — the Lexbor engine from the optional `selectolax`
+  package, several times faster on real PubMed/PMC pages.
+
+`manager.py` picks one via `get_html_backend` from `ResolverConfig`.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Protocol
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from .exceptions import ResolverError
+
+
+@dataclass(frozen=True, slots=True)
+class Link:
+    """An anchor's raw `href` (if any) and its concatenated text."""
+
+    href: str | None
+    text: str
+
+
+class HtmlDocument(Protocol):
+    def meta_content(self, attribute: str, value: str) -> str | None:
+        """Return `content` of the first `<meta attribute="value">`, if any."""
+        ...
+
+    def links(self, selector: str) -> list[Link]:
+        ...
+
+
+class HtmlBackend(Protocol):
+    name: str
+
+    def parse(self, html: str, *, links_only: bool = False) -> HtmlDocument:
+        ...
+
+
+class _SoupDocument(HtmlDocument):
+    def __init__(self, soup: BeautifulSoup) -> None:
+        self._soup = soup
+
+    def meta_content(self, attribute: str, value: str) -> str | None:
+        meta = self._soup.find("meta", attrs={attribute: value})
+        if meta is None:
+            return None
+        return meta.get("content")
+
+    def links(self, selector: str) -> list[Link]:
+        return [
+            Link(href=anchor.get("href"), text=anchor.get_text() or "")
+            for anchor in self._soup.select(selector)
+        ]
+
+
+class SoupBackend(HtmlBackend):
+    """Reference backend built on BeautifulSoup's `html.parser`."""
+
+    name = "bs4"
+
+    def parse(self, html: str, *, links_only: bool = False) -> HtmlDocument:
+        parse_only = SoupStrainer(["a", "meta"]) if links_only else None
+        return _SoupDocument(BeautifulSoup(html, "html.parser", parse_only=parse_only))
+
+
+class _SelectolaxDocument(HtmlDocument):
+    def __init__(self, tree) -> None:
+        self._tree = tree
+
+    def meta_content(self, attribute: str, value: str) -> str | None:
+        meta = self._tree.css_first(f'meta[{attribute}="{value}"]')
+        if meta is None:
+            return None
+        return meta.attributes.get("content")
+
+    def links(self, selector: str) -> list[Link]:
+        return [
+            Link(href=node.attributes.get("href"), text=node.text(deep=True))
+            for node in self._tree.css(selector)
+        ]
+
+
+class SelectolaxBackend(HtmlBackend):
+    """Fast backend using selectolax's Lexbor engine."""
+
+    name = "selectolax"
+
+    def __init__(self) -> None:
+        try:
+            from selectolax.lexbor import LexborHTMLParser
+        except ImportError as exc:  # pragma: no cover - depends on environment
+            raise ResolverError(
+                "The selectolax parser backend requires the optional 'selectolax' package"
+            ) from exc
+        self._parser_cls = LexborHTMLParser
+
+    def parse(self, html: str, *, links_only: bool = False) -> HtmlDocument:
+        return _SelectolaxDocument(self._parser_cls(html))
+
+
+DEFAULT_HTML_BACKEND: HtmlBackend = SoupBackend()
+
+
+def get_html_backend(name: str) -> HtmlBackend:
+    """Resolve a configured backend name (`bs4`, `selectolax` or `auto`)."""
+
+    if name == "bs4":
+        return DEFAULT_HTML_BACKEND
+    if name == "selectolax":
+        return SelectolaxBackend()
+    if name == "auto":
+        try:
+            return SelectolaxBackend()
+        except ResolverError:
+            return DEFAULT_HTML_BACKEND
+    raise ResolverError(f"Unknown HTML parser backend: {name}")
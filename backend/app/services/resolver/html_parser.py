@@ -2,20 +2,29 @@
 
 `manager.py` calls into this module after fetching article HTML via
 `fetcher.py`.  The resulting `PubmedArticleMetadata` (defined in
-`app.models.models`) feeds into the PMC (`pmc.py`) and external (`external.py`)
-pipelines to determine follow-up fetches.  Keeping DOM selectors here keeps the
-extractor modules clean and single-purpose.
+`app.models.models`) feeds the PMC (`pmc.py`) and external (`external.py`)
+pipelines that decide the follow-up fetches.  Keeping DOM selectors here keeps
+the extractor modules clean and single-purpose.
+
+The selectors run on an `HtmlBackend` (`html_backends.py`), so the same rules
+work on BeautifulSoup or selectolax.  `PubmedPageParser` handles a complete page.
+`PubmedStreamScanner` applies the same rules incrementally to a streamed
+response, so the manager can stop downloading once the full-text links block
+has been read.  Both collect every full-text link and rank them with the
+scoring table in `candidates.py`, giving the external crawler a deterministic
+order in which to try the candidates.
 """
 
 from __future__ import annotations
 
 import re
+from html.parser import HTMLParser
 from typing import Protocol
 from urllib.parse import urljoin
 
-from bs4 import BeautifulSoup
-
 from ...models.models import PubmedArticleMetadata
+from .candidates import LinkCandidate, rank_links
+from .html_backends import DEFAULT_HTML_BACKEND, HtmlBackend, HtmlDocument
 
 
 class PubmedParser(Protocol):
@@ -26,27 +35,31 @@ class PubmedParser(Protocol):
 class PubmedPageParser(PubmedParser):
     """Extracts PMCID and external links from PubMed HTML."""
 
+    def __init__(self, backend: HtmlBackend | None = None) -> None:
+        self._backend = backend or DEFAULT_HTML_BACKEND
+
     def parse(self, html: str, *, pmid: str) -> PubmedArticleMetadata:
-        soup = BeautifulSoup(html, "html.parser")
+        document = self._backend.parse(html)
         base_url = f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/"
-        pmc_id = _extract_pmc_id(soup)
-        external_link = _extract_external_link(soup, base_url=base_url)
+        pmc_id = _extract_pmc_id(document)
+        external_links = _extract_external_links(document, base_url=base_url)
         return PubmedArticleMetadata(
             pmid=pmid,
             pmc_id=pmc_id,
-            external_fulltext_url=external_link,
+            external_fulltext_url=external_links[0] if external_links else None,
+            external_candidates=external_links,
         )
 
 
-def _extract_pmc_id(soup: BeautifulSoup) -> str | None:
+def _extract_pmc_id(document: HtmlDocument) -> str | None:
     meta_candidates = [
-        soup.find("meta", attrs={"name": "citation_pmcid"}),
-        soup.find("meta", attrs={"name": "pmcid"}),
+        document.meta_content("name", "citation_pmcid"),
+        document.meta_content("name", "pmcid"),
     ]
     for meta in meta_candidates:
-        if not meta:
+        if meta is None:
             continue
-        content = (meta.get("content") or "").strip()
+        content = meta.strip()
         match = re.search(r"PMC(\d+)", content, re.IGNORECASE)
         if match:
             return match.group(1)
@@ -55,23 +68,25 @@ def _extract_pmc_id(soup: BeautifulSoup) -> str | None:
         "span.identifier.pmcid a",
         'a[data-ga-action="pmc_article"]',
         'a[href*="ncbi.nlm.nih.gov/pmc/articles/"]',
+        'a[href*="pmc.ncbi.nlm.nih.gov/articles/"]',
         'a[href*="/pmc/articles/"]',
     ]
     for selector in anchor_selectors:
-        for anchor in soup.select(selector):
-            text = (anchor.get_text() or "").strip()
+        for anchor in document.links(selector):
+            text = anchor.text.strip()
             match = re.search(r"PMC(\d+)", text, re.IGNORECASE)
             if match:
                 return match.group(1)
-            href = anchor.get("href") or ""
+            href = anchor.href or ""
             match = re.search(r"PMC(\d+)", href, re.IGNORECASE)
             if match:
                 return match.group(1)
     return None
 
 
-def _extract_external_link(soup: BeautifulSoup, *, base_url: str) -> str | None:
-    selectors = {
+# One combined selector, so matches come back once each and in document order.
+_FULLTEXT_LINK_SELECTOR = ", ".join(
+    (
         "div.full-text-links a",
         "div.full-text-links-list a",
         "section#full-text-links a",
@@ -82,25 +97,181 @@ def _extract_external_link(soup: BeautifulSoup, *, base_url: str) -> str | None:
         'a[data-ga-action="fulltext"]',
         'a[data-ga-action="journal_link"]',
         'a[data-ga-action="journal_link_click"]',
-    }
-    seen: set[str] = set()
-    for selector in selectors:
-        anchors = soup.select(selector)
-        if not anchors:
-            continue
-        for anchor in anchors:
-            href = (anchor.get("href") or "").strip()
-            if not href or href.lower().startswith("javascript:"):
-                continue
-            absolute = urljoin(base_url, href)
-            if absolute in seen:
-                continue
-            seen.add(absolute)
-            if any(block in absolute for block in [
-                "ncbi.nlm.nih.gov/pmc/articles",
-                "pubmed.ncbi.nlm.nih.gov/",
-            ]):
+    )
+)
+
+
+def _extract_external_links(document: HtmlDocument, *, base_url: str) -> list[str]:
+    candidates: list[LinkCandidate] = []
+    for anchor in document.links(_FULLTEXT_LINK_SELECTOR):
+        candidate = _external_candidate(anchor.href or "", anchor.text, base_url=base_url)
+        if candidate is not None:
+            candidates.append(candidate)
+    return rank_links(candidates)
+
+
+def _external_candidate(href: str, text: str, *, base_url: str) -> LinkCandidate | None:
+    href = href.strip()
+    if not href or href.lower().startswith("javascript:"):
+        return None
+    absolute = urljoin(base_url, href)
+    if any(block in absolute for block in _BLOCKED_EXTERNAL_MARKERS):
+        return None
+    return LinkCandidate(absolute, text)
+
+
+_PMC_PATTERN = re.compile(r"PMC(\d+)", re.IGNORECASE)
+_PMCID_META_NAMES = ("citation_pmcid", "pmcid")
+_PMC_HREF_MARKERS = (
+    "ncbi.nlm.nih.gov/pmc/articles/",
+    "pmc.ncbi.nlm.nih.gov/articles/",
+    "/pmc/articles/",
+)
+_BLOCKED_EXTERNAL_MARKERS = (
+    "ncbi.nlm.nih.gov/pmc/articles",
+    "pmc.ncbi.nlm.nih.gov/articles",
+    "pubmed.ncbi.nlm.nih.gov/",
+)
+_LINK_ANCHOR_CLASSES = frozenset({"link-item", "external-link"})
+_LINK_ANCHOR_GA_ACTIONS = frozenset({"fulltext", "journal_link", "journal_link_click"})
+
+
+class _OpenElement:
+    __slots__ = ("tag", "kind", "depth")
+
+    def __init__(self, tag: str, kind: str) -> None:
+        self.tag = tag
+        self.kind = kind
+        self.depth = 1
+
+
+class PubmedStreamScanner(HTMLParser):
+    """Incremental counterpart of `PubmedPageParser` for streamed pages.
+
+    `feed` returns True once the full-text links block has been closed (or,
+    with `stop_at_pmcid`, as soon as a `citation_pmcid`/`pmcid` meta tag is
+    seen), signalling the caller that the rest of the body can be dropped.
+    Candidates are taken in document order.
+    """
+
+    def __init__(self, *, pmid: str, stop_at_pmcid: bool = False) -> None:
+        super().__init__(convert_charrefs=True)
+        self._pmid = pmid
+        self._base_url = f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/"
+        self._stop_at_pmcid = stop_at_pmcid
+        self._open: list[_OpenElement] = []
+        self._anchor: tuple[dict[str, str], bool, bool] | None = None
+        self._anchor_text: list[str] = []
+        self._meta_pmc_ids: dict[str, str] = {}
+        self._anchor_pmc_id: str | None = None
+        self._external_links: list[LinkCandidate] = []
+        self._links_section_done = False
+
+    @property
+    def complete(self) -> bool:
+        if self._links_section_done:
+            return True
+        return self._stop_at_pmcid and bool(self._meta_pmc_ids)
+
+    def feed(self, data: str) -> bool:  # type: ignore[override]
+        if not self.complete:
+            super().feed(data)
+        return self.complete
+
+    def metadata(self) -> PubmedArticleMetadata:
+        if not self.complete:
+            self.close()
+        pmc_id = next(
+            (self._meta_pmc_ids[name] for name in _PMCID_META_NAMES if name in self._meta_pmc_ids),
+            self._anchor_pmc_id,
+        )
+        external_links = rank_links(self._external_links)
+        return PubmedArticleMetadata(
+            pmid=self._pmid,
+            pmc_id=pmc_id,
+            external_fulltext_url=external_links[0] if external_links else None,
+            external_candidates=external_links,
+        )
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        attributes = {name: value or "" for name, value in attrs}
+        for element in self._open:
+            if element.tag == tag:
+                element.depth += 1
+        kind = _container_kind(tag, attributes)
+        if kind is not None:
+            self._open.append(_OpenElement(tag, kind))
+        if tag == "meta":
+            self._handle_meta(attributes)
+        elif tag == "a":
+            in_links = any(element.kind == "links" for element in self._open)
+            in_pmcid = any(element.kind == "pmcid" for element in self._open)
+            self._anchor = (attributes, in_links, in_pmcid)
+            self._anchor_text = []
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "a" and self._anchor is not None:
+            self._handle_anchor(*self._anchor, text="".join(self._anchor_text))
+            self._anchor = None
+        for element in list(self._open):
+            if element.tag != tag:
                 continue
-            return absolute
+            element.depth -= 1
+            if element.depth == 0:
+                self._open.remove(element)
+                if element.kind == "links":
+                    self._links_section_done = True
+
+    def handle_data(self, data: str) -> None:
+        if self._anchor is not None:
+            self._anchor_text.append(data)
+
+    def _handle_meta(self, attributes: dict[str, str]) -> None:
+        name = attributes.get("name", "")
+        if name not in _PMCID_META_NAMES or name in self._meta_pmc_ids:
+            return
+        match = _PMC_PATTERN.search(attributes.get("content", "").strip())
+        if match:
+            self._meta_pmc_ids[name] = match.group(1)
+
+    def _handle_anchor(
+        self, attributes: dict[str, str], in_links: bool, in_pmcid: bool, *, text: str
+    ) -> None:
+        href = attributes.get("href", "").strip()
+        if self._anchor_pmc_id is None and (
+            in_pmcid
+            or attributes.get("data-ga-action") == "pmc_article"
+            or any(marker in href for marker in _PMC_HREF_MARKERS)
+        ):
+            match = _PMC_PATTERN.search(text.strip()) or _PMC_PATTERN.search(href)
+            if match:
+                self._anchor_pmc_id = match.group(1)
+
+        if not _is_fulltext_anchor(attributes, in_links):
+            return
+        candidate = _external_candidate(href, text, base_url=self._base_url)
+        if candidate is not None:
+            self._external_links.append(candidate)
+
+
+def _container_kind(tag: str, attributes: dict[str, str]) -> str | None:
+    classes = set(attributes.get("class", "").split())
+    if tag == "div" and classes & {"full-text-links", "full-text-links-list"}:
+        return "links"
+    if tag == "ul" and "full-text-links-list" in classes:
+        return "links"
+    if tag == "section" and attributes.get("id") == "full-text-links":
+        return "links"
+    if tag == "span" and {"identifier", "pmcid"} <= classes:
+        return "pmcid"
     return None
 
+
+def _is_fulltext_anchor(attributes: dict[str, str], in_links: bool) -> bool:
+    if in_links:
+        return True
+    if _LINK_ANCHOR_CLASSES & set(attributes.get("class", "").split()):
+        return True
+    if attributes.get("data-ga-category") == "full_text":
+        return True
+    return attributes.get("data-ga-action") in _LINK_ANCHOR_GA_ACTIONS
@@ -0,0 +1,118 @@
+"""Batch PMID → PMCID lookups ahead of per-item resolution.
+
+`manager.py` hands a whole job's PMIDs to an `IdConverter` before resolving any
+item, so articles already known to live in PMC skip the PubMed page fetch in
+`html_parser.py` and go straight to `pmc.py`.  `NcbiIdConverterClient` talks to
+the NCBI ID Converter API (up to 200 IDs per request); `StaticIdConverter` is
+the in-process stand-in used in mock mode.  Lookups are only a shortcut: a
+batch that fails is dropped and its PMIDs take the per-page path as before.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+from contextlib import nullcontext
+from typing import Iterable, Mapping, Protocol, Sequence
+
+import httpx
+
+from .rate_limit import HostRateLimiter
+
+
+NCBI_IDCONV_URL = "https://www.ncbi.nlm.nih.gov/pmc/utils/idconv/v1.0/"
+
+_PMCID_PATTERN = re.compile(r"PMC(\d+)", re.IGNORECASE)
+
+
+class IdConverter(Protocol):
+    async def convert(self, pmids: Sequence[str]) -> dict[str, str]:
+        """Map each known PMID to its numeric PMC ID; unknown PMIDs are omitted."""
+        ...
+
+
+class StaticIdConverter(IdConverter):
+    """Answers lookups from a fixed PMID → PMC ID mapping."""
+
+    def __init__(self, mapping: Mapping[str, str]) -> None:
+        self._mapping = dict(mapping)
+
+    async def convert(self, pmids: Sequence[str]) -> dict[str, str]:
+        return {pmid: self._mapping[pmid] for pmid in pmids if pmid in self._mapping}
+
+
+class NcbiIdConverterClient(IdConverter):
+    """Client for the NCBI PMC ID Converter API."""
+
+    def __init__(
+        self,
+        *,
+        base_url: str = NCBI_IDCONV_URL,
+        batch_size: int = 200,
+        max_concurrency: int = 2,
+        timeout: float,
+        user_agent: str,
+        tool: str | None = None,
+        email: str | None = None,
+        rate_limiter: HostRateLimiter | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self._base_url = base_url
+        self._batch_size = max(1, batch_size)
+        self._slots = asyncio.Semaphore(max(1, max_concurrency))
+        self._params = {"format": "json", "idtype": "pmid"}
+        if tool:
+            self._params["tool"] = tool
+        if email:
+            self._params["email"] = email
+        self._rate_limiter = rate_limiter
+        self._client = httpx.AsyncClient(
+            timeout=timeout,
+            headers={"User-Agent": user_agent},
+            follow_redirects=True,
+            transport=transport,
+        )
+
+    async def convert(self, pmids: Sequence[str]) -> dict[str, str]:
+        unique = list(dict.fromkeys(pmids))
+        batches = [
+            unique[start : start + self._batch_size]
+            for start in range(0, len(unique), self._batch_size)
+        ]
+        results = await asyncio.gather(
+            *(self._convert_batch(batch) for batch in batches), return_exceptions=True
+        )
+        merged: dict[str, str] = {}
+        for result in results:
+            if isinstance(result, (httpx.HTTPError, ValueError)):
+                continue
+            if isinstance(result, BaseException):
+                raise result
+            merged.update(result)
+        return merged
+
+    async def _convert_batch(self, pmids: list[str]) -> dict[str, str]:
+        params = {**self._params, "ids": ",".join(pmids)}
+        limiter = self._rate_limiter
+        async with self._slots:
+            limit = limiter.alimit(self._base_url) if limiter else nullcontext()
+            async with limit:
+                response = await self._client.get(self._base_url, params=params)
+        response.raise_for_status()
+        body = response.json()
+        records = body.get("records") if isinstance(body, dict) else None
+        if not isinstance(records, list):
+            # Dropped like any other failed batch.
+            raise ValueError("Malformed ID Converter response")
+        return dict(_parse_records(record for record in records if isinstance(record, dict)))
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+def _parse_records(records: Iterable[dict]) -> Iterable[tuple[str, str]]:
+    for record in records:
+        pmid = str(record.get("pmid") or "")
+        match = _PMCID_PATTERN.fullmatch(str(record.get("pmcid") or ""))
+        if pmid and match and record.get("status") != "error":
+            yield pmid, match.group(1)
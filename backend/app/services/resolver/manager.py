@@ -7,23 +7,74 @@ building blocks:
 - extracts metadata (`html_parser.py` → `PubmedArticleMetadata`)
 - attempts PMC resolution (`pmc.py`)
 - falls back to external crawling (`external.py`)
-The module exposes factory helpers so the API layer can configure fetch timeouts
-and mock responses without importing the lower-level modules directly.
+
+`PubmedResolverManager` runs this pipeline on a blocking `HtmlFetcher`, and
+`AsyncPubmedResolverManager` runs it on an `AsyncHtmlFetcher` so many
+resolutions can share one event loop.  Concurrent calls for the same PMID are
+coalesced (`singleflight.py`).  Finished results are kept in the
+`ResolutionCache` (`resolution_cache.py`), except retryable ones: failures
+caused by transient fetch errors (`retry.is_transient`) stay out of it, so a
+later attempt starts afresh.
+
+A known PMC ID skips the article page: the async manager can look up IDs for
+a whole batch of URLs up front through an `IdConverter` (`idconv.py`), and
+the PubMed page is only fetched if the PMC branch comes up empty.  When the
+page is needed it can be streamed and abandoned once its full-text links have
+been read.  With `race_branches`, an article that has both a PMC ID and an
+external link runs both branches at once; PMC still wins whenever it finds a
+PDF.  The external branch crawls the ranked full-text candidates within a
+per-item `CrawlBudget`, guided by the `PublisherRuleRegistry`
+(`publisher_rules.py`).  A branch blocked by robots.txt (`robots.py`) reports
+`RobotsDisallowedError.reason` instead of the generic "No PDF source
+discovered".
+
+The `build_default_*` factories turn a `ResolverConfig` into a wired manager,
+so the API layer can configure fetch timeouts, caching and mock responses
+without importing the lower-level modules directly.
 """
 
 from __future__ import annotations
 
-from typing import Callable, Protocol, NamedTuple
+import asyncio
+from dataclasses import replace
+from typing import Callable, Iterable, Mapping, Protocol, NamedTuple, Sequence
+
+import httpx
 
-from .exceptions import ResolverError
-from .fetcher import HtmlFetcher, HttpxHtmlFetcher
-from .html_parser import PubmedParser, PubmedPageParser
-from .pmc import PmcPdfExtractor
-from .external import ExternalPdfLocator
+from ...models.models import PubmedArticleMetadata
+from .cache import AsyncCachingHtmlFetcher, CachingHtmlFetcher, ResponseCacheStore
+from .exceptions import FetchError, ResolverError, RobotsDisallowedError
+from .fetcher import (
+    AsyncHtmlFetcher,
+    AsyncHttpxHtmlFetcher,
+    AsyncPdfProber,
+    AsyncStreamingHtmlFetcher,
+    HtmlFetcher,
+    HttpxHtmlFetcher,
+    PdfProber,
+    StreamingHtmlFetcher,
+)
+from .html_backends import HtmlBackend, get_html_backend
+from .idconv import NCBI_IDCONV_URL, IdConverter, NcbiIdConverterClient, StaticIdConverter
+from .html_parser import PubmedParser, PubmedPageParser, PubmedStreamScanner
+from .pmc import AsyncPmcPdfExtractor, PmcPdfExtractor
+from .publisher_rules import PublisherRuleRegistry, RuleStats
+from .external import AsyncExternalPdfLocator, CrawlBudget, ExternalPdfLocator
+from .resolution_cache import ResolutionCache
+from .robots import RobotsPolicy, RobotsStore
 from .results import PdfResolutionResult
+from .singleflight import (
+    AsyncSingleFlight,
+    AsyncSingleFlightHtmlFetcher,
+    SingleFlight,
+    SingleFlightHtmlFetcher,
+    SingleFlightStats,
+)
 from .url_utils import normalize_pubmed_url
-from .prebaked_responses import MOCK_RESPONSES
-from .fetcher import MockHtmlFetcher
+from .prebaked_responses import MOCK_PMC_IDS, MOCK_RESPONSES
+from .rate_limit import HostRateLimiter
+from .retry import is_transient, retry_after
+from .fetcher import AsyncMockHtmlFetcher, MockHtmlFetcher
 
 
 class PdfResolver(Protocol):
@@ -31,11 +82,49 @@ class PdfResolver(Protocol):
         ...
 
 
+class AsyncPdfResolver(Protocol):
+    async def resolve(self, url: str, *, pmc_id: str | None = None) -> PdfResolutionResult:
+        ...
+
+
 class ResolverConfig(NamedTuple):
     timeout: float
     retries: int
     user_agent: str
     mock_mode: bool = False
+    host_requests_per_second: float = 0.0
+    host_burst: int = 1
+    host_max_in_flight: int = 0
+    host_rate_overrides: Mapping[str, float] | None = None
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    cache_dir: str | None = None
+    cache_ttl_seconds: float = 86_400.0
+    cache_max_bytes: int = 256 * 1024 * 1024
+    resolution_cache_path: str | None = None
+    resolution_ttl_seconds: float = 7 * 86_400.0
+    resolution_failure_ttl_seconds: float = 6 * 3_600.0
+    parser_backend: str = "bs4"
+    streaming_parse: bool = False
+    streaming_stop_at_pmcid: bool = False
+    pmc_fast_path: bool = False
+    idconv_enabled: bool = False
+    idconv_url: str = NCBI_IDCONV_URL
+    idconv_batch_size: int = 200
+    idconv_tool: str | None = None
+    idconv_email: str | None = None
+    race_branches: bool = False
+    external_max_candidates: int = 3
+    external_max_depth: int = 2
+    external_max_bytes: int = 4 * 1024 * 1024
+    external_timeout: float = 20.0
+    publisher_rules: bool = False
+    respect_robots: bool = False
+    robots_cache_path: str | None = None
+    robots_ttl_seconds: float = 86_400.0
+    robots_failure_ttl_seconds: float = 300.0
+    robots_max_hosts: int = 1_024
+    robots_max_crawl_delay: float = 10.0
 
 
 class PubmedResolverManager:
@@ -48,68 +137,512 @@ class PubmedResolverManager:
         pubmed_parser: PubmedParser | None = None,
         pmc_extractor_factory: Callable[[], PmcPdfExtractor] | None = None,
         external_locator_factory: Callable[[], ExternalPdfLocator] | None = None,
+        resolution_cache: ResolutionCache | None = None,
+        html_backend: HtmlBackend | None = None,
+        page_streamer: StreamingHtmlFetcher | None = None,
+        stream_stop_at_pmcid: bool = False,
+        pdf_prober: PdfProber | None = None,
+        pmc_fast_path: bool = True,
+        crawl_budget: CrawlBudget | None = None,
+        publisher_rules: PublisherRuleRegistry | None = None,
     ) -> None:
         self._fetcher = html_fetcher
-        self._parser = pubmed_parser or PubmedPageParser()
+        self._crawl_budget = crawl_budget
+        self._publisher_rules = publisher_rules
+        self._html_backend = html_backend
+        self._page_streamer = page_streamer
+        self._stream_stop_at_pmcid = stream_stop_at_pmcid
+        self._pdf_prober = pdf_prober
+        # The prober always verifies external PDF links and publisher-rule
+        # URLs; only with the fast path does PMC probe before scraping.
+        self._pmc_prober = pdf_prober if pmc_fast_path else None
+        self._parser = pubmed_parser or PubmedPageParser(html_backend)
         self._pmc_extractor_factory = pmc_extractor_factory
         self._external_locator_factory = external_locator_factory
+        self._resolution_cache = resolution_cache
+        self._inflight: SingleFlight[PdfResolutionResult] = SingleFlight()
+
+    @property
+    def inflight_stats(self) -> SingleFlightStats:
+        return self._inflight.stats
+
+    @property
+    def fetch_inflight_stats(self) -> SingleFlightStats | None:
+        """Coalescing counters of the fetcher, when it is a single-flight wrapper."""
+
+        return getattr(self._fetcher, "stats", None)
+
+    @property
+    def publisher_rule_stats(self) -> dict[str, RuleStats]:
+        return self._publisher_rules.stats if self._publisher_rules is not None else {}
 
     def resolve(self, raw_url: str) -> PdfResolutionResult:
         try:
             normalized_url, pmid = normalize_pubmed_url(raw_url)
         except ResolverError as exc:
             return PdfResolutionResult.failure(str(exc))
+        return self._inflight.do(pmid, lambda: self._resolve_pmid(normalized_url, pmid))
+
+    def _resolve_pmid(self, normalized_url: str, pmid: str) -> PdfResolutionResult:
+        if self._resolution_cache is not None:
+            cached = self._resolution_cache.get(pmid)
+            if cached is not None:
+                return cached
 
         try:
-            article_html = self._fetcher.fetch(normalized_url)
+            metadata = self._fetch_metadata(normalized_url, pmid)
         except Exception as exc:  # pragma: no cover - network failure path
-            return PdfResolutionResult.failure(str(exc))
+            return PdfResolutionResult.failure(
+                str(exc), retryable=is_transient(exc), retry_after=retry_after(exc)
+            )
+
+        result = self._resolve_metadata(metadata)
+        if self._resolution_cache is not None and not result.retryable:
+            self._resolution_cache.put(pmid, result)
+        return result
 
-        metadata = self._parser.parse(article_html, pmid=pmid)
+    def _fetch_metadata(self, normalized_url: str, pmid: str) -> PubmedArticleMetadata:
+        if self._page_streamer is None:
+            return self._parser.parse(self._fetcher.fetch(normalized_url), pmid=pmid)
+        scanner = PubmedStreamScanner(pmid=pmid, stop_at_pmcid=self._stream_stop_at_pmcid)
+        self._page_streamer.fetch_partial(normalized_url, scanner.feed)
+        return scanner.metadata()
 
+    def _resolve_metadata(self, metadata: PubmedArticleMetadata) -> PdfResolutionResult:
+        pmc_result = external_result = None
         if metadata.pmc_id:
             pmc_result = self._resolve_pmc(metadata.pmc_id)
             if pmc_result.pdf_url:
                 return pmc_result
 
         if metadata.external_fulltext_url:
-            external_result = self._resolve_external(metadata.external_fulltext_url)
+            external_result = self._resolve_external(_external_targets(metadata))
             if external_result.pdf_url:
                 return external_result
 
-        return PdfResolutionResult.failure("No PDF source discovered")
+        return _no_pdf(pmc_result, external_result)
 
     def _resolve_pmc(self, pmc_id: str) -> PdfResolutionResult:
         extractor = (
             self._pmc_extractor_factory()
             if self._pmc_extractor_factory
-            else PmcPdfExtractor(self._fetcher)
+            else PmcPdfExtractor(self._fetcher, self._html_backend, self._pmc_prober)
         )
-        return extractor.resolve(pmc_id)
+        try:
+            return extractor.resolve(pmc_id)
+        except FetchError as exc:
+            if not _reportable(exc):
+                raise
+            return PdfResolutionResult.failure(
+                str(exc), retryable=exc.transient, retry_after=exc.retry_after
+            )
 
-    def _resolve_external(self, url: str) -> PdfResolutionResult:
+    def _resolve_external(self, urls: Sequence[str]) -> PdfResolutionResult:
         locator = (
             self._external_locator_factory()
             if self._external_locator_factory
-            else ExternalPdfLocator(self._fetcher)
+            else ExternalPdfLocator(
+                self._fetcher,
+                self._html_backend,
+                prober=self._pdf_prober,
+                budget=self._crawl_budget,
+                rules=self._publisher_rules,
+            )
         )
-        return locator.resolve(url)
+        try:
+            return locator.resolve_candidates(urls)
+        except FetchError as exc:
+            if not _reportable(exc):
+                raise
+            return PdfResolutionResult.failure(
+                str(exc), retryable=exc.transient, retry_after=exc.retry_after
+            )
 
     def close(self) -> None:
         close_method = getattr(self._fetcher, "close", None)
         if callable(close_method):
             close_method()
+        if self._resolution_cache is not None:
+            self._resolution_cache.close()
+
+
+class AsyncPubmedResolverManager:
+    """Asyncio counterpart of `PubmedResolverManager`."""
+
+    def __init__(
+        self,
+        *,
+        html_fetcher: AsyncHtmlFetcher,
+        pubmed_parser: PubmedParser | None = None,
+        pmc_extractor_factory: Callable[[], AsyncPmcPdfExtractor] | None = None,
+        external_locator_factory: Callable[[], AsyncExternalPdfLocator] | None = None,
+        resolution_cache: ResolutionCache | None = None,
+        html_backend: HtmlBackend | None = None,
+        page_streamer: AsyncStreamingHtmlFetcher | None = None,
+        stream_stop_at_pmcid: bool = False,
+        pdf_prober: AsyncPdfProber | None = None,
+        pmc_fast_path: bool = True,
+        id_converter: IdConverter | None = None,
+        race_branches: bool = False,
+        crawl_budget: CrawlBudget | None = None,
+        publisher_rules: PublisherRuleRegistry | None = None,
+    ) -> None:
+        self._fetcher = html_fetcher
+        self._crawl_budget = crawl_budget
+        self._publisher_rules = publisher_rules
+        self._id_converter = id_converter
+        self._race_branches = race_branches
+        self._html_backend = html_backend
+        self._page_streamer = page_streamer
+        self._stream_stop_at_pmcid = stream_stop_at_pmcid
+        self._pdf_prober = pdf_prober
+        # The prober always verifies external PDF links and publisher-rule
+        # URLs; only with the fast path does PMC probe before scraping.
+        self._pmc_prober = pdf_prober if pmc_fast_path else None
+        self._parser = pubmed_parser or PubmedPageParser(html_backend)
+        self._pmc_extractor_factory = pmc_extractor_factory
+        self._external_locator_factory = external_locator_factory
+        self._resolution_cache = resolution_cache
+        self._inflight: AsyncSingleFlight[PdfResolutionResult] = AsyncSingleFlight()
+
+    @property
+    def inflight_stats(self) -> SingleFlightStats:
+        return self._inflight.stats
+
+    @property
+    def fetch_inflight_stats(self) -> SingleFlightStats | None:
+        """Coalescing counters of the fetcher, when it is a single-flight wrapper."""
+
+        return getattr(self._fetcher, "stats", None)
+
+    @property
+    def publisher_rule_stats(self) -> dict[str, RuleStats]:
+        return self._publisher_rules.stats if self._publisher_rules is not None else {}
+
+    async def lookup_pmc_ids(self, raw_urls: Iterable[str]) -> dict[str, str]:
+        """Map each URL whose article is in PMC to its numeric PMC ID.
+
+        Uses the configured `IdConverter` in as few batched calls as it allows;
+        without one (or for URLs that are not PubMed links) nothing is returned.
+        """
+
+        if self._id_converter is None:
+            return {}
+        pmids_by_url: dict[str, str] = {}
+        for raw_url in raw_urls:
+            try:
+                _, pmids_by_url[raw_url] = normalize_pubmed_url(raw_url)
+            except ResolverError:
+                continue
+        if not pmids_by_url:
+            return {}
+        pmc_ids = await self._id_converter.convert(list(pmids_by_url.values()))
+        return {
+            raw_url: pmc_ids[pmid] for raw_url, pmid in pmids_by_url.items() if pmid in pmc_ids
+        }
+
+    async def resolve(self, raw_url: str, *, pmc_id: str | None = None) -> PdfResolutionResult:
+        try:
+            normalized_url, pmid = normalize_pubmed_url(raw_url)
+        except ResolverError as exc:
+            return PdfResolutionResult.failure(str(exc))
+        return await self._inflight.do(
+            pmid, lambda: self._resolve_pmid(normalized_url, pmid, pmc_id)
+        )
+
+    async def _resolve_pmid(
+        self, normalized_url: str, pmid: str, pmc_id: str | None = None
+    ) -> PdfResolutionResult:
+        if self._resolution_cache is not None:
+            cached = await asyncio.to_thread(self._resolution_cache.get, pmid)
+            if cached is not None:
+                return cached
+
+        if pmc_id:
+            try:
+                pmc_result = await self._resolve_pmc(pmc_id)
+            except ResolverError:
+                pmc_result = None
+            if pmc_result is not None and pmc_result.pdf_url:
+                return await self._remember(pmid, pmc_result)
+            if pmc_result is not None and pmc_result.retryable:
+                # Resolving without PMC would record a final "no PDF" for an
+                # article whose PMC copy was only briefly unreachable.
+                return pmc_result
+
+        try:
+            metadata = await self._fetch_metadata(normalized_url, pmid)
+        except Exception as exc:  # pragma: no cover - network failure path
+            return PdfResolutionResult.failure(
+                str(exc), retryable=is_transient(exc), retry_after=retry_after(exc)
+            )
+
+        if pmc_id and metadata.pmc_id == pmc_id:
+            # The PMC branch has already been tried for this ID.
+            metadata = replace(metadata, pmc_id=None)
+        return await self._remember(pmid, await self._resolve_metadata(metadata))
+
+    async def _remember(self, pmid: str, result: PdfResolutionResult) -> PdfResolutionResult:
+        if self._resolution_cache is not None and not result.retryable:
+            await asyncio.to_thread(self._resolution_cache.put, pmid, result)
+        return result
+
+    async def _fetch_metadata(self, normalized_url: str, pmid: str) -> PubmedArticleMetadata:
+        if self._page_streamer is None:
+            return self._parser.parse(await self._fetcher.fetch(normalized_url), pmid=pmid)
+        scanner = PubmedStreamScanner(pmid=pmid, stop_at_pmcid=self._stream_stop_at_pmcid)
+        await self._page_streamer.fetch_partial(normalized_url, scanner.feed)
+        return scanner.metadata()
+
+    async def _resolve_metadata(self, metadata: PubmedArticleMetadata) -> PdfResolutionResult:
+        if self._race_branches and metadata.pmc_id and metadata.external_fulltext_url:
+            return await self._resolve_racing(metadata.pmc_id, _external_targets(metadata))
+
+        pmc_result = external_result = None
+        if metadata.pmc_id:
+            pmc_result = await self._resolve_pmc(metadata.pmc_id)
+            if pmc_result.pdf_url:
+                return pmc_result
+
+        if metadata.external_fulltext_url:
+            external_result = await self._resolve_external(_external_targets(metadata))
+            if external_result.pdf_url:
+                return external_result
+
+        return _no_pdf(pmc_result, external_result)
+
+    async def _resolve_racing(
+        self, pmc_id: str, external_urls: Sequence[str]
+    ) -> PdfResolutionResult:
+        # The external branch starts right away, but its result is only used
+        # once PMC has come up empty, preserving the PMC-first preference.
+        external = asyncio.create_task(self._resolve_external(external_urls))
+        try:
+            pmc_result = await self._resolve_pmc(pmc_id)
+            if pmc_result.pdf_url:
+                return pmc_result
+            external_result = await external
+        finally:
+            _discard(external)
+        if external_result.pdf_url:
+            return external_result
+        return _no_pdf(pmc_result, external_result)
+
+    async def _resolve_pmc(self, pmc_id: str) -> PdfResolutionResult:
+        extractor = (
+            self._pmc_extractor_factory()
+            if self._pmc_extractor_factory
+            else AsyncPmcPdfExtractor(self._fetcher, self._html_backend, self._pmc_prober)
+        )
+        try:
+            return await extractor.resolve(pmc_id)
+        except FetchError as exc:
+            if not _reportable(exc):
+                raise
+            return PdfResolutionResult.failure(
+                str(exc), retryable=exc.transient, retry_after=exc.retry_after
+            )
+
+    async def _resolve_external(self, urls: Sequence[str]) -> PdfResolutionResult:
+        locator = (
+            self._external_locator_factory()
+            if self._external_locator_factory
+            else AsyncExternalPdfLocator(
+                self._fetcher,
+                self._html_backend,
+                prober=self._pdf_prober,
+                budget=self._crawl_budget,
+                rules=self._publisher_rules,
+            )
+        )
+        try:
+            return await locator.resolve_candidates(urls)
+        except FetchError as exc:
+            if not _reportable(exc):
+                raise
+            return PdfResolutionResult.failure(
+                str(exc), retryable=exc.transient, retry_after=exc.retry_after
+            )
+
+    async def aclose(self) -> None:
+        close_method = getattr(self._fetcher, "aclose", None)
+        if callable(close_method):
+            await close_method()
+        close_converter = getattr(self._id_converter, "aclose", None)
+        if callable(close_converter):
+            await close_converter()
+        if self._resolution_cache is not None:
+            self._resolution_cache.close()
 
 
 def build_default_resolver(*, config: ResolverConfig) -> PubmedResolverManager:
     fetcher: HtmlFetcher
+    network_fetcher: HttpxHtmlFetcher | None = None
     if config.mock_mode:
         fetcher = MockHtmlFetcher(MOCK_RESPONSES)
     else:
-        fetcher = HttpxHtmlFetcher(
+        rate_limiter = build_rate_limiter(config)
+        fetcher = network_fetcher = HttpxHtmlFetcher(
             timeout=config.timeout,
             retries=config.retries,
             user_agent=config.user_agent,
+            rate_limiter=rate_limiter,
+            limits=_build_limits(config),
+            robots=build_robots_policy(config, rate_limiter),
         )
-    return PubmedResolverManager(html_fetcher=fetcher)
+    if config.cache_dir:
+        store = ResponseCacheStore(config.cache_dir, max_bytes=config.cache_max_bytes)
+        fetcher = CachingHtmlFetcher(fetcher, store, ttl=config.cache_ttl_seconds)
+    return PubmedResolverManager(
+        html_fetcher=SingleFlightHtmlFetcher(fetcher),
+        resolution_cache=_build_resolution_cache(config),
+        html_backend=get_html_backend(config.parser_backend),
+        page_streamer=network_fetcher if _streaming_enabled(config) else None,
+        stream_stop_at_pmcid=config.streaming_stop_at_pmcid,
+        pdf_prober=network_fetcher,
+        pmc_fast_path=config.pmc_fast_path,
+        crawl_budget=build_crawl_budget(config),
+        publisher_rules=PublisherRuleRegistry() if config.publisher_rules else None,
+    )
+
+
+def build_default_async_resolver(
+    *, config: ResolverConfig, rate_limiter: HostRateLimiter | None = None
+) -> AsyncPubmedResolverManager:
+    fetcher: AsyncHtmlFetcher
+    network_fetcher: AsyncHttpxHtmlFetcher | None = None
+    id_converter: IdConverter | None = None
+    if config.mock_mode:
+        fetcher = AsyncMockHtmlFetcher(MOCK_RESPONSES)
+        if config.idconv_enabled:
+            id_converter = StaticIdConverter(MOCK_PMC_IDS)
+    else:
+        rate_limiter = rate_limiter or build_rate_limiter(config)
+        fetcher = network_fetcher = AsyncHttpxHtmlFetcher(
+            timeout=config.timeout,
+            retries=config.retries,
+            user_agent=config.user_agent,
+            rate_limiter=rate_limiter,
+            limits=_build_limits(config),
+            robots=build_robots_policy(config, rate_limiter),
+        )
+        if config.idconv_enabled:
+            id_converter = NcbiIdConverterClient(
+                base_url=config.idconv_url,
+                batch_size=config.idconv_batch_size,
+                timeout=config.timeout,
+                user_agent=config.user_agent,
+                tool=config.idconv_tool,
+                email=config.idconv_email,
+                rate_limiter=rate_limiter,
+            )
+    if config.cache_dir:
+        store = ResponseCacheStore(config.cache_dir, max_bytes=config.cache_max_bytes)
+        fetcher = AsyncCachingHtmlFetcher(fetcher, store, ttl=config.cache_ttl_seconds)
+    return AsyncPubmedResolverManager(
+        html_fetcher=AsyncSingleFlightHtmlFetcher(fetcher),
+        resolution_cache=_build_resolution_cache(config),
+        html_backend=get_html_backend(config.parser_backend),
+        page_streamer=network_fetcher if _streaming_enabled(config) else None,
+        stream_stop_at_pmcid=config.streaming_stop_at_pmcid,
+        pdf_prober=network_fetcher,
+        pmc_fast_path=config.pmc_fast_path,
+        id_converter=id_converter,
+        race_branches=config.race_branches,
+        crawl_budget=build_crawl_budget(config),
+        publisher_rules=PublisherRuleRegistry() if config.publisher_rules else None,
+    )
+
+
+def build_rate_limiter(config: ResolverConfig) -> HostRateLimiter:
+    """Limiter for `config`; pass it to other NCBI clients to share the budget."""
+
+    return HostRateLimiter(
+        requests_per_second=config.host_requests_per_second,
+        burst=config.host_burst,
+        max_in_flight=config.host_max_in_flight,
+        domain_overrides=config.host_rate_overrides,
+    )
+
+
+def build_robots_policy(
+    config: ResolverConfig, rate_limiter: HostRateLimiter | None = None
+) -> RobotsPolicy | None:
+    if not config.respect_robots:
+        return None
+    return RobotsPolicy(
+        user_agent=config.user_agent,
+        store=RobotsStore(config.robots_cache_path) if config.robots_cache_path else None,
+        rate_limiter=rate_limiter,
+        ttl=config.robots_ttl_seconds,
+        failure_ttl=config.robots_failure_ttl_seconds,
+        max_hosts=config.robots_max_hosts,
+        max_crawl_delay=config.robots_max_crawl_delay,
+    )
+
+
+def build_crawl_budget(config: ResolverConfig) -> CrawlBudget:
+    return CrawlBudget(
+        max_candidates=config.external_max_candidates,
+        max_depth=config.external_max_depth,
+        max_bytes=config.external_max_bytes,
+        timeout=config.external_timeout,
+    )
+
+
+def _build_limits(config: ResolverConfig) -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=config.max_connections,
+        max_keepalive_connections=config.max_keepalive_connections,
+    )
+
+
+def _build_resolution_cache(config: ResolverConfig) -> ResolutionCache | None:
+    if not config.resolution_cache_path:
+        return None
+    return ResolutionCache(
+        config.resolution_cache_path,
+        ttl=config.resolution_ttl_seconds,
+        failure_ttl=config.resolution_failure_ttl_seconds,
+    )
+
+
+def _discard(task: asyncio.Task) -> None:
+    """Cancel `task` if still running, without leaving its outcome unobserved."""
+
+    if task.done():
+        if not task.cancelled():
+            task.exception()
+        return
+    task.cancel()
+    task.add_done_callback(lambda done: done.cancelled() or done.exception())
+
+
+def _reportable(error: FetchError) -> bool:
+    # Robots blocks and transient errors end a branch with a failure result;
+    # other fetch errors propagate as before.
+    return error.transient or isinstance(error, RobotsDisallowedError)
+
+
+def _no_pdf(*results: PdfResolutionResult | None) -> PdfResolutionResult:
+    # A branch that may succeed later is retried before anything else is
+    # reported; a robots.txt block is reported as such, not as a missing PDF.
+    for result in results:
+        if result is not None and result.retryable:
+            return result
+    for result in results:
+        if result is not None and result.reason == RobotsDisallowedError.reason:
+            return result
+    return PdfResolutionResult.failure("No PDF source discovered")
+
+
+def _external_targets(metadata: PubmedArticleMetadata) -> list[str]:
+    if metadata.external_candidates:
+        return metadata.external_candidates
+    return [metadata.external_fulltext_url] if metadata.external_fulltext_url else []
+
 
+def _streaming_enabled(config: ResolverConfig) -> bool:
+    # Cached responses are whole documents, so streaming only applies when
+    # PubMed pages always come straight off the network.
+    return config.streaming_parse and not config.cache_dir
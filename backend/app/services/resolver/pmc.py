@@ -3,44 +3,87 @@
 Invoked exclusively by `manager.py` once `html_parser.py` identifies a PMC ID.
 This module reuses the generic `HtmlFetcher` abstraction (`fetcher.py`) so tests
 can inject canned responses.  On success, it returns a `PdfResolutionResult`
-(`results.py`) which the manager bubbles up.
+(`results.py`) which the manager bubbles up.  `AsyncPmcPdfExtractor` performs the
+same steps against an `AsyncHtmlFetcher`.
+
+When given a `PdfProber`, the extractors first try the deterministic
+`/articles/PMC{id}/pdf/` URL and only scrape the article page if the probe
+cannot confirm a PDF there.
 """
 
 from __future__ import annotations
 
-from bs4 import BeautifulSoup
+from urllib.parse import urljoin
 
 from .exceptions import ParseError
-from .fetcher import HtmlFetcher
+from .fetcher import AsyncHtmlFetcher, AsyncPdfProber, HtmlFetcher, PdfProber
+from .html_backends import DEFAULT_HTML_BACKEND, HtmlBackend, HtmlDocument
 from .results import PdfResolutionResult, ResolutionSource
 
 
+def pmc_article_url(pmc_id: str) -> str:
+    return f"https://pmc.ncbi.nlm.nih.gov/articles/PMC{pmc_id}/"
+
+
+def pmc_pdf_url(pmc_id: str) -> str:
+    return f"{pmc_article_url(pmc_id)}pdf/"
+
+
 class PmcPdfExtractor:
     """Handles resolving PMC articles to their PDF URL."""
 
-    def __init__(self, fetcher: HtmlFetcher) -> None:
+    def __init__(
+        self,
+        fetcher: HtmlFetcher,
+        backend: HtmlBackend | None = None,
+        prober: PdfProber | None = None,
+    ) -> None:
         self._fetcher = fetcher
+        self._backend = backend or DEFAULT_HTML_BACKEND
+        self._prober = prober
 
     def resolve(self, pmc_id: str) -> PdfResolutionResult:
-        article_url = f"https://pmc.ncbi.nlm.nih.gov/articles/PMC{pmc_id}/"
+        if self._prober is not None:
+            pdf_url = self._prober.probe_pdf(pmc_pdf_url(pmc_id))
+            if pdf_url:
+                return PdfResolutionResult.success(ResolutionSource.pmc, pdf_url)
+        article_url = pmc_article_url(pmc_id)
         html = self._fetcher.fetch(article_url)
-        pdf_url = self._extract_pdf_url(html, base_url=article_url)
-        if pdf_url:
-            return PdfResolutionResult.success(ResolutionSource.pmc, pdf_url)
-        return PdfResolutionResult.failure("PMC PDF link not found")
-
-    @staticmethod
-    def _extract_pdf_url(html: str, *, base_url: str) -> str | None:
-        soup = BeautifulSoup(html, "html.parser")
-        pdf_link = soup.select_one('a[href$="pdf"]')
-        if pdf_link and pdf_link.get("href"):
-            href = pdf_link["href"]
-            if href.startswith("http"):
-                return href
-            if href.startswith("//"):
-                return f"https:{href}"
-            if href.startswith("/"):
-                return base_url.rstrip("/") + href
-            return base_url + href
-        return None
+        return _build_result(self._backend.parse(html, links_only=True), base_url=article_url)
+
+
+class AsyncPmcPdfExtractor:
+    """Async variant of `PmcPdfExtractor` sharing its HTML extraction rules."""
+
+    def __init__(
+        self,
+        fetcher: AsyncHtmlFetcher,
+        backend: HtmlBackend | None = None,
+        prober: AsyncPdfProber | None = None,
+    ) -> None:
+        self._fetcher = fetcher
+        self._backend = backend or DEFAULT_HTML_BACKEND
+        self._prober = prober
+
+    async def resolve(self, pmc_id: str) -> PdfResolutionResult:
+        if self._prober is not None:
+            pdf_url = await self._prober.probe_pdf(pmc_pdf_url(pmc_id))
+            if pdf_url:
+                return PdfResolutionResult.success(ResolutionSource.pmc, pdf_url)
+        article_url = pmc_article_url(pmc_id)
+        html = await self._fetcher.fetch(article_url)
+        return _build_result(self._backend.parse(html, links_only=True), base_url=article_url)
+
+
+def _build_result(document: HtmlDocument, *, base_url: str) -> PdfResolutionResult:
+    pdf_url = _extract_pdf_url(document, base_url=base_url)
+    if pdf_url:
+        return PdfResolutionResult.success(ResolutionSource.pmc, pdf_url)
+    return PdfResolutionResult.failure("PMC PDF link not found")
+
 
+def _extract_pdf_url(document: HtmlDocument, *, base_url: str) -> str | None:
+    links = document.links('a[href$="pdf"]')
+    if links and links[0].href:
+        return urljoin(base_url, links[0].href)
+    return None
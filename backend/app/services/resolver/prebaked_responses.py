@@ -26,3 +26,22 @@ MOCK_RESPONSES: dict[str, str] = {
     ),
 }
 
+
+# PMID → numeric PMC ID answers for the mock-mode ID converter.
+MOCK_PMC_IDS: dict[str, str] = {
+    "38702718": "10730138",
+}
+
+
+# Query → PMIDs answers for the mock-mode search client.
+MOCK_SEARCH_RESULTS: dict[str, list[str]] = {
+    "sample": ["38702718", "21458665"],
+}
+
+
+# Body served for every PDF URL when downloads run in mock mode.
+MOCK_PDF_BYTES: bytes = (
+    b"%PDF-1.4\n1 0 obj\n<< /Type /Catalog /Pages 2 0 R >>\nendobj\n"
+    b"2 0 obj\n<< /Type /Pages /Kids [] /Count 0 >>\nendobj\n"
+    b"trailer\n<< /Root 1 0 R >>\n%%EOF\n"
+)
@@ -0,0 +1,189 @@
+"""Publisher rules that map landing-page URLs straight to PDF URLs.
+
+Many publishers build PDF URLs deterministically from the article URL or the
+DOI.  `external.py` asks a `PublisherRuleRegistry` for a PDF URL before it
+fetches a candidate page; on a hit (confirmed by a `PdfProber` when one is
+configured) the landing page is never downloaded or parsed, on a miss the
+locator falls back to its HTML heuristics.  Rules are declarative: a host, a
+regex matched against the URL and a `str.format` template filled from the
+regex's named groups.  Each rule keeps `RuleStats` counters: a hit is a derived
+URL the locator used, a miss one the prober rejected.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Iterable, NamedTuple
+from urllib.parse import unquote, urlsplit
+
+
+@dataclass(slots=True)
+class RuleStats:
+    """Counters describing how often a rule saved a landing-page fetch."""
+
+    hits: int = 0
+    misses: int = 0
+
+
+class PublisherRule(NamedTuple):
+    name: str
+    host: str
+    pattern: str
+    template: str
+
+
+class RuleMatch(NamedTuple):
+    rule: str
+    pdf_url: str
+
+
+# `host` matches the URL host or any of its subdomains.  DOI rules are keyed
+# on doi.org and select the publisher by DOI prefix.
+DEFAULT_PUBLISHER_RULES: tuple[PublisherRule, ...] = (
+    PublisherRule(
+        "sciencedirect",
+        "sciencedirect.com",
+        r"/science/article/(?:abs/)?pii/(?P<pii>S?[0-9X]+)",
+        "https://www.sciencedirect.com/science/article/pii/{pii}/pdfft"
+        "?isDTMRedir=true&download=true",
+    ),
+    PublisherRule(
+        "springer",
+        "link.springer.com",
+        r"/article/(?P<doi>10\.\d{4,9}/[^?#]+)",
+        "https://link.springer.com/content/pdf/{doi}.pdf",
+    ),
+    PublisherRule(
+        "biomedcentral",
+        "biomedcentral.com",
+        r"^https?://(?P<journal>[\w-]+)\.biomedcentral\.com/articles/(?P<doi>10\.\d{4,9}/[^?#]+)",
+        "https://{journal}.biomedcentral.com/counter/pdf/{doi}",
+    ),
+    PublisherRule(
+        "wiley",
+        "onlinelibrary.wiley.com",
+        r"/doi/(?:abs/|full/|epdf/)?(?P<doi>10\.\d{4,9}/[^?#]+)",
+        "https://onlinelibrary.wiley.com/doi/pdfdirect/{doi}",
+    ),
+    PublisherRule(
+        "tandfonline",
+        "tandfonline.com",
+        r"/doi/(?:abs/|full/)?(?P<doi>10\.\d{4,9}/[^?#]+)",
+        "https://www.tandfonline.com/doi/pdf/{doi}",
+    ),
+    PublisherRule(
+        "sagepub",
+        "journals.sagepub.com",
+        r"/doi/(?:abs/|full/)?(?P<doi>10\.\d{4,9}/[^?#]+)",
+        "https://journals.sagepub.com/doi/pdf/{doi}",
+    ),
+    PublisherRule(
+        "frontiers",
+        "frontiersin.org",
+        r"/articles?/(?P<doi>10\.\d{4,9}/[^/?#]+)",
+        "https://www.frontiersin.org/articles/{doi}/pdf",
+    ),
+    PublisherRule(
+        "plos",
+        "journals.plos.org",
+        r"/(?P<journal>\w+)/article\?id=(?P<doi>10\.1371/[^&#]+)",
+        "https://journals.plos.org/{journal}/article/file?id={doi}&type=printable",
+    ),
+    PublisherRule(
+        "mdpi",
+        "mdpi.com",
+        r"mdpi\.com/(?P<path>\d{4}-\d{3}[\dX]/\d+/\d+/\d+)/?(?:$|[?#])",
+        "https://www.mdpi.com/{path}/pdf",
+    ),
+    PublisherRule(
+        "nature",
+        "nature.com",
+        r"/articles/(?P<article>[\w-]+)/?(?:$|[?#])",
+        "https://www.nature.com/articles/{article}.pdf",
+    ),
+    PublisherRule(
+        "doi-springer",
+        "doi.org",
+        r"doi\.org/(?P<doi>10\.(?:1007|1186)/[^?#]+)",
+        "https://link.springer.com/content/pdf/{doi}.pdf",
+    ),
+    PublisherRule(
+        "doi-wiley",
+        "doi.org",
+        r"doi\.org/(?P<doi>10\.(?:1002|1111)/[^?#]+)",
+        "https://onlinelibrary.wiley.com/doi/pdfdirect/{doi}",
+    ),
+    PublisherRule(
+        "doi-tandfonline",
+        "doi.org",
+        r"doi\.org/(?P<doi>10\.1080/[^?#]+)",
+        "https://www.tandfonline.com/doi/pdf/{doi}",
+    ),
+    PublisherRule(
+        "doi-sagepub",
+        "doi.org",
+        r"doi\.org/(?P<doi>10\.1177/[^?#]+)",
+        "https://journals.sagepub.com/doi/pdf/{doi}",
+    ),
+    PublisherRule(
+        "doi-frontiers",
+        "doi.org",
+        r"doi\.org/(?P<doi>10\.3389/[^?#]+)",
+        "https://www.frontiersin.org/articles/{doi}/pdf",
+    ),
+    PublisherRule(
+        "doi-nature",
+        "doi.org",
+        r"doi\.org/10\.1038/(?P<article>[\w-]+)$",
+        "https://www.nature.com/articles/{article}.pdf",
+    ),
+)
+
+
+class PublisherRuleRegistry:
+    """Host-indexed, precompiled `PublisherRule`s with per-rule counters."""
+
+    def __init__(self, rules: Iterable[PublisherRule] = DEFAULT_PUBLISHER_RULES) -> None:
+        self._by_host: dict[str, list[tuple[str, re.Pattern[str], str]]] = {}
+        self.stats: dict[str, RuleStats] = {}
+        for rule in rules:
+            compiled = re.compile(rule.pattern, re.IGNORECASE)
+            self._by_host.setdefault(rule.host.lower(), []).append(
+                (rule.name, compiled, rule.template)
+            )
+            self.stats[rule.name] = RuleStats()
+
+    def match(self, url: str) -> RuleMatch | None:
+        """The PDF URL the first applicable rule derives from `url`, if any.
+
+        Hosts without rules cost one dict lookup per domain suffix.
+        """
+
+        rules = self._rules_for(urlsplit(url).hostname or "")
+        if not rules:
+            return None
+        target = unquote(url)
+        for name, pattern, template in rules:
+            found = pattern.search(target)
+            if found:
+                return RuleMatch(name, template.format(**found.groupdict()))
+        return None
+
+    def record(self, match: RuleMatch, *, hit: bool) -> None:
+        """Count whether the URL `match` derived was used or turned out not to be a PDF."""
+
+        stats = self.stats[match.rule]
+        if hit:
+            stats.hits += 1
+        else:
+            stats.misses += 1
+
+    def _rules_for(self, host: str) -> list[tuple[str, re.Pattern[str], str]]:
+        host = host.lower()
+        while host:
+            rules = self._by_host.get(host)
+            if rules:
+                return rules
+            _, _, host = host.partition(".")
+        return []
@@ -0,0 +1,234 @@
+"""Host-aware request scheduling shared by the resolver fetchers.
+
+`fetcher.py` wraps every outbound request in `HostRateLimiter.limit` (or the
+asyncio flavour `alimit`) so that concurrent jobs cannot hammer a single origin.
+Request rates are enforced by a token bucket per registrable domain (e.g. all of
+`*.ncbi.nlm.nih.gov` share one budget), in-flight requests are capped per host,
+and 429/503 responses push the whole domain back via `penalize`.  `throttle`
+additionally paces a single host, e.g. to honour its robots.txt `Crawl-delay`
+(`robots.py`), until `unthrottle` lifts it again.  The manager (`manager.py`)
+builds a single limiter from `ResolverConfig` and shares it between every
+fetcher it creates.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import AsyncIterator, Callable, Iterator, Mapping
+from urllib.parse import urlsplit
+
+
+# Second-level labels under which registrations happen one level deeper
+# (``example.co.uk``).  A full public-suffix list is overkill for the hosts the
+# resolver talks to; this covers the common publisher domains.
+_MULTI_LABEL_SUFFIXES = frozenset(
+    {
+        "ac.uk", "co.uk", "org.uk", "gov.uk", "nhs.uk",
+        "com.au", "edu.au", "org.au", "gov.au",
+        "co.jp", "ac.jp", "or.jp",
+        "com.br", "org.br", "com.cn", "edu.cn", "ac.cn",
+        "co.in", "ac.in", "co.nz", "ac.nz", "co.za", "ac.za",
+        "ac.kr", "co.kr", "com.tw", "edu.tw", "com.mx",
+    }
+)
+
+
+@lru_cache(maxsize=4096)
+def registrable_domain(host: str) -> str:
+    """Collapse a hostname to the domain that shares a rate budget."""
+
+    labels = [label for label in host.lower().strip(".").split(".") if label]
+    if len(labels) <= 2:
+        return ".".join(labels)
+    if ".".join(labels[-2:]) in _MULTI_LABEL_SUFFIXES:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+
+def parse_retry_after(value: str | None, *, now: datetime | None = None) -> float | None:
+    """Convert a `Retry-After` header (seconds or HTTP date) into seconds."""
+
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        target = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if target.tzinfo is None:
+        target = target.replace(tzinfo=timezone.utc)
+    current = now or datetime.now(timezone.utc)
+    return max(0.0, (target - current).total_seconds())
+
+
+@dataclass(slots=True)
+class TokenBucket:
+    """Classic token bucket that hands out reservations instead of blocking."""
+
+    rate: float
+    capacity: float
+    tokens: float
+    updated: float
+
+    def reserve(self, now: float) -> float:
+        """Take one token and return how long the caller must wait for it."""
+
+        elapsed = max(0.0, now - self.updated)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated = now
+        self.tokens -= 1.0
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+
+class HostRateLimiter:
+    """Per-domain token buckets plus per-host in-flight caps.
+
+    A `requests_per_second` of 0 disables rate limiting and a `max_in_flight`
+    of 0 disables the concurrency cap, so the limiter can always be wired in.
+    """
+
+    def __init__(
+        self,
+        *,
+        requests_per_second: float,
+        burst: int = 1,
+        max_in_flight: int = 0,
+        domain_overrides: Mapping[str, float] | None = None,
+        default_penalty: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._rate = max(0.0, requests_per_second)
+        self._burst = max(1, burst)
+        self._max_in_flight = max(0, max_in_flight)
+        self._overrides = {
+            registrable_domain(domain): rate for domain, rate in (domain_overrides or {}).items()
+        }
+        self._default_penalty = default_penalty
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._buckets: dict[str, TokenBucket] = {}
+        self._blocked_until: dict[str, float] = {}
+        self._host_buckets: dict[str, TokenBucket] = {}
+        self._thread_slots: dict[str, threading.BoundedSemaphore] = {}
+        self._async_slots: dict[str, asyncio.Semaphore] = {}
+
+    @contextmanager
+    def limit(self, url: str) -> Iterator[None]:
+        host, domain = _split_url(url)
+        slot = self._thread_slot(host)
+        if slot is not None:
+            slot.acquire()
+        try:
+            delay = self.reserve(domain, host=host)
+            if delay > 0:
+                time.sleep(delay)
+            yield
+        finally:
+            if slot is not None:
+                slot.release()
+
+    @asynccontextmanager
+    async def alimit(self, url: str) -> AsyncIterator[None]:
+        host, domain = _split_url(url)
+        slot = self._async_slot(host)
+        if slot is not None:
+            await slot.acquire()
+        try:
+            delay = self.reserve(domain, host=host)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            yield
+        finally:
+            if slot is not None:
+                slot.release()
+
+    def reserve(self, domain: str, *, host: str | None = None) -> float:
+        """Claim the next request slot for `domain` (and `host`) and return the wait time."""
+
+        with self._lock:
+            now = self._clock()
+            delay = max(0.0, self._blocked_until.get(domain, 0.0) - now)
+            rate = self._overrides.get(domain, self._rate)
+            if rate > 0:
+                bucket = self._buckets.get(domain)
+                if bucket is None:
+                    burst = float(self._burst)
+                    bucket = TokenBucket(rate=rate, capacity=burst, tokens=burst, updated=now)
+                    self._buckets[domain] = bucket
+                delay = max(delay, bucket.reserve(now))
+            host_bucket = self._host_buckets.get(host) if host is not None else None
+            if host_bucket is not None:
+                delay = max(delay, host_bucket.reserve(now))
+            return delay
+
+    def penalize(self, url: str, retry_after: float | None = None) -> None:
+        """Hold back the URL's domain after a 429/503 response."""
+
+        _, domain = _split_url(url)
+        wait = self._default_penalty if retry_after is None else retry_after
+        with self._lock:
+            until = self._clock() + wait
+            if until > self._blocked_until.get(domain, 0.0):
+                self._blocked_until[domain] = until
+
+    def throttle(self, url: str, requests_per_second: float) -> None:
+        """Pace the URL's host at `requests_per_second`, without bursts.
+
+        The host's domain budget still applies; a later call replaces the pace.
+        """
+
+        if requests_per_second <= 0:
+            self.unthrottle(url)
+            return
+        host, _ = _split_url(url)
+        with self._lock:
+            bucket = self._host_buckets.get(host)
+            if bucket is None:
+                self._host_buckets[host] = TokenBucket(
+                    rate=requests_per_second, capacity=1.0, tokens=1.0, updated=self._clock()
+                )
+            else:
+                bucket.rate = requests_per_second
+                bucket.tokens = min(bucket.tokens, 1.0)
+
+    def unthrottle(self, url: str) -> None:
+        """Drop the pace `throttle` set for the URL's host."""
+
+        host, _ = _split_url(url)
+        with self._lock:
+            self._host_buckets.pop(host, None)
+
+    def _thread_slot(self, host: str) -> threading.BoundedSemaphore | None:
+        if not self._max_in_flight:
+            return None
+        with self._lock:
+            slot = self._thread_slots.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self._max_in_flight)
+                self._thread_slots[host] = slot
+            return slot
+
+    def _async_slot(self, host: str) -> asyncio.Semaphore | None:
+        if not self._max_in_flight:
+            return None
+        slot = self._async_slots.get(host)
+        if slot is None:
+            slot = asyncio.Semaphore(self._max_in_flight)
+            self._async_slots[host] = slot
+        return slot
+
+
+def _split_url(url: str) -> tuple[str, str]:
+    host = (urlsplit(url).hostname or "").lower()
+    return host, registrable_domain(host)
@@ -0,0 +1,83 @@
+"""Persistent PMID → `PdfResolutionResult` cache.
+
+`manager.py` consults this cache right after `url_utils.normalize_pubmed_url`
+has produced a PMID; a hit skips every fetch and parse.  Successful resolutions
+and definitive failures (e.g. "No PDF source discovered") are stored with
+separate TTLs so missing PDFs are re-checked sooner than found ones.  Transient
+fetch errors are never written here; the manager decides what is cacheable.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+from .results import PdfResolutionResult, ResolutionSource
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS resolutions (
+    pmid TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    pdf_url TEXT,
+    reason TEXT,
+    expires_at REAL NOT NULL
+);
+"""
+
+
+class ResolutionCache:
+    """SQLite-backed cache of resolution outcomes keyed by PMID."""
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        ttl: float,
+        failure_ttl: float,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._ttl = ttl
+        self._failure_ttl = failure_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    def get(self, pmid: str) -> PdfResolutionResult | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT source, pdf_url, reason, expires_at FROM resolutions WHERE pmid = ?",
+                (pmid,),
+            ).fetchone()
+        if row is None:
+            return None
+        source, pdf_url, reason, expires_at = row
+        if expires_at <= self._clock():
+            return None
+        return PdfResolutionResult(source=ResolutionSource(source), pdf_url=pdf_url, reason=reason)
+
+    def put(self, pmid: str, result: PdfResolutionResult) -> None:
+        ttl = self._ttl if result.pdf_url else self._failure_ttl
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO resolutions (pmid, source, pdf_url, reason, expires_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (pmid, result.source.value, result.pdf_url, result.reason, self._clock() + ttl),
+            )
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            cursor = self._db.execute(
+                "DELETE FROM resolutions WHERE expires_at <= ?", (self._clock(),)
+            )
+        return cursor.rowcount
+
+    def close(self) -> None:
+        self._db.close()
@@ -3,7 +3,10 @@
 `manager.py`, `pmc.py`, and `external.py` all pass around
 `PdfResolutionResult` instances to report success/failure while remembering the
 origin (PMC vs external).  Keeping the enum/dataclass here avoids circular
-imports between manager and the branch modules.
+imports between manager and the branch modules.  A `retryable` failure was
+caused by a transient fetch error (see `retry.py`); it is neither cached nor
+final, so the job runners schedule the item again (no sooner than
+`retry_after`, when the failure names a delay).
 """
 
 from __future__ import annotations
@@ -28,12 +31,22 @@ class PdfResolutionResult:
     source: ResolutionSource
     pdf_url: Optional[str]
     reason: Optional[str] = None
+    retryable: bool = False
+    retry_after: Optional[float] = None
 
     @classmethod
     def success(cls, source: ResolutionSource, pdf_url: str) -> "PdfResolutionResult":
         return cls(source=source, pdf_url=pdf_url, reason=None)
 
     @classmethod
-    def failure(cls, reason: str) -> "PdfResolutionResult":
-        return cls(source=ResolutionSource.none, pdf_url=None, reason=reason)
+    def failure(
+        cls, reason: str, *, retryable: bool = False, retry_after: Optional[float] = None
+    ) -> "PdfResolutionResult":
+        return cls(
+            source=ResolutionSource.none,
+            pdf_url=None,
+            reason=reason,
+            retryable=retryable,
+            retry_after=retry_after,
+        )
 
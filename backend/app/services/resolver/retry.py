@@ -0,0 +1,109 @@
+"""Retry classification and backoff shared by the fetchers and the job runners.
+
+`fetcher.py` uses `is_transient` to retry only connect errors, timeouts, 429s
+and 5xx responses, and tags the `FetchError` it finally raises with the same
+verdict.  `app.api.jobs` and `app.worker` then ask `RetryPolicy.schedule` how
+long to wait before running a transiently failed item again: the item is
+re-queued (a delayed task release, or a timer on the inline `ScheduledJob`)
+rather than holding a worker while it sleeps.  Delays use exponential backoff
+with full jitter, and each job draws its retries from a shared budget so one
+flaky host cannot set off a retry storm.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+from typing import Callable
+
+import httpx
+
+from .exceptions import FetchError
+from .rate_limit import parse_retry_after
+
+
+def is_transient(error: BaseException) -> bool:
+    """Whether retrying later could succeed where `error` failed."""
+
+    if isinstance(error, httpx.HTTPStatusError):
+        return is_transient_status(error.response.status_code)
+    if isinstance(error, (httpx.TimeoutException, httpx.NetworkError)):
+        return True
+    if isinstance(error, httpx.RemoteProtocolError):
+        return True
+    # Errors raised further up the stack carry their own verdict.
+    return bool(getattr(error, "transient", False))
+
+
+def retry_after(error: BaseException) -> float | None:
+    """Server-requested delay carried by `error`, if any."""
+
+    if isinstance(error, httpx.HTTPStatusError):
+        return parse_retry_after(error.response.headers.get("Retry-After"))
+    return getattr(error, "retry_after", None)
+
+
+def fetch_error(error: Exception | None) -> FetchError:
+    """Wrap the last HTTPX error of a fetch in a `FetchError` with its verdict."""
+
+    if error is None:
+        return FetchError("Fetch failed")
+    return FetchError(str(error), transient=is_transient(error), retry_after=retry_after(error))
+
+
+def is_transient_status(status_code: int) -> bool:
+    return status_code == 429 or status_code >= 500
+
+
+class RetryPolicy:
+    """How often and how soon transient failures are retried.
+
+    `max_attempts` counts the first attempt; `job_budget` caps the retries all
+    items of one job may spend together.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_attempts: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        job_budget: int = 100,
+        random_fn: Callable[[], float] = random.random,
+    ) -> None:
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = max(0.0, base_delay)
+        self.max_delay = max(self.base_delay, max_delay)
+        self.job_budget = max(0, job_budget)
+        self._random = random_fn
+        self._lock = threading.Lock()
+        self._spent: dict[str, int] = {}
+
+    def backoff(self, attempt: int, *, retry_after: float | None = None) -> float:
+        """Full-jitter delay after failed attempt number `attempt` (1-based)."""
+
+        ceiling = min(self.max_delay, self.base_delay * 2 ** max(0, attempt - 1))
+        delay = self._random() * ceiling
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+    def schedule(
+        self, job_id: str, attempt: int, *, retry_after: float | None = None
+    ) -> float | None:
+        """Delay before retrying after failed `attempt`, or None to give up."""
+
+        if attempt >= self.max_attempts:
+            return None
+        with self._lock:
+            spent = self._spent.get(job_id, 0)
+            if spent >= self.job_budget:
+                return None
+            self._spent[job_id] = spent + 1
+        return self.backoff(attempt, retry_after=retry_after)
+
+    def forget(self, job_id: str) -> None:
+        """Drop the budget bookkeeping of a finished job."""
+
+        with self._lock:
+            self._spent.pop(job_id, None)
@@ -0,0 +1,295 @@
+"""robots.txt enforcement for the resolver fetchers.
+
+The HTTPX fetchers in `fetcher.py` ask a `RobotsPolicy` whether a URL may be
+requested before sending it.  Each origin's robots.txt is fetched once (the
+fetcher supplies the transport, concurrent first requests share one fetch via
+`singleflight.py`), parsed into a compiled `RobotsRules` matcher and kept in an
+in-process LRU with a TTL.  With a `RobotsStore` the raw answers also land in a
+SQLite file, so API and worker processes share them instead of refetching.
+
+Missing robots.txt files (4xx) are cached as "allow everything"; server or
+network errors and 429s are cached as "disallow everything" for the shorter
+`failure_ttl`, as RFC 9309 asks.  A `Crawl-delay` paces that host (not its
+whole domain) in the `HostRateLimiter` (`rate_limit.py`), capped at
+`max_crawl_delay`, and is replaced or lifted whenever robots.txt is reloaded.
+Disallowed URLs raise `RobotsDisallowedError` (`exceptions.py`), which the
+manager reports as its own failure reason; a block caused by an unreachable
+robots.txt is raised as transient, so the job runners retry the item later
+(`retry.py`) instead of failing it.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Awaitable, Callable
+from urllib.parse import urlsplit
+
+from .exceptions import RobotsDisallowedError
+from .rate_limit import HostRateLimiter
+from .singleflight import AsyncSingleFlight, SingleFlight
+
+
+# A robots.txt answer as seen by the fetcher: HTTP status (None when the
+# request failed outright) and the body.
+RobotsResponse = tuple[int | None, str]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS robots (
+    origin TEXT PRIMARY KEY,
+    status INTEGER,
+    body TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+_MAX_BODY_CHARS = 500 * 1024
+
+
+@dataclass(frozen=True, slots=True)
+class RobotsRules:
+    """Compiled rules of the robots.txt group that applies to our user agent."""
+
+    # (pattern, allow) pairs, longest pattern first and Allow before Disallow
+    # on ties, so the first match is the one RFC 9309 says wins.
+    rules: tuple[tuple[re.Pattern[str], bool], ...] = ()
+    crawl_delay: float | None = None
+    disallow_all: bool = False
+    # Set when robots.txt could not be fetched and everything is disallowed
+    # only until it can be.
+    unreachable: bool = False
+
+    def allows(self, url: str) -> bool:
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if path == "/robots.txt":
+            return True
+        if self.disallow_all:
+            return False
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        for pattern, allow in self.rules:
+            if pattern.match(path):
+                return allow
+        return True
+
+
+ALLOW_ALL = RobotsRules()
+UNREACHABLE = RobotsRules(disallow_all=True, unreachable=True)
+
+
+def parse_robots(body: str, user_agent: str) -> RobotsRules:
+    """Parse `body` and keep the groups that apply to `user_agent`."""
+
+    token = user_agent.split("/", 1)[0].strip().lower()
+    groups: list[tuple[set[str], list[tuple[str, bool]], list[float]]] = []
+    in_agents = False
+    for raw_line in body[:_MAX_BODY_CHARS].splitlines():
+        line = raw_line.split("#", 1)[0].strip()
+        key, separator, value = line.partition(":")
+        if not separator:
+            continue
+        key = key.strip().lower()
+        value = value.strip()
+        if key == "user-agent":
+            if not in_agents:
+                groups.append((set(), [], []))
+                in_agents = True
+            groups[-1][0].add(value.lower())
+            continue
+        in_agents = False
+        if not groups:
+            continue
+        if key in ("allow", "disallow") and value:
+            groups[-1][1].append((value, key == "allow"))
+        elif key == "crawl-delay":
+            try:
+                groups[-1][2].append(float(value))
+            except ValueError:
+                pass
+
+    selected = [group for group in groups if token in group[0]]
+    if not selected:
+        selected = [group for group in groups if "*" in group[0]]
+    rules = [rule for group in selected for rule in group[1]]
+    delays = [delay for group in selected for delay in group[2] if delay >= 0]
+    rules.sort(key=lambda rule: (len(rule[0]), rule[1]), reverse=True)
+    return RobotsRules(
+        rules=tuple((_compile(path), allow) for path, allow in rules),
+        crawl_delay=max(delays) if delays else None,
+    )
+
+
+def _compile(path: str) -> re.Pattern[str]:
+    anchored = path.endswith("$")
+    pattern = ".*".join(re.escape(part) for part in path.rstrip("$").split("*"))
+    return re.compile(pattern + ("$" if anchored else ""))
+
+
+def robots_url(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}/robots.txt"
+
+
+class RobotsStore:
+    """SQLite file of raw robots.txt answers shared between processes."""
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    def get(self, origin: str, now: float) -> tuple[int | None, str, float] | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT status, body, expires_at FROM robots WHERE origin = ? AND expires_at > ?",
+                (origin, now),
+            ).fetchone()
+        return None if row is None else (row[0], row[1], row[2])
+
+    def put(self, origin: str, status: int | None, body: str, expires_at: float) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO robots (origin, status, body, expires_at) "
+                "VALUES (?, ?, ?, ?)",
+                (origin, status, body, expires_at),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class RobotsPolicy:
+    """Per-origin robots.txt rules with an LRU/TTL cache and optional shared store."""
+
+    def __init__(
+        self,
+        *,
+        user_agent: str,
+        store: RobotsStore | None = None,
+        rate_limiter: HostRateLimiter | None = None,
+        ttl: float = 86_400.0,
+        failure_ttl: float = 300.0,
+        max_hosts: int = 1_024,
+        max_crawl_delay: float = 10.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._user_agent = user_agent
+        self._store = store
+        self._rate_limiter = rate_limiter
+        self._ttl = ttl
+        self._failure_ttl = failure_ttl
+        self._max_hosts = max(1, max_hosts)
+        self._max_crawl_delay = max_crawl_delay
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[RobotsRules, float]] = OrderedDict()
+        self._inflight: SingleFlight[RobotsRules] = SingleFlight()
+        self._async_inflight: AsyncSingleFlight[RobotsRules] = AsyncSingleFlight()
+
+    def allows(self, url: str, fetch: Callable[[str], RobotsResponse]) -> bool:
+        """Whether `url` may be fetched; `fetch` retrieves robots.txt on a cache miss."""
+
+        return self._rules(url, fetch).allows(url)
+
+    async def aallows(
+        self, url: str, fetch: Callable[[str], Awaitable[RobotsResponse]]
+    ) -> bool:
+        return (await self._arules(url, fetch)).allows(url)
+
+    def check(self, url: str, fetch: Callable[[str], RobotsResponse]) -> None:
+        """Raise `RobotsDisallowedError` unless `url` may be fetched."""
+
+        self._raise_unless_allowed(url, self._rules(url, fetch))
+
+    async def acheck(self, url: str, fetch: Callable[[str], Awaitable[RobotsResponse]]) -> None:
+        self._raise_unless_allowed(url, await self._arules(url, fetch))
+
+    def _rules(self, url: str, fetch: Callable[[str], RobotsResponse]) -> RobotsRules:
+        origin = _origin(url)
+        rules = self._cached(origin)
+        if rules is None:
+            rules = self._inflight.do(origin, lambda: self._load(origin, fetch(robots_url(url))))
+        return rules
+
+    async def _arules(
+        self, url: str, fetch: Callable[[str], Awaitable[RobotsResponse]]
+    ) -> RobotsRules:
+        origin = _origin(url)
+        rules = self._cached(origin)
+        if rules is None:
+
+            async def load() -> RobotsRules:
+                return self._load(origin, await fetch(robots_url(url)))
+
+            rules = await self._async_inflight.do(origin, load)
+        return rules
+
+    def _raise_unless_allowed(self, url: str, rules: RobotsRules) -> None:
+        if rules.allows(url):
+            return
+        if rules.unreachable:
+            raise RobotsDisallowedError(url, transient=True, retry_after=self._failure_ttl)
+        raise RobotsDisallowedError(url)
+
+    def _cached(self, origin: str) -> RobotsRules | None:
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(origin)
+            if entry is not None:
+                if entry[1] > now:
+                    self._entries.move_to_end(origin)
+                    return entry[0]
+                del self._entries[origin]
+        stored = self._store.get(origin, now) if self._store is not None else None
+        if stored is None:
+            return None
+        status, body, expires_at = stored
+        return self._remember(origin, self._rules_for(status, body), expires_at)
+
+    def _load(self, origin: str, response: RobotsResponse) -> RobotsRules:
+        status, body = response
+        failed = _unreachable(status)
+        expires_at = self._clock() + (self._failure_ttl if failed else self._ttl)
+        body = body if status is not None and 200 <= status < 300 else ""
+        if self._store is not None:
+            self._store.put(origin, status, body, expires_at)
+        return self._remember(origin, self._rules_for(status, body), expires_at)
+
+    def _rules_for(self, status: int | None, body: str) -> RobotsRules:
+        if _unreachable(status):
+            return UNREACHABLE
+        if not body:
+            return ALLOW_ALL
+        return parse_robots(body, self._user_agent)
+
+    def _remember(self, origin: str, rules: RobotsRules, expires_at: float) -> RobotsRules:
+        with self._lock:
+            self._entries[origin] = (rules, expires_at)
+            self._entries.move_to_end(origin)
+            while len(self._entries) > self._max_hosts:
+                self._entries.popitem(last=False)
+        if self._rate_limiter is not None:
+            if rules.crawl_delay:
+                delay = min(rules.crawl_delay, self._max_crawl_delay)
+                self._rate_limiter.throttle(origin, 1.0 / delay)
+            else:
+                self._rate_limiter.unthrottle(origin)
+        return rules
+
+
+def _unreachable(status: int | None) -> bool:
+    return status is None or status == 429 or status >= 500
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
@@ -0,0 +1,139 @@
+"""In-flight request coalescing for the resolver pipeline.
+
+`manager.py` funnels `resolve` calls through a `SingleFlight` keyed on PMID and
+wraps its fetcher in `SingleFlightHtmlFetcher`, keyed on the canonical URL
+(`url_utils.canonicalize_url`).  Concurrent callers asking for the same key
+wait on the one running computation and share its result or exception; once
+it completes the key is forgotten, so later calls start fresh (persistent
+reuse is the job of `cache.py` and `resolution_cache.py`).  The counters are
+served by the API's `/stats` endpoint and logged when a worker process exits.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+from .fetcher import AsyncHtmlFetcher, HtmlFetcher
+from .url_utils import canonicalize_url
+
+
+T = TypeVar("T")
+
+
+@dataclass(slots=True)
+class SingleFlightStats:
+    """Counters describing how much work coalescing avoided."""
+
+    calls: int = 0
+    executions: int = 0
+
+    @property
+    def coalesced(self) -> int:
+        return self.calls - self.executions
+
+    def as_dict(self) -> dict[str, int]:
+        return {"calls": self.calls, "executions": self.executions, "coalesced": self.coalesced}
+
+
+class _Call(Generic[T]):
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: T | None = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight(Generic[T]):
+    """Thread-based single-flight group."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call[T]] = {}
+        self.stats = SingleFlightStats()
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            self.stats.calls += 1
+            existing = self._calls.get(key)
+            if existing is None:
+                call: _Call[T] = _Call()
+                self._calls[key] = call
+                self.stats.executions += 1
+            else:
+                call = existing
+        if existing is not None:
+            call.done.wait()
+        else:
+            try:
+                call.result = fn()
+            except BaseException as exc:
+                call.error = exc
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+        if call.error is not None:
+            raise call.error
+        return call.result  # type: ignore[return-value]
+
+
+class AsyncSingleFlight(Generic[T]):
+    """Asyncio single-flight group; followers never cancel the shared task."""
+
+    def __init__(self) -> None:
+        self._tasks: dict[Hashable, asyncio.Task[T]] = {}
+        self.stats = SingleFlightStats()
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        self.stats.calls += 1
+        task = self._tasks.get(key)
+        if task is None:
+            self.stats.executions += 1
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        return await asyncio.shield(task)
+
+
+class SingleFlightHtmlFetcher(HtmlFetcher):
+    """Collapses concurrent fetches of the same canonical URL."""
+
+    def __init__(self, inner: HtmlFetcher) -> None:
+        self._inner = inner
+        self._group: SingleFlight[str] = SingleFlight()
+
+    @property
+    def stats(self) -> SingleFlightStats:
+        return self._group.stats
+
+    def fetch(self, url: str) -> str:
+        return self._group.do(canonicalize_url(url), lambda: self._inner.fetch(url))
+
+    def close(self) -> None:
+        close_method = getattr(self._inner, "close", None)
+        if callable(close_method):
+            close_method()
+
+
+class AsyncSingleFlightHtmlFetcher(AsyncHtmlFetcher):
+    """Asyncio counterpart of `SingleFlightHtmlFetcher`."""
+
+    def __init__(self, inner: AsyncHtmlFetcher) -> None:
+        self._inner = inner
+        self._group: AsyncSingleFlight[str] = AsyncSingleFlight()
+
+    @property
+    def stats(self) -> SingleFlightStats:
+        return self._group.stats
+
+    async def fetch(self, url: str) -> str:
+        return await self._group.do(canonicalize_url(url), lambda: self._inner.fetch(url))
+
+    async def aclose(self) -> None:
+        close_method = getattr(self._inner, "aclose", None)
+        if callable(close_method):
+            await close_method()
@@ -9,7 +9,7 @@ modules.
 from __future__ import annotations
 
 import re
-from urllib.parse import urlparse
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
 
 from .exceptions import ResolverError
 
@@ -18,6 +18,9 @@ PUBMED_HOST = "pubmed.ncbi.nlm.nih.gov"
 
 
 _PMID_PATTERN = re.compile(r"^/([0-9]+)/?$")
+# The common spellings, matched without the cost of `urlparse`.
+_FAST_PUBMED_URL = re.compile(r"https?://pubmed\.ncbi\.nlm\.nih\.gov/([0-9]+)/?(?:[?#].*)?")
+_DEFAULT_PORTS = {"http": 80, "https": 443}
 
 
 def normalize_pubmed_url(raw_url: str) -> tuple[str, str]:
@@ -26,6 +29,11 @@ def normalize_pubmed_url(raw_url: str) -> tuple[str, str]:
     Returns a tuple of `(normalized_url, pmid)`.
     """
 
+    fast = _FAST_PUBMED_URL.fullmatch(raw_url)
+    if fast:
+        pmid = fast.group(1)
+        return pubmed_article_url(pmid), pmid
+
     parsed = urlparse(raw_url)
     if parsed.netloc != PUBMED_HOST:
         raise ResolverError("URL is not a PubMed article")
@@ -35,6 +43,26 @@ def normalize_pubmed_url(raw_url: str) -> tuple[str, str]:
         raise ResolverError("Cannot extract PMID from URL")
 
     pmid = match.group(1)
-    normalized = f"https://{PUBMED_HOST}/{pmid}/"
-    return normalized, pmid
+    return pubmed_article_url(pmid), pmid
+
+
+def pubmed_article_url(pmid: str) -> str:
+    """Return the canonical PubMed article URL for a PMID."""
+
+    return f"https://{PUBMED_HOST}/{pmid}/"
+
+
+def canonicalize_url(raw_url: str) -> str:
+    """Normalise any URL into a stable cache key.
+
+    Lower-cases scheme and host, drops default ports and fragments, and sorts
+    query parameters so equivalent spellings of a page share one entry.
+    """
 
+    parsed = urlparse(raw_url.strip())
+    scheme = parsed.scheme.lower()
+    host = (parsed.hostname or "").lower()
+    if parsed.port and parsed.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parsed.port}"
+    query = urlencode(sorted(parse_qsl(parsed.query, keep_blank_values=True)))
+    return urlunparse((scheme, host, parsed.path or "/", parsed.params, query, ""))
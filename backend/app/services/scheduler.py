@@ -0,0 +1,196 @@
+"""Weighted-fair sharing of one worker pool between concurrently running jobs.
+
+`app.api.jobs` submits each inline job to the process-wide `FairScheduler`
+started in the app lifespan (`app.main`).  Jobs feed work items into their
+`ScheduledJob` as they become known; a fixed set of worker tasks repeatedly
+picks the job with the lowest virtual pass, runs one of its items and advances
+that job's pass by `1 / weight` (stride scheduling).  A job that joins late
+starts at the current minimum pass, so a single-URL job submitted behind a
+20k-item batch gets the very next free worker instead of waiting for the batch,
+while two bulk jobs share the pool in proportion to their weights.  Items that
+should run again later (transient failures, see `resolver/retry.py`) are put
+back with `ScheduledJob.add_later`, which holds a loop timer rather than a
+worker, and keeps the job open until the timer has fired.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable, Hashable, Iterable
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ScheduledJob:
+    """Per-job work queue and progress, driven by a `FairScheduler`."""
+
+    def __init__(
+        self,
+        scheduler: FairScheduler,
+        key: Hashable,
+        *,
+        weight: float,
+        max_in_flight: int,
+        run: Callable[[Any], Awaitable[None]],
+        start_pass: float,
+    ) -> None:
+        self.key = key
+        self.weight = max(weight, 1e-6)
+        self.max_in_flight = max(1, max_in_flight)
+        self.pass_value = start_pass
+        self.in_flight = 0
+        self.cancelled = False
+        self._scheduler = scheduler
+        self._run = run
+        self._items: deque[Any] = deque()
+        self._closed = False
+        self._delayed: set[asyncio.TimerHandle] = set()
+        self._done = asyncio.Event()
+
+    @property
+    def runnable(self) -> bool:
+        return bool(self._items) and self.in_flight < self.max_in_flight
+
+    def add(self, items: Iterable[Any]) -> None:
+        if self.cancelled or self._closed:
+            return
+        self._items.extend(items)
+        self._scheduler._wake()
+
+    def add_later(self, delay: float, items: Iterable[Any]) -> None:
+        """Add `items` after `delay` seconds, even if the job has been closed since."""
+
+        if self.cancelled:
+            return
+        pending = list(items)
+
+        def fire() -> None:
+            self._delayed.discard(handle)
+            self._items.extend(pending)
+            self._scheduler._wake()
+
+        handle = asyncio.get_running_loop().call_later(max(0.0, delay), fire)
+        self._delayed.add(handle)
+
+    def close(self) -> None:
+        """No more items will be added; the job completes once it drains."""
+
+        self._closed = True
+        self._check_done()
+
+    def cancel(self) -> None:
+        """Drop queued items; items already running are allowed to finish."""
+
+        self.cancelled = True
+        self._items.clear()
+        for handle in self._delayed:
+            handle.cancel()
+        self._delayed.clear()
+        self.close()
+
+    async def wait(self) -> None:
+        await self._done.wait()
+
+    def _take(self) -> Any:
+        self.in_flight += 1
+        self.pass_value += 1.0 / self.weight
+        return self._items.popleft()
+
+    def _finished_one(self) -> None:
+        self.in_flight -= 1
+        self._check_done()
+
+    def _check_done(self) -> None:
+        if self._done.is_set() or not self._closed:
+            return
+        if not self._items and not self._delayed and self.in_flight == 0:
+            self._done.set()
+            self._scheduler._forget(self)
+
+
+class FairScheduler:
+    """Fixed pool of asyncio workers shared fairly between `ScheduledJob`s."""
+
+    def __init__(self, *, workers: int) -> None:
+        self._worker_count = max(1, workers)
+        self._jobs: dict[Hashable, ScheduledJob] = {}
+        self._workers: list[asyncio.Task[None]] = []
+        self._changed: asyncio.Event | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def started(self) -> bool:
+        return bool(self._workers)
+
+    def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._workers and self._loop is loop:
+            return
+        # Worker tasks belong to one event loop; a new loop gets a fresh pool.
+        self._loop = loop
+        self._changed = asyncio.Event()
+        self._workers = [
+            asyncio.create_task(self._work()) for _ in range(self._worker_count)
+        ]
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def submit(
+        self,
+        key: Hashable,
+        *,
+        run: Callable[[Any], Awaitable[None]],
+        weight: float = 1.0,
+        max_in_flight: int = 1,
+    ) -> ScheduledJob:
+        """Register a job whose items are passed to `run`, at most `max_in_flight` at once."""
+
+        self.start()
+        start_pass = min((job.pass_value for job in self._jobs.values()), default=0.0)
+        job = ScheduledJob(
+            self, key, weight=weight, max_in_flight=max_in_flight, run=run, start_pass=start_pass
+        )
+        self._jobs[key] = job
+        return job
+
+    def get(self, key: Hashable) -> ScheduledJob | None:
+        return self._jobs.get(key)
+
+    def _wake(self) -> None:
+        if self._changed is not None:
+            self._changed.set()
+
+    def _forget(self, job: ScheduledJob) -> None:
+        if self._jobs.get(job.key) is job:
+            del self._jobs[job.key]
+
+    def _next(self) -> ScheduledJob | None:
+        runnable = [job for job in self._jobs.values() if job.runnable]
+        return min(runnable, key=lambda job: job.pass_value, default=None)
+
+    async def _work(self) -> None:
+        assert self._changed is not None
+        while True:
+            job = self._next()
+            if job is None:
+                self._changed.clear()
+                await self._changed.wait()
+                continue
+            item = job._take()
+            try:
+                await job._run(item)
+            except Exception:
+                # `run` records its own failures; anything escaping it is a bug,
+                # but must not take the worker down with it.
+                _LOGGER.exception("Scheduled item of job %r failed", job.key)
+            finally:
+                job._finished_one()
+                # A slot freed up under this job's in-flight cap.
+                self._wake()
@@ -0,0 +1,24 @@
+"""PubMed query search feeding query-driven jobs.
+
+`app.api.jobs` turns a `JobCreate.query` into job items by iterating
+`PubmedSearchClient.iter_pmids`, which pages through E-utilities `esearch`
+results using the server-side history (WebEnv/query_key) and yields PMIDs one
+batch at a time so resolution can start before the search has finished.
+`StaticSearchClient` is the offline stand-in used in mock mode.
+"""
+
+from .client import (
+    EUTILS_BASE_URL,
+    PmidSearcher,
+    PubmedSearchClient,
+    SearchError,
+    StaticSearchClient,
+)
+
+__all__ = [
+    "EUTILS_BASE_URL",
+    "PmidSearcher",
+    "PubmedSearchClient",
+    "SearchError",
+    "StaticSearchClient",
+]
@@ -0,0 +1,115 @@
+"""E-utilities `esearch` client with history-server paging.
+
+The first request runs the query with `usehistory=y`, which returns the total
+hit count, the first page of PMIDs and a `WebEnv`/`query_key` cursor.  Later
+pages are read from that stored result set with `retstart`, so NCBI never has
+to re-run the query and every page sees the same snapshot.  Requests go
+through the resolver's `HostRateLimiter`, sharing the NCBI budget with the
+page fetches of jobs already running.
+"""
+
+from __future__ import annotations
+
+from contextlib import nullcontext
+from typing import AsyncIterator, Mapping, Protocol, Sequence
+
+import httpx
+
+from ..resolver.rate_limit import HostRateLimiter
+
+
+EUTILS_BASE_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/"
+
+
+class SearchError(Exception):
+    """Raised when the search backend rejects a query or returns garbage."""
+
+
+class PmidSearcher(Protocol):
+    def iter_pmids(self, query: str, *, max_results: int) -> AsyncIterator[list[str]]:
+        """Yield batches of PMIDs matching `query`, at most `max_results` in total."""
+        ...
+
+
+class StaticSearchClient(PmidSearcher):
+    """Answers queries from a fixed query → PMIDs mapping."""
+
+    def __init__(self, results: Mapping[str, Sequence[str]], *, batch_size: int = 500) -> None:
+        self._results = {query: list(pmids) for query, pmids in results.items()}
+        self._batch_size = max(1, batch_size)
+
+    async def iter_pmids(self, query: str, *, max_results: int) -> AsyncIterator[list[str]]:
+        pmids = self._results.get(query, [])[:max_results]
+        for start in range(0, len(pmids), self._batch_size):
+            yield pmids[start : start + self._batch_size]
+
+
+class PubmedSearchClient(PmidSearcher):
+    """Pages through PubMed `esearch` results via the history server."""
+
+    def __init__(
+        self,
+        *,
+        base_url: str = EUTILS_BASE_URL,
+        batch_size: int = 5_000,
+        timeout: float,
+        user_agent: str,
+        tool: str | None = None,
+        email: str | None = None,
+        api_key: str | None = None,
+        rate_limiter: HostRateLimiter | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self._url = base_url.rstrip("/") + "/esearch.fcgi"
+        # esearch refuses retmax above 10,000.
+        self._batch_size = max(1, min(batch_size, 10_000))
+        self._params = {"db": "pubmed", "retmode": "json"}
+        for name, value in (("tool", tool), ("email", email), ("api_key", api_key)):
+            if value:
+                self._params[name] = value
+        self._rate_limiter = rate_limiter
+        self._client = httpx.AsyncClient(
+            timeout=timeout,
+            headers={"User-Agent": user_agent},
+            follow_redirects=True,
+            transport=transport,
+        )
+
+    async def iter_pmids(self, query: str, *, max_results: int) -> AsyncIterator[list[str]]:
+        result = await self._esearch(
+            term=query, usehistory="y", retstart=0, retmax=min(self._batch_size, max_results)
+        )
+        total = min(int(result.get("count", 0)), max_results)
+        cursor = {"WebEnv": result.get("webenv"), "query_key": result.get("querykey")}
+        pmids = result.get("idlist", [])[:total]
+        seen = 0
+        while pmids:
+            yield pmids
+            seen += len(pmids)
+            if seen >= total:
+                return
+            if not cursor["WebEnv"] or not cursor["query_key"]:
+                raise SearchError("esearch did not return a history cursor")
+            result = await self._esearch(
+                **cursor, retstart=seen, retmax=min(self._batch_size, total - seen)
+            )
+            pmids = result.get("idlist", [])[: total - seen]
+
+    async def _esearch(self, **params: object) -> dict:
+        limit = self._rate_limiter.alimit(self._url) if self._rate_limiter else nullcontext()
+        async with limit:
+            try:
+                response = await self._client.get(self._url, params={**self._params, **params})
+                response.raise_for_status()
+                payload = response.json()
+            except (httpx.HTTPError, ValueError) as exc:
+                raise SearchError(f"esearch request failed: {exc}") from exc
+        result = payload.get("esearchresult")
+        if not isinstance(result, dict):
+            raise SearchError("esearch response is missing 'esearchresult'")
+        if "ERROR" in result:
+            raise SearchError(str(result["ERROR"]))
+        return result
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
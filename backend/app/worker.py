@@ -0,0 +1,362 @@
+"""Queue worker processes: `python -m app.worker [--processes N] [--concurrency C]`.
+
+Runs the item-level half of the job pipeline outside the API when
+`jobs_dispatch = "queue"`.  Each process keeps up to `--concurrency` tasks in
+flight: it leases tasks from the `TaskQueue` for its free slots (lowest rank
+first, which interleaves jobs by priority), looks up their PMC IDs, and refills
+a slot as soon as its task finishes, so one slow item never holds up the next
+lease.  Finished tasks are acked only after the jobs repository has been
+flushed, so an item is never acknowledged before its result is durable.
+Queue and repository calls are blocking SQLite work and run in threads.  The
+leases of running tasks are renewed every third of the visibility timeout, so
+a slow task is not handed to a second worker.
+
+A `finish` task, queued after a job's last item, sets the final job state once
+no item is pending and is otherwise put back for later; it also releases the
+job's retry budget.  Tasks of cancelled jobs are acked unrun.  An item that
+failed transiently is released back to the queue with the backoff its
+`RetryPolicy` chose (`services/resolver/retry.py`), so the process moves on to
+other work while the item waits; such releases do not count against
+`queue_max_attempts`, which only guards against deliveries whose lease was
+lost.
+
+Every process gets its own resolver, so the configured per-host request rates
+are divided between processes to keep the fleet inside the same budget.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import signal
+from contextlib import suppress
+
+from .api.jobs import (
+    build_downloader,
+    build_jobs_repo,
+    build_retry_policy,
+    build_task_queue,
+    finish_job,
+    lookup_pmc_ids,
+    process_item,
+    resolver_config,
+)
+from .api.schemas.jobs import JobItemStatus, JobState
+from .core.config import get_settings
+from .repositories.jobs_repo import JobsRepository
+from .services.download import PdfDownloader
+from .services.queue import LeasedTask, TaskQueue
+from .services.resolver import (
+    AsyncPubmedResolverManager,
+    ResolverConfig,
+    build_default_async_resolver,
+    build_rate_limiter,
+)
+from .services.resolver.retry import RetryPolicy
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class Worker:
+    """Leases tasks from a queue and runs them against the jobs repository."""
+
+    def __init__(
+        self,
+        *,
+        repo: JobsRepository,
+        queue: TaskQueue,
+        resolver: AsyncPubmedResolverManager,
+        concurrency: int,
+        visibility_timeout: float,
+        max_attempts: int,
+        retry_delay: float = 1.0,
+        downloader: PdfDownloader | None = None,
+        retry_policy: RetryPolicy | None = None,
+    ) -> None:
+        self._repo = repo
+        self._downloader = downloader
+        self._retry_policy = retry_policy
+        self._queue = queue
+        self._resolver = resolver
+        self._concurrency = max(1, concurrency)
+        self._visibility_timeout = visibility_timeout
+        self._max_attempts = max_attempts
+        self._retry_delay = retry_delay
+        self._started_jobs: set[str] = set()
+        self._running: dict[asyncio.Task[float | None], LeasedTask] = {}
+
+    async def run(self, stop: asyncio.Event, *, poll_interval: float) -> None:
+        """Keep up to `concurrency` tasks in flight until `stop` is set, then drain."""
+
+        heartbeat = asyncio.create_task(self._keep_leased())
+        try:
+            while not stop.is_set():
+                leased = await self._lease()
+                if self._running:
+                    # Free slots are refilled as soon as anything finishes, or
+                    # after `poll_interval` when new work may have been queued.
+                    full = len(self._running) >= self._concurrency
+                    await self._settle(timeout=None if full else poll_interval)
+                elif not leased:
+                    with suppress(asyncio.TimeoutError):
+                        await asyncio.wait_for(stop.wait(), poll_interval)
+            while self._running:
+                await self._settle()
+        finally:
+            await _cancel(heartbeat)
+
+    async def run_once(self) -> int:
+        """Lease one batch and run it to completion; returns the number of tasks leased."""
+
+        leased = await self._lease()
+        if not leased:
+            return 0
+        heartbeat = asyncio.create_task(self._keep_leased())
+        try:
+            while self._running:
+                await self._settle()
+        finally:
+            await _cancel(heartbeat)
+        return leased
+
+    async def _lease(self) -> int:
+        """Lease tasks for the free slots and start them; returns how many."""
+
+        free = self._concurrency - len(self._running)
+        if free <= 0:
+            return 0
+        tasks = await asyncio.to_thread(
+            self._queue.lease, limit=free, visibility_timeout=self._visibility_timeout
+        )
+        if not tasks:
+            return 0
+        states = await asyncio.to_thread(
+            self._states, {task.payload["job_id"] for task in tasks}
+        )
+        pmc_ids = await lookup_pmc_ids(
+            self._resolver,
+            (
+                task.payload["url"]
+                for task in tasks
+                if task.payload["kind"] == "item"
+                and states[task.payload["job_id"]] not in (None, JobState.cancelled.value)
+            ),
+        )
+        for task in tasks:
+            self._running[asyncio.create_task(self._handle(task, pmc_ids, states))] = task
+        return len(tasks)
+
+    async def _settle(self, *, timeout: float | None = None) -> None:
+        """Wait for running tasks to finish, then flush and ack or release them."""
+
+        done, _ = await asyncio.wait(
+            self._running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+        )
+        outcomes: list[tuple[LeasedTask, float | None]] = []
+        for running in done:
+            task = self._running.pop(running)
+            try:
+                outcomes.append((task, running.result()))
+            except Exception:
+                _LOGGER.exception("Task %s failed; releasing it", task.id)
+                outcomes.append((task, self._retry_delay))
+        if outcomes:
+            await asyncio.to_thread(self._complete, outcomes)
+
+    def _complete(self, outcomes: list[tuple[LeasedTask, float | None]]) -> None:
+        # Results become durable before any task is acked.
+        flush = getattr(self._repo, "flush", None)
+        if callable(flush):
+            flush()
+        for task, delay in outcomes:
+            if delay is None:
+                self._queue.ack(task)
+            else:
+                self._queue.release(task, delay=delay)
+
+    def _states(self, job_ids: set[str]) -> dict[str, str | None]:
+        return {job_id: self._repo.state(job_id) for job_id in job_ids}
+
+    async def _handle(
+        self, task: LeasedTask, pmc_ids: dict[str, str], states: dict[str, str | None]
+    ) -> float | None:
+        """Run one task; returns None to ack it or the delay before it is retried."""
+
+        payload = task.payload
+        job_id = payload["job_id"]
+        dropped = states.get(job_id) in (None, JobState.cancelled.value)
+        if payload["kind"] == "finish":
+            source_failed = payload.get("source_failed", False)
+            if not dropped and not await asyncio.to_thread(
+                finish_job, job_id, self._repo, source_failed=source_failed
+            ):
+                return self._retry_delay
+            if self._retry_policy is not None:
+                self._retry_policy.forget(job_id)
+            return None
+        if dropped:
+            # Cancelled (or unknown) jobs drop their remaining tasks.
+            return None
+        current = await asyncio.to_thread(
+            self._repo.page_items, job_id, start=payload["index"], limit=1
+        )
+        if not current or current[0].index != payload["index"]:
+            return None
+        item = current[0]
+        if item.status != JobItemStatus.pending.value:
+            # Already recorded by an earlier delivery whose ack was lost.
+            return None
+        # Deliveries this worker released on purpose are retries the retry
+        # policy accounts for; only lost leases count against `max_attempts`.
+        if task.attempts - task.releases > self._max_attempts:
+            await asyncio.to_thread(
+                self._repo.update_item,
+                job_id,
+                item.index,
+                status=JobItemStatus.failed.value,
+                reason=f"Gave up after {self._max_attempts} attempts",
+            )
+            return None
+        await asyncio.to_thread(self._mark_running, job_id)
+        return await process_item(
+            job_id,
+            item,
+            self._repo,
+            self._resolver,
+            pmc_ids.get(item.url),
+            downloader=self._downloader,
+            retry_policy=self._retry_policy,
+            attempt=task.attempts,
+        )
+
+    async def _keep_leased(self) -> None:
+        # Retries, robots checks and rate-limit waits can outlast the
+        # visibility timeout; renew the leases so no other worker picks a
+        # task up while it is still running.
+        while True:
+            await asyncio.sleep(self._visibility_timeout / 3)
+            tasks = list(self._running.values())
+            await asyncio.to_thread(self._extend, tasks)
+
+    def _extend(self, tasks: list[LeasedTask]) -> None:
+        for task in tasks:
+            self._queue.extend(task, visibility_timeout=self._visibility_timeout)
+
+    def _mark_running(self, job_id: str) -> None:
+        if job_id in self._started_jobs:
+            return
+        self._started_jobs.add(job_id)
+        summary = self._repo.summary(job_id)
+        if summary is not None and summary.state == JobState.queued.value:
+            self._repo.set_state(job_id, JobState.running.value)
+
+
+async def _cancel(task: asyncio.Task) -> None:
+    task.cancel()
+    with suppress(asyncio.CancelledError):
+        await task
+
+
+def _process_resolver_config(processes: int) -> ResolverConfig:
+    # Each process gets its share of the per-host rates.
+    config = resolver_config()
+    overrides = config.host_rate_overrides or {}
+    return config._replace(
+        host_requests_per_second=config.host_requests_per_second / processes,
+        host_rate_overrides={domain: rate / processes for domain, rate in overrides.items()},
+    )
+
+
+async def _serve(concurrency: int, processes: int) -> None:
+    settings = get_settings()
+    queue = build_task_queue()
+    if queue is None:
+        raise SystemExit("Set jobs_dispatch=queue to run queue workers")
+    repo = build_jobs_repo()
+    config = _process_resolver_config(processes)
+    # Page fetches and PDF downloads draw from the same per-host budget.
+    rate_limiter = build_rate_limiter(config)
+    resolver = build_default_async_resolver(config=config, rate_limiter=rate_limiter)
+    downloader = build_downloader(rate_limiter)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+    worker = Worker(
+        repo=repo,
+        queue=queue,
+        resolver=resolver,
+        concurrency=concurrency,
+        visibility_timeout=settings.queue_visibility_timeout_seconds,
+        max_attempts=settings.queue_max_attempts,
+        retry_delay=settings.worker_poll_seconds,
+        downloader=downloader,
+        retry_policy=build_retry_policy(),
+    )
+    try:
+        await worker.run(stop, poll_interval=settings.worker_poll_seconds)
+    finally:
+        _log_coalescing(resolver)
+        await resolver.aclose()
+        if downloader is not None:
+            await downloader.aclose()
+        for resource in (repo, queue):
+            close = getattr(resource, "close", None)
+            if callable(close):
+                close()
+
+
+def _log_coalescing(resolver: AsyncPubmedResolverManager) -> None:
+    resolve = resolver.inflight_stats
+    fetch = resolver.fetch_inflight_stats
+    _LOGGER.info(
+        "Coalesced %d of %d resolutions and %d of %d page fetches",
+        resolve.coalesced,
+        resolve.calls,
+        fetch.coalesced if fetch is not None else 0,
+        fetch.calls if fetch is not None else 0,
+    )
+
+
+def _run_process(concurrency: int, processes: int) -> None:
+    asyncio.run(_serve(concurrency, processes))
+
+
+def main(argv: list[str] | None = None) -> None:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Resolve queued job items.")
+    parser.add_argument("--processes", type=int, default=settings.worker_processes)
+    parser.add_argument("--concurrency", type=int, default=settings.worker_concurrency)
+    args = parser.parse_args(argv)
+    processes = max(1, args.processes)
+    if processes == 1:
+        _run_process(args.concurrency, processes)
+        return
+    context = multiprocessing.get_context("spawn")
+    children = [
+        context.Process(
+            target=_run_process, args=(args.concurrency, processes), name=f"worker-{number}"
+        )
+        for number in range(processes)
+    ]
+    for child in children:
+        child.start()
+
+    def stop_children(_signum: int, _frame: object) -> None:
+        # terminate() delivers SIGTERM, which each child handles gracefully.
+        for child in children:
+            if child.is_alive():
+                child.terminate()
+
+    signal.signal(signal.SIGTERM, stop_children)
+    # Ctrl-C reaches the whole process group, so children stop on their own.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    for child in children:
+        child.join()
+
+
+if __name__ == "__main__":
+    main()
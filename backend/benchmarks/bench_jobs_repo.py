@@ -0,0 +1,61 @@
+"""Show that `InMemoryJobsRepository.update_item` cost does not grow with job size.
+
+Run from `backend/` with `python -m benchmarks.bench_jobs_repo`.  For each job
+size, every item of every job is updated once, first for a single job and then
+for several jobs updated from concurrent threads (one per job).  With items
+addressed by index and one lock per job, the per-update cost should stay flat
+from 1k to 100k items.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+from app.repositories.jobs_repo import InMemoryJobsRepository
+
+
+SIZES = (1_000, 10_000, 100_000)
+CONCURRENT_JOBS = 8
+
+
+def _update_all(repo: InMemoryJobsRepository, job_id: str, size: int) -> None:
+    for index in range(size):
+        repo.update_item(job_id, index, status="resolved", pdf_url="https://example.org/a.pdf")
+
+
+def bench_single(size: int) -> float:
+    repo = InMemoryJobsRepository()
+    record = repo.create([f"https://pubmed.ncbi.nlm.nih.gov/{n}/" for n in range(size)])
+    start = time.perf_counter()
+    _update_all(repo, record.id, size)
+    return (time.perf_counter() - start) / size
+
+
+def bench_concurrent(size: int, jobs: int = CONCURRENT_JOBS) -> float:
+    repo = InMemoryJobsRepository()
+    urls = [f"https://pubmed.ncbi.nlm.nih.gov/{n}/" for n in range(size)]
+    job_ids = [repo.create(urls).id for _ in range(jobs)]
+    threads = [
+        threading.Thread(target=_update_all, args=(repo, job_id, size)) for job_id in job_ids
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return (time.perf_counter() - start) / (size * jobs)
+
+
+def main() -> None:
+    for size in SIZES:
+        single = bench_single(size)
+        concurrent = bench_concurrent(size)
+        print(
+            f"{size:>7} items: {single * 1e6:6.3f} us/update (1 job), "
+            f"{concurrent * 1e6:6.3f} us/update ({CONCURRENT_JOBS} jobs, threads)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Compare the HTML backends on a PubMed-sized page.
+
+Run from `backend/` with `python -m benchmarks.bench_parsers`.  The synthetic
+page pads the PMC fixture with a few hundred KB of article markup, which is
+roughly what real PubMed pages weigh.
+"""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+from app.services.resolver import pmc
+from app.services.resolver.html_backends import SoupBackend, get_html_backend
+from app.services.resolver.html_parser import PubmedPageParser
+
+
+FIXTURE = Path(__file__).resolve().parents[1] / "tests" / "fixtures" / "pubmed_pmc_article.html"
+PADDING = "".join(
+    f"<div class='ref'><p>Reference {n} <a href='/ref/{n}'>link</a></p></div>" for n in range(4000)
+)
+ROUNDS = 20
+
+
+def _page() -> str:
+    html = FIXTURE.read_text(encoding="utf-8")
+    return html.replace("</body>", PADDING + "</body>")
+
+
+def _time(fn) -> float:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        fn()
+    return (time.perf_counter() - start) / ROUNDS
+
+
+def main() -> None:
+    html = _page()
+    print(f"page size: {len(html) / 1024:.0f} KB")
+    for backend in (SoupBackend(), get_html_backend("auto")):
+        parser = PubmedPageParser(backend)
+        full = _time(lambda: parser.parse(html, pmid="12345678"))
+        links = _time(
+            lambda: pmc._build_result(backend.parse(html, links_only=True), base_url="https://x/")
+        )
+        print(f"{backend.name:>10}: pubmed parse {full * 1e3:7.2f} ms | pmc links {links * 1e3:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,11 @@
 from __future__ import annotations
 
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
+from typing import Iterator
+from urllib.parse import parse_qs, urlsplit
 
 import pytest
 
@@ -27,3 +32,110 @@ def pubmed_external_html() -> str:
 def external_pdf_html() -> str:
     return (FIXTURES / "external_pdf_article.html").read_text(encoding="utf-8")
 
+
+@pytest.fixture
+def idconv_server() -> Iterator[_FakeIdConverterServer]:
+    """A local stand-in for the NCBI ID Converter API."""
+
+    yield from _serve(_FakeIdConverterServer())
+
+
+@pytest.fixture
+def esearch_server() -> Iterator[_FakeEsearchServer]:
+    """A local stand-in for E-utilities `esearch` with history paging."""
+
+    yield from _serve(_FakeEsearchServer())
+
+
+def _serve(server: _FakeJsonServer) -> Iterator:
+    thread = threading.Thread(target=server.httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.httpd.shutdown()
+        server.httpd.server_close()
+
+
+class _FakeJsonServer:
+    path = "/"
+
+    def __init__(self) -> None:
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                query = parse_qs(urlsplit(self.path).query)
+                status, payload = fake.respond({key: values[0] for key, values in query.items()})
+                if payload is None:
+                    self.send_error(status)
+                    return
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}/"
+        self.url = self.base_url + self.path.lstrip("/")
+
+    def respond(self, query: dict[str, str]) -> tuple[int, dict | None]:
+        raise NotImplementedError
+
+
+class _FakeIdConverterServer(_FakeJsonServer):
+    path = "/idconv/"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.pmc_ids: dict[str, str] = {}
+        self.requests: list[list[str]] = []
+        self.failing_ids: set[str] = set()
+
+    def respond(self, query: dict[str, str]) -> tuple[int, dict | None]:
+        ids = query["ids"].split(",")
+        self.requests.append(ids)
+        if self.failing_ids.intersection(ids):
+            return 500, None
+        records = [
+            {"pmid": pmid, "pmcid": f"PMC{self.pmc_ids[pmid]}"}
+            if pmid in self.pmc_ids
+            else {"pmid": pmid, "status": "error", "errmsg": "invalid article id"}
+            for pmid in ids
+        ]
+        return 200, {"status": "ok", "records": records}
+
+
+class _FakeEsearchServer(_FakeJsonServer):
+    path = "/esearch.fcgi"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.results: dict[str, list[str]] = {}
+        self.requests: list[dict[str, str]] = []
+        self._histories: dict[str, list[str]] = {}
+
+    def respond(self, query: dict[str, str]) -> tuple[int, dict | None]:
+        self.requests.append(query)
+        start, size = int(query.get("retstart", 0)), int(query.get("retmax", 20))
+        if "term" in query:
+            pmids = self.results.get(query["term"], [])
+            webenv = f"WEBENV_{len(self._histories)}"
+            self._histories[webenv] = pmids
+        else:
+            webenv = query["WebEnv"]
+            pmids = self._histories[webenv]
+        return 200, {
+            "esearchresult": {
+                "count": str(len(pmids)),
+                "retstart": str(start),
+                "idlist": pmids[start : start + size],
+                "webenv": webenv,
+                "querykey": "1",
+            }
+        }
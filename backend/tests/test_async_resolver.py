@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.services.resolver.fetcher import AsyncHtmlFetcher
+from app.services.resolver.manager import AsyncPubmedResolverManager
+from app.services.resolver.results import ResolutionSource
+
+
+class AsyncStubFetcher(AsyncHtmlFetcher):
+    def __init__(self, responses: dict[str, str], *, delay: float = 0.0) -> None:
+        self._responses = responses
+        self._delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def fetch(self, url: str) -> str:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self._delay)
+            return self._responses[url]
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.mark.asyncio
+async def test_async_resolver_prefers_pmc(pubmed_pmc_html: str, pmc_pdf_html: str) -> None:
+    fetcher = AsyncStubFetcher(
+        {
+            "https://pubmed.ncbi.nlm.nih.gov/12345678/": pubmed_pmc_html,
+            "https://pmc.ncbi.nlm.nih.gov/articles/PMC7654321/": pmc_pdf_html,
+        }
+    )
+    resolver = AsyncPubmedResolverManager(html_fetcher=fetcher)
+
+    result = await resolver.resolve("https://pubmed.ncbi.nlm.nih.gov/12345678/")
+
+    assert result.pdf_url == "https://pmc.ncbi.nlm.nih.gov/articles/PMC7654321/pdf/sample.pdf"
+    assert result.source == ResolutionSource.pmc
+
+
+@pytest.mark.asyncio
+async def test_async_resolver_falls_back_to_external(
+    pubmed_external_html: str, external_pdf_html: str
+) -> None:
+    fetcher = AsyncStubFetcher(
+        {
+            "https://pubmed.ncbi.nlm.nih.gov/22223333/": pubmed_external_html,
+            "https://journals.example.com/article": external_pdf_html,
+        }
+    )
+    resolver = AsyncPubmedResolverManager(html_fetcher=fetcher)
+
+    result = await resolver.resolve("https://pubmed.ncbi.nlm.nih.gov/22223333/")
+
+    assert result.pdf_url == "https://journals.example.com/pdfs/download.pdf"
+    assert result.source == ResolutionSource.external
+
+
+@pytest.mark.asyncio
+async def test_async_resolver_overlaps_resolutions() -> None:
+    responses = {
+        f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/": "<html><body>No links</body></html>"
+        for pmid in range(100, 150)
+    }
+    fetcher = AsyncStubFetcher(responses, delay=0.01)
+    resolver = AsyncPubmedResolverManager(html_fetcher=fetcher)
+
+    results = await asyncio.gather(*(resolver.resolve(url) for url in responses))
+
+    assert all(result.reason == "No PDF source discovered" for result in results)
+    assert fetcher.max_in_flight == len(responses)
+
+
+_MIXED_PUBMED_PAGE = (
+    "<html><body><div class='full-text-links'>"
+    "<a href='https://pmc.ncbi.nlm.nih.gov/articles/PMC7654321/'>Free PMC article</a>"
+    "<a href='https://journals.example.com/article'>Journal Site</a>"
+    "</div></body></html>"
+)
+
+
+class SlowUrlFetcher(AsyncStubFetcher):
+    def __init__(self, responses: dict[str, str], delays: dict[str, float]) -> None:
+        super().__init__(responses)
+        self._delays = delays
+        self.cancelled: list[str] = []
+
+    async def fetch(self, url: str) -> str:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self._delays.get(url, 0.0))
+        except asyncio.CancelledError:
+            self.cancelled.append(url)
+            raise
+        finally:
+            self.in_flight -= 1
+        return self._responses[url]
+
+
+@pytest.mark.asyncio
+async def test_racing_runs_external_alongside_empty_pmc(external_pdf_html: str) -> None:
+    fetcher = SlowUrlFetcher(
+        {
+            "https://pubmed.ncbi.nlm.nih.gov/31/": _MIXED_PUBMED_PAGE,
+            "https://pmc.ncbi.nlm.nih.gov/articles/PMC7654321/": "<html>No PDF here</html>",
+            "https://journals.example.com/article": external_pdf_html,
+        },
+        {
+            "https://pmc.ncbi.nlm.nih.gov/articles/PMC7654321/": 0.05,
+            "https://journals.example.com/article": 0.05,
+        },
+    )
+    resolver = AsyncPubmedResolverManager(html_fetcher=fetcher, race_branches=True)
+
+    result = await resolver.resolve("https://pubmed.ncbi.nlm.nih.gov/31/")
+
+    assert result.pdf_url == "https://journals.example.com/pdfs/download.pdf"
+    assert result.source == ResolutionSource.external
+    assert fetcher.max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_racing_prefers_pmc_and_cancels_external(
+    pmc_pdf_html: str, external_pdf_html: str
+) -> None:
+    fetcher = SlowUrlFetcher(
+        {
+            "https://pubmed.ncbi.nlm.nih.gov/32/": _MIXED_PUBMED_PAGE,
+            "https://pmc.ncbi.nlm.nih.gov/articles/PMC7654321/": pmc_pdf_html,
+            "https://journals.example.com/article": external_pdf_html,
+        },
+        {
+            "https://pmc.ncbi.nlm.nih.gov/articles/PMC7654321/": 0.02,
+            "https://journals.example.com/article": 5.0,
+        },
+    )
+    resolver = AsyncPubmedResolverManager(html_fetcher=fetcher, race_branches=True)
+
+    result = await asyncio.wait_for(resolver.resolve("https://pubmed.ncbi.nlm.nih.gov/32/"), 1)
+    await asyncio.sleep(0)
+
+    assert result.source == ResolutionSource.pmc
+    assert fetcher.cancelled == ["https://journals.example.com/article"]
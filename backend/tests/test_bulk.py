@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from typing import AsyncIterator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import jobs
+from app.api.bulk import iter_bulk_batches
+from app.main import app
+from app.repositories.jobs_repo import InMemoryJobsRepository
+
+
+async def _chunks(*parts: bytes) -> AsyncIterator[bytes]:
+    for part in parts:
+        yield part
+
+
+@pytest.mark.asyncio
+async def test_lines_split_across_chunks_are_reassembled() -> None:
+    body = "12345\nhttps://pubmed.ncbi.nlm.nih.gov/678/\n\nnot a pmid ✓\n910".encode()
+    parts = [body[:3], body[3:20], body[20:50], body[50:], b""]
+
+    batches = [
+        batch async for batch in iter_bulk_batches(_chunks(*parts), ndjson=False, batch_size=2)
+    ]
+
+    assert [batch.urls for batch in batches] == [
+        ["https://pubmed.ncbi.nlm.nih.gov/12345/", "https://pubmed.ncbi.nlm.nih.gov/678/"],
+        ["https://pubmed.ncbi.nlm.nih.gov/910/"],
+    ]
+    assert [batch.rejected for batch in batches] == [
+        [],
+        [(4, "URL is not a PubMed article")],
+    ]
+
+
+def _post(body: str, content_type: str, monkeypatch: pytest.MonkeyPatch):
+    repo = InMemoryJobsRepository()
+    started: list[str] = []
+
+    async def fake_resolve_job(job_id, *args, **options) -> None:
+        started.append(job_id)
+
+    monkeypatch.setattr(jobs, "_resolve_job", fake_resolve_job)
+    app.dependency_overrides[jobs.get_jobs_repo] = lambda: repo
+    try:
+        response = TestClient(app).post(
+            "/jobs/bulk", content=body.encode(), headers={"Content-Type": content_type}
+        )
+    finally:
+        app.dependency_overrides.clear()
+    return response, repo, started
+
+
+def test_bulk_ndjson_creates_job_and_reports_bad_lines(monkeypatch: pytest.MonkeyPatch) -> None:
+    body = "\n".join(
+        [
+            '"https://pubmed.ncbi.nlm.nih.gov/1/"',
+            "2",
+            '{"pmid": "3"}',
+            '{"url": "https://pubmed.ncbi.nlm.nih.gov/4/?from=search"}',
+            "{broken",
+            "null",
+        ]
+    )
+
+    response, repo, started = _post(body, "application/x-ndjson", monkeypatch)
+
+    assert response.status_code == 201
+    payload = response.json()
+    assert payload["accepted"] == 4
+    assert payload["rejected_total"] == 2
+    assert payload["rejected"] == [
+        {"line": 5, "reason": "Invalid JSON"},
+        {"line": 6, "reason": "Expected a PubMed URL or PMID"},
+    ]
+    assert started == [payload["id"]]
+    assert [item.url for item in repo.list_items(payload["id"])] == [
+        f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/" for pmid in range(1, 5)
+    ]
+
+
+def test_bulk_rejects_bodies_without_usable_lines(monkeypatch: pytest.MonkeyPatch) -> None:
+    empty, _, started = _post("https://example.com/\n", "text/plain", monkeypatch)
+    wrong_type, _, _ = _post("1\n", "application/json", monkeypatch)
+
+    assert empty.status_code == 422
+    assert empty.json()["detail"]["rejected"] == [
+        {"line": 1, "reason": "URL is not a PubMed article"}
+    ]
+    assert started == []
+    assert wrong_type.status_code == 415
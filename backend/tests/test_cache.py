@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import httpx
+
+from app.services.resolver.cache import CachingHtmlFetcher, ResponseCacheStore
+from app.services.resolver.fetcher import HttpxHtmlFetcher, MockHtmlFetcher
+from app.services.resolver.url_utils import canonicalize_url
+
+
+def test_canonicalize_url_collapses_equivalent_spellings() -> None:
+    assert canonicalize_url("HTTPS://Example.com:443/a?b=2&a=1#frag") == (
+        "https://example.com/a?a=1&b=2"
+    )
+    assert canonicalize_url("http://example.com:8080") == "http://example.com:8080/"
+
+
+def test_cache_serves_fresh_entries_without_refetching(tmp_path: Path) -> None:
+    url = "https://pubmed.ncbi.nlm.nih.gov/1/"
+    inner = MockHtmlFetcher({url: "<html>one</html>"})
+    store = ResponseCacheStore(tmp_path, max_bytes=1024 * 1024)
+    fetcher = CachingHtmlFetcher(inner, store, ttl=60)
+
+    assert fetcher.fetch(url) == "<html>one</html>"
+    inner._responses.clear()
+
+    assert fetcher.fetch("https://PUBMED.ncbi.nlm.nih.gov/1/#abstract") == "<html>one</html>"
+
+
+def test_cache_revalidates_expired_entries(tmp_path: Path) -> None:
+    seen_headers: list[httpx.Headers] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_headers.append(request.headers)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304, headers={"ETag": '"v1"'})
+        return httpx.Response(200, text="<html>body</html>", headers={"ETag": '"v1"'})
+
+    inner = HttpxHtmlFetcher(
+        timeout=1.0, retries=0, user_agent="test", transport=httpx.MockTransport(handler)
+    )
+    store = ResponseCacheStore(tmp_path, max_bytes=1024 * 1024)
+    fetcher = CachingHtmlFetcher(inner, store, ttl=0)
+
+    assert fetcher.fetch("https://example.com/page") == "<html>body</html>"
+    assert fetcher.fetch("https://example.com/page") == "<html>body</html>"
+    fetcher.close()
+
+    assert "If-None-Match" not in seen_headers[0]
+    assert seen_headers[1]["If-None-Match"] == '"v1"'
+
+
+def test_store_evicts_least_recently_used(tmp_path: Path) -> None:
+    now = [0.0]
+    probe = ResponseCacheStore(tmp_path / "probe", max_bytes=1024 * 1024)
+    probe.put("https://example.com/probe", "<html>a</html>", ttl=60)
+    entry_size = probe.total_bytes()
+    store = ResponseCacheStore(tmp_path / "lru", max_bytes=3 * entry_size, clock=lambda: now[0])
+
+    for name in ("a", "b", "c"):
+        now[0] += 1
+        store.put(f"https://example.com/{name}", f"<html>{name}</html>", ttl=60)
+    now[0] += 1
+    store.get("https://example.com/a")
+    now[0] += 1
+    store.put("https://example.com/d", "<html>d</html>", ttl=60)
+
+    assert store.total_bytes() <= 3 * entry_size
+    assert store.get("https://example.com/b") is None
+    assert store.get("https://example.com/a") is not None
+    assert store.get("https://example.com/d") is not None
+
+
+def test_cache_honours_cache_control_and_the_store_clock(tmp_path: Path) -> None:
+    now = [0.0]
+    seen: list[str] = []
+    directives = {"/zero": "max-age=0", "/no-cache": "no-cache", "/no-store": "no-store"}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url.path)
+        headers = {"Cache-Control": directives.get(request.url.path, "")}
+        return httpx.Response(200, text="<html>body</html>", headers=headers)
+
+    inner = HttpxHtmlFetcher(
+        timeout=1.0, retries=0, user_agent="test", transport=httpx.MockTransport(handler)
+    )
+    store = ResponseCacheStore(tmp_path, max_bytes=1024 * 1024, clock=lambda: now[0])
+    fetcher = CachingHtmlFetcher(inner, store, ttl=60)
+
+    for path in ("/zero", "/no-cache", "/no-store", "/default"):
+        fetcher.fetch(f"https://example.com{path}")
+        fetcher.fetch(f"https://example.com{path}")
+    stored_no_store = store.get("https://example.com/no-store")
+    now[0] += 61
+    fetcher.fetch("https://example.com/default")
+    fetcher.close()
+
+    assert stored_no_store is None
+    assert [seen.count(path) for path in ("/zero", "/no-cache", "/no-store")] == [2, 2, 2]
+    # Fresh for the default TTL on the injected clock, then fetched again.
+    assert seen.count("/default") == 2
+
+
+def test_concurrent_writers_leave_no_temp_files(tmp_path: Path) -> None:
+    # Two stores on one directory stand in for two processes sharing it.
+    stores = [ResponseCacheStore(tmp_path, max_bytes=1024 * 1024) for _ in range(2)]
+    url = "https://pubmed.ncbi.nlm.nih.gov/1/"
+
+    def write(n: int) -> None:
+        stores[n % 2].put(url, f"<html>{n}</html>", ttl=60)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(write, range(64)))
+
+    cached = stores[0].get(url)
+    assert cached is not None and cached.body.startswith("<html>")
+    assert list(tmp_path.rglob("*.tmp")) == []
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+from typing import AsyncIterator
+
+import httpx
+import pytest
+
+from app.api import jobs
+from app.repositories.sqlite_jobs_repo import SqliteJobsRepository
+from app.services.download import BlobStore, DownloadError, PdfDownloader
+from app.services.resolver.robots import RobotsPolicy
+from app.services.resolver.results import PdfResolutionResult, ResolutionSource
+
+
+PDF = b"%PDF-1.7\n" + b"x" * 200_000 + b"\n%%EOF\n"
+
+
+def _downloader(
+    root: Path, handler, *, max_bytes: int = 1_000_000, robots: RobotsPolicy | None = None
+) -> PdfDownloader:
+    return PdfDownloader(
+        BlobStore(root),
+        timeout=5,
+        user_agent="test",
+        max_bytes=max_bytes,
+        chunk_size=4096,
+        robots=robots,
+        transport=httpx.MockTransport(handler),
+    )
+
+
+async def _chunked(body: bytes) -> AsyncIterator[bytes]:
+    for start in range(0, len(body), 1000):
+        yield body[start : start + 1000]
+
+
+def _serve(request: httpx.Request) -> httpx.Response:
+    if request.url.path == "/robots.txt":
+        return httpx.Response(200, text="User-agent: *\nDisallow: /private/\n")
+    if request.url.path.endswith("login"):
+        return httpx.Response(200, html="<html>Sign in</html>")
+    if request.url.path.endswith("missing"):
+        return httpx.Response(404)
+    if request.url.path.endswith("huge"):
+        return httpx.Response(200, content=_chunked(b"%PDF-" + b"0" * 50_000))
+    return httpx.Response(200, content=PDF, headers={"Content-Type": "application/pdf"})
+
+
+@pytest.mark.asyncio
+async def test_identical_pdfs_are_stored_once(tmp_path: Path) -> None:
+    downloader = _downloader(tmp_path, _serve)
+
+    first = await downloader.download("https://a.example/1.pdf")
+    second = await downloader.download("https://b.example/other.pdf")
+    await downloader.aclose()
+
+    assert first.sha256 == second.sha256 == hashlib.sha256(PDF).hexdigest()
+    assert (first.existed, second.existed) == (False, True)
+    assert first.size == len(PDF)
+    assert first.path.read_bytes() == PDF
+    assert len(list((tmp_path / "blobs").rglob("*.pdf"))) == 1
+    assert list((tmp_path / "tmp").iterdir()) == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("path", "reason"),
+    [
+        ("login", r"not a PDF \(text/html\)"),
+        ("missing", "HTTP 404"),
+        ("huge", "larger than 10000 bytes"),
+        ("big.pdf", "larger than 10000 bytes"),
+    ],
+)
+async def test_rejected_downloads_leave_nothing_behind(
+    tmp_path: Path, path: str, reason: str
+) -> None:
+    downloader = _downloader(tmp_path, _serve, max_bytes=10_000)
+
+    with pytest.raises(DownloadError, match=reason):
+        await downloader.download(f"https://a.example/{path}")
+    await downloader.aclose()
+
+    assert list(tmp_path.rglob("*.p*")) == []
+
+
+@pytest.mark.asyncio
+async def test_downloads_respect_robots_txt(tmp_path: Path) -> None:
+    seen: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url.path)
+        return _serve(request)
+
+    downloader = _downloader(tmp_path, handler, robots=RobotsPolicy(user_agent="test"))
+
+    with pytest.raises(DownloadError, match="Disallowed by robots.txt") as blocked:
+        await downloader.download("https://a.example/private/1.pdf")
+    blob = await downloader.download("https://a.example/1.pdf")
+    await downloader.aclose()
+
+    assert not blocked.value.transient
+    assert blob.size == len(PDF)
+    assert seen == ["/robots.txt", "/1.pdf"]
+
+
+class _ResolvedTo:
+    def __init__(self, pdf_url: str) -> None:
+        self._pdf_url = pdf_url
+
+    async def resolve(self, raw_url: str, *, pmc_id: str | None = None) -> PdfResolutionResult:
+        return PdfResolutionResult.success(ResolutionSource.pmc, self._pdf_url)
+
+
+@pytest.mark.asyncio
+async def test_process_item_records_downloaded_blob(tmp_path: Path) -> None:
+    repo = SqliteJobsRepository(tmp_path / "jobs.sqlite3")
+    record = repo.create(
+        ["https://pubmed.ncbi.nlm.nih.gov/1/", "https://pubmed.ncbi.nlm.nih.gov/2/"]
+    )
+    downloader = _downloader(tmp_path / "pdfs", _serve)
+
+    for item, pdf_url in zip(record.items, ["https://a.example/1.pdf", "https://a.example/login"]):
+        await jobs.process_item(
+            record.id, item, repo, _ResolvedTo(pdf_url), downloader=downloader
+        )
+    await downloader.aclose()
+
+    downloaded, rejected = repo.list_items(record.id)
+    assert (downloaded.status, downloaded.sha256, downloaded.size_bytes) == (
+        "downloaded",
+        hashlib.sha256(PDF).hexdigest(),
+        len(PDF),
+    )
+    assert (rejected.status, rejected.pdf_url) == ("failed", "https://a.example/login")
+    assert rejected.reason.startswith("Downloaded file is not a PDF")
+    repo.close()
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import zipfile
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from app.api import jobs
+from app.api.exports import iter_job_items
+from app.main import app
+from app.repositories.jobs_repo import InMemoryJobsRepository
+from app.services.download import BlobStore
+
+
+PDFS = [b"%PDF-1.4 first\n%%EOF\n", b"%PDF-1.4 second\n" + bytes(range(256)) * 400]
+
+
+def _job_with_downloads(repo: InMemoryJobsRepository, store: BlobStore) -> str:
+    record = repo.create([f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/" for pmid in (11, 22, 33)])
+    for index, body in zip((0, 2), PDFS):
+        with store.stage() as staged:
+            staged.write(body)
+            blob = store.commit(staged)
+        repo.update_item(
+            record.id,
+            index,
+            status="downloaded",
+            pdf_url=f"https://x.example/{index}.pdf",
+            sha256=blob.sha256,
+            size_bytes=blob.size,
+        )
+    repo.update_item(record.id, 1, status="failed", reason="No PDF source discovered")
+    return record.id
+
+
+def _export(repo, store, job_id: str, export_format: str):
+    app.dependency_overrides[jobs.get_jobs_repo] = lambda: repo
+    app.dependency_overrides[jobs.get_blob_store] = lambda: store
+    try:
+        return TestClient(app).get(f"/jobs/{job_id}/export", params={"format": export_format})
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_csv_and_ndjson_exports_list_every_item(tmp_path: Path) -> None:
+    repo = InMemoryJobsRepository()
+    store = BlobStore(tmp_path)
+    job_id = _job_with_downloads(repo, store)
+
+    as_csv = _export(repo, store, job_id, "csv")
+    as_ndjson = _export(repo, store, job_id, "ndjson")
+
+    assert as_csv.headers["content-type"].startswith("text/csv")
+    assert f'filename="job-{job_id}.csv"' in as_csv.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(as_csv.text)))
+    assert [(row["index"], row["status"]) for row in rows] == [
+        ("0", "downloaded"),
+        ("1", "failed"),
+        ("2", "downloaded"),
+    ]
+    assert rows[2]["size_bytes"] == str(len(PDFS[1]))
+    lines = [json.loads(line) for line in as_ndjson.text.splitlines()]
+    assert [line["status"] for line in lines] == ["downloaded", "failed", "downloaded"]
+    assert lines[1]["reason"] == "No PDF source discovered"
+
+
+def test_zip_export_stores_downloaded_pdfs(tmp_path: Path) -> None:
+    repo = InMemoryJobsRepository()
+    store = BlobStore(tmp_path)
+    job_id = _job_with_downloads(repo, store)
+
+    response = _export(repo, store, job_id, "zip")
+    missing = _export(repo, store, "unknown", "zip")
+
+    assert response.headers["content-type"] == "application/zip"
+    with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+        assert archive.testzip() is None
+        assert archive.namelist() == ["00000-11.pdf", "00002-33.pdf"]
+        assert [archive.read(name) for name in archive.namelist()] == PDFS
+        assert {info.compress_type for info in archive.infolist()} == {zipfile.ZIP_STORED}
+    assert missing.status_code == 404
+
+
+def test_item_pages_follow_the_cursor() -> None:
+    repo = InMemoryJobsRepository()
+    record = repo.create([f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/" for pmid in range(7)])
+
+    pages = list(iter_job_items(repo, record.id, page_size=3))
+
+    assert [[item.index for item in page] for page in pages] == [[0, 1, 2], [3, 4, 5], [6]]
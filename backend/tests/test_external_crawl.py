@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import pytest
+
+from app.services.resolver.external import (
+    AsyncExternalPdfLocator,
+    CrawlBudget,
+    ExternalPdfLocator,
+)
+from app.services.resolver.html_parser import PubmedPageParser, PubmedStreamScanner
+from app.services.resolver.manager import AsyncPubmedResolverManager
+
+from .test_async_resolver import AsyncStubFetcher
+from .test_resolver import StubFetcher
+
+
+PUBMED_LINKS = (
+    "<html><body><div class='full-text-links'>"
+    "<a href='https://europepmc.org/abstract/MED/1'>Europe PMC</a>"
+    "<a href='https://publisher.example.com/article/1'>Journal Site</a>"
+    "<a href='https://doi.org/10.1000/one'>Publisher full text</a>"
+    "</div></body></html>"
+)
+LANDING = "<html><head><meta http-equiv='refresh' content='0; url=/viewer/1'></head></html>"
+VIEWER = (
+    "<html><head><meta name='citation_pdf_url' content='/content/1.full.pdf'></head>"
+    "<body><a href='/help'>Help</a></body></html>"
+)
+
+
+class StubProber:
+    def __init__(self, pdfs: set[str]) -> None:
+        self._pdfs = pdfs
+        self.probed: list[str] = []
+
+    async def probe_pdf(self, url: str) -> str | None:
+        self.probed.append(url)
+        return url if url in self._pdfs else None
+
+
+def test_candidates_are_ranked_deterministically() -> None:
+    parsed = PubmedPageParser().parse(PUBMED_LINKS, pmid="1")
+    scanner = PubmedStreamScanner(pmid="1")
+    scanner.feed(PUBMED_LINKS)
+
+    assert parsed.external_candidates == [
+        "https://doi.org/10.1000/one",
+        "https://publisher.example.com/article/1",
+        "https://europepmc.org/abstract/MED/1",
+    ]
+    assert parsed.external_fulltext_url == "https://doi.org/10.1000/one"
+    assert scanner.metadata() == parsed
+
+
+@pytest.mark.asyncio
+async def test_crawl_fetches_top_candidates_concurrently_and_follows_one_hop() -> None:
+    fetcher = AsyncStubFetcher(
+        {
+            "https://pubmed.ncbi.nlm.nih.gov/1/": PUBMED_LINKS,
+            "https://doi.org/10.1000/one": LANDING,
+            "https://publisher.example.com/article/1": "<html><body>Paywall</body></html>",
+            "https://doi.org/viewer/1": VIEWER,
+        },
+        delay=0.01,
+    )
+    resolver = AsyncPubmedResolverManager(
+        html_fetcher=fetcher, crawl_budget=CrawlBudget(max_candidates=2)
+    )
+
+    result = await resolver.resolve("https://pubmed.ncbi.nlm.nih.gov/1/")
+
+    assert result.pdf_url == "https://doi.org/content/1.full.pdf"
+    assert fetcher.max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_prober_rejected_pdf_links_are_followed_as_viewer_pages() -> None:
+    landing = "<html><body><a href='/epdf/1'>View PDF</a></body></html>"
+    fetcher = AsyncStubFetcher(
+        {"https://journal.example.com/a": landing, "https://journal.example.com/epdf/1": VIEWER}
+    )
+    prober = StubProber({"https://journal.example.com/content/1.full.pdf"})
+    locator = AsyncExternalPdfLocator(fetcher, prober=prober)
+
+    result = await locator.resolve("https://journal.example.com/a")
+
+    assert result.pdf_url == "https://journal.example.com/content/1.full.pdf"
+    assert prober.probed == [
+        "https://journal.example.com/epdf/1",
+        "https://journal.example.com/content/1.full.pdf",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_crawl_stops_when_the_budget_runs_out() -> None:
+    slow = AsyncStubFetcher({"https://journal.example.com/a": LANDING}, delay=1)
+    timed = await AsyncExternalPdfLocator(slow, budget=CrawlBudget(timeout=0.05)).resolve(
+        "https://journal.example.com/a"
+    )
+    small = AsyncStubFetcher({"https://journal.example.com/a": LANDING})
+    capped = await AsyncExternalPdfLocator(small, budget=CrawlBudget(max_bytes=10)).resolve(
+        "https://journal.example.com/a"
+    )
+
+    assert timed.reason == "External crawl budget exhausted"
+    # The landing page alone used up the byte budget, so its refresh is not followed.
+    assert capped.reason == "PDF link not discovered on landing page"
+    assert small.max_in_flight == 1
+
+
+def test_sync_locator_follows_meta_refresh() -> None:
+    fetcher = StubFetcher(
+        {"https://journal.example.com/a": LANDING, "https://journal.example.com/viewer/1": VIEWER}
+    )
+
+    result = ExternalPdfLocator(fetcher).resolve("https://journal.example.com/a")
+    shallow = ExternalPdfLocator(fetcher, budget=CrawlBudget(max_depth=1)).resolve(
+        "https://journal.example.com/a"
+    )
+
+    assert result.pdf_url == "https://journal.example.com/content/1.full.pdf"
+    assert shallow.pdf_url is None
+
+
+def test_landing_page_links_are_ranked() -> None:
+    fetcher = StubFetcher(
+        {
+            "https://journal.example.com/a": (
+                "<a href='/files/supplement-1.pdf'>Supplementary data</a>"
+                "<a href='/article/1/pdf'>Download PDF</a>"
+            )
+        }
+    )
+
+    result = ExternalPdfLocator(fetcher).resolve("https://journal.example.com/a")
+
+    assert result.pdf_url == "https://journal.example.com/article/1/pdf"
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.api import jobs
+from app.repositories.jobs_repo import InMemoryJobsRepository
+from app.services.resolver.idconv import NcbiIdConverterClient
+from app.services.resolver.manager import AsyncPubmedResolverManager
+
+from .test_async_resolver import AsyncStubFetcher
+
+
+def _client(url: str, batch_size: int = 200) -> NcbiIdConverterClient:
+    return NcbiIdConverterClient(
+        base_url=url, batch_size=batch_size, timeout=5.0, user_agent="test"
+    )
+
+
+@pytest.mark.asyncio
+async def test_converter_batches_pmids(idconv_server) -> None:
+    pmids = [str(pmid) for pmid in range(1000, 1450)]
+    idconv_server.pmc_ids = {pmid: f"9{pmid}" for pmid in pmids[::2]}
+    client = _client(idconv_server.url)
+
+    result = await client.convert(pmids + pmids[:10])
+    await client.aclose()
+
+    assert result == idconv_server.pmc_ids
+    assert sorted(len(batch) for batch in idconv_server.requests) == [50, 200, 200]
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_dropped(idconv_server) -> None:
+    idconv_server.pmc_ids = {"1": "11", "2": "22", "3": "33"}
+    idconv_server.failing_ids = {"3"}
+    client = _client(idconv_server.url, batch_size=2)
+
+    result = await client.convert(["1", "2", "3"])
+    await client.aclose()
+
+    assert result == {"1": "11", "2": "22"}
+
+
+@pytest.mark.asyncio
+async def test_job_skips_pubmed_pages_for_known_pmc_ids(
+    idconv_server, pmc_pdf_html: str, pubmed_external_html: str, external_pdf_html: str
+) -> None:
+    idconv_server.pmc_ids = {"12345678": "7654321"}
+    pmc_url = "https://pubmed.ncbi.nlm.nih.gov/12345678/"
+    external_url = "https://pubmed.ncbi.nlm.nih.gov/22223333/"
+    fetcher = AsyncStubFetcher(
+        {
+            "https://pmc.ncbi.nlm.nih.gov/articles/PMC7654321/": pmc_pdf_html,
+            external_url: pubmed_external_html,
+            "https://journals.example.com/article": external_pdf_html,
+        }
+    )
+    resolver = AsyncPubmedResolverManager(
+        html_fetcher=fetcher, id_converter=_client(idconv_server.url)
+    )
+    repo = InMemoryJobsRepository()
+    record = repo.create([pmc_url, external_url])
+
+    await jobs._resolve_job(record.id, repo, resolver, 2)
+    await resolver.aclose()
+
+    final = repo.get(record.id)
+    assert final is not None
+    assert final.state == "done"
+    assert [item.pdf_url for item in final.items] == [
+        "https://pmc.ncbi.nlm.nih.gov/articles/PMC7654321/pdf/sample.pdf",
+        "https://journals.example.com/pdfs/download.pdf",
+    ]
+    assert idconv_server.requests == [["12345678", "22223333"]]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("body", [[], {"status": "ok"}, {"records": "none"}])
+async def test_malformed_response_is_a_batch_miss(body: object) -> None:
+    client = NcbiIdConverterClient(
+        timeout=5.0,
+        user_agent="test",
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, json=body)),
+    )
+
+    assert await client.convert(["1", "2"]) == {}
+    await client.aclose()
+
+
+class _RecordingConverter:
+    def __init__(self, events: list[str]) -> None:
+        self._events = events
+
+    async def convert(self, pmids):
+        self._events.append(f"lookup {len(pmids)}")
+        await asyncio.sleep(0.01)
+        return {}
+
+
+class _RecordingFetcher(AsyncStubFetcher):
+    def __init__(self, responses: dict[str, str], events: list[str]) -> None:
+        super().__init__(responses)
+        self._events = events
+
+    async def fetch(self, url: str) -> str:
+        self._events.append("fetch")
+        return await super().fetch(url)
+
+
+@pytest.mark.asyncio
+async def test_items_are_scheduled_per_lookup_batch(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(jobs.get_settings(), "resolver_idconv_batch_size", 2)
+    urls = [f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/" for pmid in range(1, 6)]
+    events: list[str] = []
+    resolver = AsyncPubmedResolverManager(
+        html_fetcher=_RecordingFetcher(dict.fromkeys(urls, "<html></html>"), events),
+        id_converter=_RecordingConverter(events),
+    )
+    repo = InMemoryJobsRepository()
+    record = repo.create(urls)
+
+    await jobs._resolve_job(record.id, repo, resolver, 2)
+
+    assert [event for event in events if event != "fetch"] == ["lookup 2", "lookup 2", "lookup 1"]
+    # Resolution starts before the last batch has been converted.
+    assert events.index("fetch") < events.index("lookup 1")
+
+
+class FailingLookupResolver(AsyncPubmedResolverManager):
+    async def lookup_pmc_ids(self, raw_urls):
+        raise RuntimeError("idconv down")
+
+
+@pytest.mark.asyncio
+async def test_failed_lookup_does_not_stall_the_job(
+    pubmed_external_html: str, external_pdf_html: str
+) -> None:
+    url = "https://pubmed.ncbi.nlm.nih.gov/22223333/"
+    resolver = FailingLookupResolver(
+        html_fetcher=AsyncStubFetcher(
+            {url: pubmed_external_html, "https://journals.example.com/article": external_pdf_html}
+        )
+    )
+    repo = InMemoryJobsRepository()
+    record = repo.create([url, url])
+
+    await jobs._resolve_job(record.id, repo, resolver, 2)
+
+    final = repo.get(record.id)
+    assert final is not None
+    assert final.state == "done"
+    assert [item.status for item in final.items] == ["resolved", "resolved"]
+
+
+@pytest.mark.asyncio
+async def test_items_left_by_a_failed_source_are_failed(
+    pubmed_external_html: str, external_pdf_html: str
+) -> None:
+    url = "https://pubmed.ncbi.nlm.nih.gov/22223333/"
+    resolver = AsyncPubmedResolverManager(
+        html_fetcher=AsyncStubFetcher(
+            {url: pubmed_external_html, "https://journals.example.com/article": external_pdf_html}
+        )
+    )
+    repo = InMemoryJobsRepository()
+    record = repo.create([url, url, url])
+
+    async def batches():
+        yield record.items[:1]
+        raise RuntimeError("search backend went away")
+
+    await jobs._run_job(record.id, repo, resolver, 1, batches())
+
+    final = repo.get(record.id)
+    assert final is not None
+    assert final.state == "failed"
+    assert [item.status for item in final.items] == ["resolved", "failed", "failed"]
@@ -0,0 +1,322 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import jobs
+from app.main import app
+from app.repositories.jobs_repo import InMemoryJobsRepository
+from app.services.resolver.manager import AsyncPubmedResolverManager
+from app.services.resolver.singleflight import AsyncSingleFlightHtmlFetcher
+from app.services.scheduler import FairScheduler
+
+from .test_async_resolver import AsyncStubFetcher
+
+
+def _no_links_responses(pmids: range) -> dict[str, str]:
+    return {
+        f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/": "<html><body>No links</body></html>"
+        for pmid in pmids
+    }
+
+
+@pytest.mark.asyncio
+async def test_resolve_job_bounds_parallelism() -> None:
+    responses = _no_links_responses(range(100, 120))
+    fetcher = AsyncStubFetcher(responses, delay=0.01)
+    resolver = AsyncPubmedResolverManager(html_fetcher=fetcher)
+    repo = InMemoryJobsRepository()
+    record = repo.create(list(responses))
+
+    await jobs._resolve_job(record.id, repo, resolver, 4)
+
+    final = repo.get(record.id)
+    assert final is not None
+    assert fetcher.max_in_flight == 4
+    assert final.state == "failed"
+    assert [item.status for item in final.items] == ["failed"] * len(responses)
+    assert {item.reason for item in final.items} == {"No PDF source discovered"}
+
+
+class _BrokenResolver:
+    async def resolve(self, raw_url: str, *, pmc_id: str | None = None):
+        raise RuntimeError("resolver exploded")
+
+
+@pytest.mark.asyncio
+async def test_process_item_records_unexpected_errors() -> None:
+    repo = InMemoryJobsRepository()
+    record = repo.create(["https://pubmed.ncbi.nlm.nih.gov/1/"])
+
+    delay = await jobs.process_item(record.id, record.items[0], repo, _BrokenResolver())
+
+    assert delay is None
+    item = repo.list_items(record.id)[0]
+    assert (item.status, item.reason) == ("failed", "resolver exploded")
+
+
+def test_create_job_clamps_concurrency(monkeypatch: pytest.MonkeyPatch) -> None:
+    captured: list[int] = []
+
+    async def fake_resolve_job(job_id, repo, resolver, concurrency, **options) -> None:
+        captured.append(concurrency)
+
+    monkeypatch.setattr(jobs, "_resolve_job", fake_resolve_job)
+    app.dependency_overrides[jobs.get_jobs_repo] = InMemoryJobsRepository
+    try:
+        client = TestClient(app)
+        response = client.post(
+            "/jobs",
+            json={"urls": ["https://pubmed.ncbi.nlm.nih.gov/1/"], "concurrency": 50},
+        )
+        rejected = client.post(
+            "/jobs",
+            json={"urls": ["https://pubmed.ncbi.nlm.nih.gov/1/"], "concurrency": 0},
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 201
+    assert captured == [jobs.get_settings().job_max_concurrency]
+    assert rejected.status_code == 422
+
+
+def test_get_job_pages_and_filters_items() -> None:
+    repo = InMemoryJobsRepository()
+    record = repo.create([f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/" for pmid in range(1, 8)])
+    for index in (1, 4, 5):
+        repo.update_item(record.id, index, status="failed", reason="No PDF source discovered")
+    app.dependency_overrides[jobs.get_jobs_repo] = lambda: repo
+    try:
+        client = TestClient(app)
+        first = client.get(f"/jobs/{record.id}", params={"limit": 3}).json()
+        second = client.get(
+            f"/jobs/{record.id}", params={"limit": 3, "cursor": first["next_cursor"]}
+        ).json()
+        failed = client.get(
+            f"/jobs/{record.id}", params={"status": "failed", "limit": 2}
+        ).json()
+        summary = client.get(f"/jobs/{record.id}/summary").json()
+        missing = client.get("/jobs/unknown/summary")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert [item["index"] for item in first["items"]] == [0, 1, 2]
+    assert first["next_cursor"] == 3
+    assert [item["index"] for item in second["items"]] == [3, 4, 5]
+    assert [item["index"] for item in failed["items"]] == [1, 4]
+    assert failed["next_cursor"] == 5
+    assert summary["total"] == 7
+    assert summary["counts"] == {"pending": 4, "resolved": 0, "downloaded": 0, "failed": 3}
+    assert missing.status_code == 404
+
+
+def _finished_job(repo: InMemoryJobsRepository) -> str:
+    record = repo.create([f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/" for pmid in range(1, 4)])
+    repo.update_item(record.id, 1, status="resolved", pdf_url="https://p/2.pdf")
+    repo.set_state(record.id, "done")
+    return record.id
+
+
+def test_shutdown_closes_the_http_clients(monkeypatch: pytest.MonkeyPatch) -> None:
+    closed: list[str] = []
+
+    async def aclose() -> None:
+        closed.append("resolver")
+
+    resolver = jobs.get_resolver()
+    monkeypatch.setattr(resolver, "aclose", aclose)
+    with TestClient(app):
+        pass
+
+    assert closed == ["resolver"]
+    # Components are rebuilt on next use instead of reusing closed clients.
+    assert jobs.get_resolver.cache_info().currsize == 0
+
+
+def test_job_item_urls_are_documented_as_uris() -> None:
+    properties = app.openapi()["components"]["schemas"]["JobItem"]["properties"]
+
+    assert properties["url"]["format"] == "uri"
+    assert {"type": "string", "format": "uri"} in properties["pdf_url"]["anyOf"]
+
+
+def test_stats_report_request_coalescing() -> None:
+    fetcher = AsyncStubFetcher(_no_links_responses(range(7, 8)), delay=0.01)
+    resolver = AsyncPubmedResolverManager(html_fetcher=AsyncSingleFlightHtmlFetcher(fetcher))
+
+    async def resolve_twice() -> None:
+        url = "https://pubmed.ncbi.nlm.nih.gov/7/"
+        await asyncio.gather(resolver.resolve(url), resolver.resolve(url))
+
+    asyncio.run(resolve_twice())
+    app.dependency_overrides[jobs.get_resolver] = lambda: resolver
+    try:
+        stats = TestClient(app).get("/stats").json()
+    finally:
+        app.dependency_overrides.clear()
+
+    assert stats["resolve"] == {"calls": 2, "executions": 1, "coalesced": 1}
+    assert stats["fetch"] == {"calls": 1, "executions": 1, "coalesced": 0}
+
+
+def test_changes_return_only_items_updated_since_version() -> None:
+    repo = InMemoryJobsRepository()
+    record = repo.create([f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/" for pmid in range(1, 4)])
+    app.dependency_overrides[jobs.get_jobs_repo] = lambda: repo
+    try:
+        client = TestClient(app)
+        initial = client.get(f"/jobs/{record.id}/changes").json()
+        repo.update_item(record.id, 2, status="failed", reason="No PDF source discovered")
+        delta = client.get(
+            f"/jobs/{record.id}/changes", params={"since": initial["version"]}
+        ).json()
+        idle = client.get(f"/jobs/{record.id}/changes", params={"since": delta["version"]}).json()
+    finally:
+        app.dependency_overrides.clear()
+
+    assert [item["index"] for item in initial["items"]] == [0, 1, 2]
+    assert [(item["index"], item["status"]) for item in delta["items"]] == [(2, "failed")]
+    assert delta["counts"] == {"pending": 2, "resolved": 0, "downloaded": 0, "failed": 1}
+    assert idle["items"] == [] and idle["version"] == delta["version"]
+
+
+@pytest.mark.asyncio
+async def test_long_poll_wakes_on_update(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(jobs.get_settings(), "job_events_poll_seconds", 0.01)
+    repo = InMemoryJobsRepository()
+    record = repo.create(["https://pubmed.ncbi.nlm.nih.gov/1/"])
+    version = repo.version(record.id)
+    app.dependency_overrides[jobs.get_jobs_repo] = lambda: repo
+    try:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            poll = asyncio.create_task(
+                client.get(f"/jobs/{record.id}/changes", params={"since": version, "wait": 5})
+            )
+            await asyncio.sleep(0.05)
+            assert not poll.done()
+            repo.update_item(record.id, 0, status="resolved", pdf_url="https://p/1.pdf")
+            response = await asyncio.wait_for(poll, 2)
+    finally:
+        app.dependency_overrides.clear()
+
+    assert [item["status"] for item in response.json()["items"]] == ["resolved"]
+
+
+class ThreadRecordingRepository(InMemoryJobsRepository):
+    def __init__(self) -> None:
+        super().__init__()
+        self.threads: set[int] = set()
+
+    def version(self, job_id: str) -> int | None:
+        self.threads.add(threading.get_ident())
+        return super().version(job_id)
+
+    def state(self, job_id: str):
+        self.threads.add(threading.get_ident())
+        return super().state(job_id)
+
+    def page_items(self, job_id: str, **options):
+        self.threads.add(threading.get_ident())
+        return super().page_items(job_id, **options)
+
+    def update_item(self, job_id: str, index: int, **changes):
+        self.threads.add(threading.get_ident())
+        return super().update_item(job_id, index, **changes)
+
+    def list_items(self, job_id: str):
+        raise AssertionError("the runner pages through items")
+
+
+@pytest.mark.asyncio
+async def test_polling_reads_the_repository_off_the_event_loop() -> None:
+    repo = ThreadRecordingRepository()
+    job_id = _finished_job(repo)
+    repo.threads.clear()
+    app.dependency_overrides[jobs.get_jobs_repo] = lambda: repo
+    try:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            await client.get(f"/jobs/{job_id}/changes", params={"wait": 1})
+            await client.get(f"/jobs/{job_id}/events")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert repo.threads
+    assert threading.get_ident() not in repo.threads
+
+
+@pytest.mark.asyncio
+async def test_inline_runner_reads_the_repository_off_the_event_loop() -> None:
+    responses = _no_links_responses(range(300, 305))
+    resolver = AsyncPubmedResolverManager(html_fetcher=AsyncStubFetcher(responses))
+    repo = ThreadRecordingRepository()
+    record = repo.create(list(responses))
+
+    await jobs._resolve_job(record.id, repo, resolver, 2)
+
+    assert repo.summary(record.id).counts["failed"] == 5
+    assert repo.threads
+    assert threading.get_ident() not in repo.threads
+
+
+def test_event_stream_sends_progress_then_end() -> None:
+    repo = InMemoryJobsRepository()
+    job_id = _finished_job(repo)
+    app.dependency_overrides[jobs.get_jobs_repo] = lambda: repo
+    try:
+        client = TestClient(app)
+        with client.stream("GET", f"/jobs/{job_id}/events") as response:
+            body = response.read().decode()
+        resumed = client.get(
+            f"/jobs/{job_id}/events", headers={"Last-Event-ID": str(repo.version(job_id))}
+        ).text
+    finally:
+        app.dependency_overrides.clear()
+
+    events = [block.splitlines() for block in body.strip().split("\n\n")]
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert [lines[1] for lines in events] == ["event: progress", "event: end"]
+    assert '"state":"done"' in events[0][2]
+    assert resumed.strip().splitlines()[1] == "event: end"
+
+
+@pytest.mark.asyncio
+async def test_delete_cancels_a_running_job() -> None:
+    responses = _no_links_responses(range(200, 230))
+    fetcher = AsyncStubFetcher(responses, delay=0.02)
+    resolver = AsyncPubmedResolverManager(html_fetcher=fetcher)
+    repo = InMemoryJobsRepository()
+    record = repo.create(list(responses))
+    scheduler = FairScheduler(workers=2)
+    app.dependency_overrides[jobs.get_jobs_repo] = lambda: repo
+    app.dependency_overrides[jobs.get_scheduler] = lambda: scheduler
+    try:
+        running = asyncio.create_task(
+            jobs._resolve_job(record.id, repo, resolver, 2, scheduler=scheduler)
+        )
+        await asyncio.sleep(0.05)
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            response = await client.delete(f"/jobs/{record.id}")
+            missing = await client.delete("/jobs/unknown")
+        await asyncio.wait_for(running, 2)
+    finally:
+        app.dependency_overrides.clear()
+        await scheduler.stop()
+
+    assert response.status_code == 200
+    assert response.json()["state"] == "cancelled"
+    assert missing.status_code == 404
+    summary = repo.summary(record.id)
+    assert summary is not None
+    assert summary.state == "cancelled"
+    assert summary.counts["pending"] > 20
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from app.repositories.jobs_repo import InMemoryJobsRepository, JobsRepository
+from app.repositories.sqlite_jobs_repo import SqliteJobsRepository
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def repo(request: pytest.FixtureRequest, tmp_path: Path) -> JobsRepository:
+    if request.param == "memory":
+        return InMemoryJobsRepository()
+    sqlite_repo = SqliteJobsRepository(tmp_path / "jobs.sqlite3")
+    request.addfinalizer(sqlite_repo.close)
+    return sqlite_repo
+
+
+def test_duplicate_urls_are_updated_independently(repo: JobsRepository) -> None:
+    url = "https://pubmed.ncbi.nlm.nih.gov/1/"
+    record = repo.create([url, "https://pubmed.ncbi.nlm.nih.gov/2/", url])
+    appended = repo.append_items(record.id, [url])
+
+    assert [item.index for item in appended] == [3]
+    assert repo.item_positions(record.id, url) == [0, 2, 3]
+
+    repo.update_item(record.id, 2, status="resolved", pdf_url="https://p/1.pdf")
+    repo.update_item(record.id, 99, status="failed")
+
+    assert [item.status for item in repo.list_items(record.id)] == [
+        "pending",
+        "pending",
+        "resolved",
+        "pending",
+    ]
+
+
+def test_page_items_and_summary(repo: JobsRepository) -> None:
+    record = repo.create([f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/" for pmid in range(10)])
+    for index in (2, 3, 8):
+        repo.update_item(record.id, index, status="resolved")
+
+    page = repo.page_items(record.id, start=3, limit=4)
+    resolved = repo.page_items(record.id, start=3, limit=4, status="resolved")
+    summary = repo.summary(record.id)
+
+    assert [item.index for item in page] == [3, 4, 5, 6]
+    assert [item.index for item in resolved] == [3, 8]
+    assert summary is not None
+    assert summary.counts == {"pending": 7, "resolved": 3}
+    assert summary.total == 10
+    assert repo.summary("missing") is None
+
+
+def test_changes_since_pages_by_version(repo: JobsRepository) -> None:
+    record = repo.create([f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/" for pmid in range(5)])
+    start = repo.version(record.id)
+    assert start is not None
+    for index in (3, 1, 3, 4):
+        repo.update_item(record.id, index, status="resolved")
+    repo.set_state(record.id, "done")
+
+    first = repo.changes_since(record.id, start, limit=2)
+    assert first is not None
+    rest = repo.changes_since(record.id, first.cursor, limit=2)
+    assert rest is not None
+
+    assert [item.index for item in first.items] == [1, 3]
+    assert first.has_more
+    assert [item.index for item in rest.items] == [4]
+    assert not rest.has_more
+    assert rest.cursor == repo.version(record.id)
+    assert rest.summary.state == "done"
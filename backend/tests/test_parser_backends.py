@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import pytest
+
+from app.services.resolver import external, pmc
+from app.services.resolver.html_backends import SoupBackend, get_html_backend
+from app.services.resolver.html_parser import PubmedPageParser
+from app.services.resolver.prebaked_responses import MOCK_RESPONSES
+
+from .conftest import FIXTURES
+
+
+pytest.importorskip("selectolax")
+
+REFERENCE = SoupBackend()
+FAST = get_html_backend("selectolax")
+
+PAGES = {
+    **{path.name: path.read_text(encoding="utf-8") for path in sorted(FIXTURES.glob("*.html"))},
+    **MOCK_RESPONSES,
+}
+
+
+@pytest.mark.parametrize("page", sorted(PAGES))
+def test_pubmed_metadata_matches_reference(page: str) -> None:
+    html = PAGES[page]
+
+    expected = PubmedPageParser(REFERENCE).parse(html, pmid="12345678")
+    actual = PubmedPageParser(FAST).parse(html, pmid="12345678")
+
+    assert actual == expected
+
+
+EXTRACTORS = {
+    "pmc": lambda document, base_url: pmc._build_result(document, base_url=base_url),
+    "external": lambda document, base_url: external._inspect(document, base_url=base_url),
+}
+
+
+@pytest.mark.parametrize("page", sorted(PAGES))
+@pytest.mark.parametrize("extractor", sorted(EXTRACTORS))
+def test_pdf_link_extraction_matches_reference(page: str, extractor: str) -> None:
+    html = PAGES[page]
+    base_url = "https://pmc.ncbi.nlm.nih.gov/articles/PMC7654321/"
+    extract = EXTRACTORS[extractor]
+
+    expected = extract(REFERENCE.parse(html, links_only=True), base_url)
+    actual = extract(FAST.parse(html, links_only=True), base_url)
+
+    assert actual == expected
+
+
+def test_fixtures_exercise_meta_and_refresh_paths() -> None:
+    metadata = PubmedPageParser(FAST).parse(PAGES["pubmed_meta_article.html"], pmid="1")
+    findings = external._inspect(
+        FAST.parse(PAGES["external_refresh_article.html"], links_only=True),
+        base_url="https://journals.example.com/article",
+    )
+
+    assert metadata.pmc_id == "1112223"
+    assert metadata.external_fulltext_url == "https://doi.org/10.1000/example"
+    assert findings.pdf_links[0] == "https://journals.example.com/content/article.pdf"
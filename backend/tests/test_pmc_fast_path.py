@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from app.services.resolver.fetcher import AsyncHttpxHtmlFetcher
+from app.services.resolver.pmc import AsyncPmcPdfExtractor
+from app.services.resolver.results import ResolutionSource
+
+from .test_async_resolver import AsyncStubFetcher
+
+
+ARTICLE_URL = "https://pmc.ncbi.nlm.nih.gov/articles/PMC7654321/"
+PDF_URL = ARTICLE_URL + "pdf/"
+
+
+def _prober(handler) -> AsyncHttpxHtmlFetcher:
+    return AsyncHttpxHtmlFetcher(
+        timeout=1.0, retries=0, user_agent="test", transport=httpx.MockTransport(handler)
+    )
+
+
+@pytest.mark.asyncio
+async def test_verified_pdf_url_skips_article_scrape() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if str(request.url) == PDF_URL:
+            return httpx.Response(302, headers={"Location": PDF_URL + "main.pdf"})
+        assert request.method == "HEAD"
+        return httpx.Response(200, headers={"Content-Type": "application/pdf"})
+
+    pages = AsyncStubFetcher({})
+    extractor = AsyncPmcPdfExtractor(pages, prober=_prober(handler))
+
+    result = await extractor.resolve("7654321")
+
+    assert result.source == ResolutionSource.pmc
+    assert result.pdf_url == PDF_URL + "main.pdf"
+    assert pages.max_in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_ranged_get_used_when_head_is_not_allowed() -> None:
+    methods: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        methods.append(request.method)
+        if request.method == "HEAD":
+            return httpx.Response(405)
+        assert request.headers["Range"] == "bytes=0-4"
+        return httpx.Response(206, content=b"%PDF-")
+
+    extractor = AsyncPmcPdfExtractor(AsyncStubFetcher({}), prober=_prober(handler))
+
+    result = await extractor.resolve("7654321")
+
+    assert result.pdf_url == PDF_URL
+    assert methods == ["HEAD", "GET"]
+
+
+@pytest.mark.asyncio
+async def test_unverified_pdf_url_falls_back_to_scrape(pmc_pdf_html: str) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, headers={"Content-Type": "text/html"})
+
+    extractor = AsyncPmcPdfExtractor(
+        AsyncStubFetcher({ARTICLE_URL: pmc_pdf_html}), prober=_prober(handler)
+    )
+
+    result = await extractor.resolve("7654321")
+
+    assert result.pdf_url == ARTICLE_URL + "pdf/sample.pdf"
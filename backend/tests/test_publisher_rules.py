@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import pytest
+
+from app.services.resolver.external import AsyncExternalPdfLocator
+from app.services.resolver.manager import AsyncPubmedResolverManager
+from app.services.resolver.publisher_rules import PublisherRule, PublisherRuleRegistry
+
+from .test_async_resolver import AsyncStubFetcher
+from .test_external_crawl import StubProber
+
+
+@pytest.mark.parametrize(
+    ("url", "expected"),
+    [
+        (
+            "https://www.sciencedirect.com/science/article/pii/S1090385511000293",
+            "https://www.sciencedirect.com/science/article/pii/S1090385511000293/pdfft"
+            "?isDTMRedir=true&download=true",
+        ),
+        (
+            "https://dx.doi.org/10.1007/s00125-020-05123-4",
+            "https://link.springer.com/content/pdf/10.1007/s00125-020-05123-4.pdf",
+        ),
+        (
+            "https://journals.plos.org/plosone/article?id=10.1371/journal.pone.0123456",
+            "https://journals.plos.org/plosone/article/file"
+            "?id=10.1371/journal.pone.0123456&type=printable",
+        ),
+        (
+            "https://www.nature.com/articles/s41586-020-2012-7",
+            "https://www.nature.com/articles/s41586-020-2012-7.pdf",
+        ),
+        ("https://doi.org/10.1016/j.cell.2020.01.001", None),
+        ("https://journals.example.com/article", None),
+    ],
+)
+def test_default_rules_derive_pdf_urls(url: str, expected: str | None) -> None:
+    match = PublisherRuleRegistry().match(url)
+
+    assert (match.pdf_url if match else None) == expected
+
+
+@pytest.mark.asyncio
+async def test_rule_hit_skips_the_landing_page_fetch() -> None:
+    fetcher = AsyncStubFetcher(
+        {
+            "https://pubmed.ncbi.nlm.nih.gov/21458665/": (
+                "<html><body><div class='full-text-links'>"
+                "<a href='https://www.sciencedirect.com/science/article/pii/S1'>Journal</a>"
+                "</div></body></html>"
+            )
+        }
+    )
+    pdf_url = (
+        "https://www.sciencedirect.com/science/article/pii/S1/pdfft?isDTMRedir=true&download=true"
+    )
+    # The prober verifies rule-derived URLs even with the PMC fast path off.
+    resolver = AsyncPubmedResolverManager(
+        html_fetcher=fetcher,
+        pdf_prober=StubProber({pdf_url}),
+        pmc_fast_path=False,
+        publisher_rules=PublisherRuleRegistry(),
+    )
+
+    result = await resolver.resolve("https://pubmed.ncbi.nlm.nih.gov/21458665/")
+
+    assert result.pdf_url == pdf_url
+    assert resolver.publisher_rule_stats["sciencedirect"].hits == 1
+
+
+@pytest.mark.asyncio
+async def test_rules_are_skipped_without_a_prober() -> None:
+    registry = PublisherRuleRegistry(
+        [PublisherRule("example", "journal.example.com", r"/a/(?P<id>\d+)", "https://x/{id}.pdf")]
+    )
+    fetcher = AsyncStubFetcher(
+        {"https://journal.example.com/a/7": "<a href='/files/7.pdf'>Download</a>"}
+    )
+    locator = AsyncExternalPdfLocator(fetcher, rules=registry)
+
+    result = await locator.resolve("https://journal.example.com/a/7")
+
+    # An unverified derived URL is never reported; the page is crawled instead.
+    assert result.pdf_url == "https://journal.example.com/files/7.pdf"
+    assert (registry.stats["example"].hits, registry.stats["example"].misses) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_rule_miss_falls_back_to_the_html_path() -> None:
+    registry = PublisherRuleRegistry(
+        [PublisherRule("example", "journal.example.com", r"/a/(?P<id>\d+)", "https://x/{id}.pdf")]
+    )
+    fetcher = AsyncStubFetcher(
+        {"https://journal.example.com/a/7": "<a href='/files/7.pdf'>Download</a>"}
+    )
+    prober = StubProber({"https://journal.example.com/files/7.pdf"})
+    locator = AsyncExternalPdfLocator(fetcher, prober=prober, rules=registry)
+
+    result = await locator.resolve("https://journal.example.com/a/7")
+
+    assert result.pdf_url == "https://journal.example.com/files/7.pdf"
+    assert prober.probed == ["https://x/7.pdf", "https://journal.example.com/files/7.pdf"]
+    assert (registry.stats["example"].hits, registry.stats["example"].misses) == (0, 1)
@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import jobs
+from app.main import app
+from app.repositories.jobs_repo import InMemoryJobsRepository
+from app.repositories.sqlite_jobs_repo import SqliteJobsRepository
+from app.services.queue import SqliteTaskQueue
+from app.services.resolver.manager import AsyncPubmedResolverManager
+from app.worker import Worker
+
+from .test_async_resolver import AsyncStubFetcher
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_leases_hide_tasks_until_ack_or_expiry(tmp_path: Path) -> None:
+    clock = FakeClock()
+    queue = SqliteTaskQueue(tmp_path / "queue.sqlite3", clock=clock)
+    queue.enqueue([{"n": 1}, {"n": 2}, {"n": 3}])
+
+    first = queue.lease(limit=2, visibility_timeout=30)
+    second = queue.lease(limit=2, visibility_timeout=30)
+    assert [task.payload["n"] for task in first] == [1, 2]
+    assert [task.payload["n"] for task in second] == [3]
+    assert queue.ack(first[0])
+    assert queue.release(first[1], delay=5)
+    assert queue.lease(limit=5, visibility_timeout=30) == []
+
+    clock.now += 31
+    redelivered = queue.lease(limit=5, visibility_timeout=30)
+    assert [(task.payload["n"], task.attempts, task.releases) for task in redelivered] == [
+        (2, 2, 1),
+        (3, 2, 0),
+    ]
+    # The expired lease on task 3 can no longer ack it.
+    assert not queue.ack(second[0])
+    assert all(queue.ack(task) for task in redelivered)
+    assert queue.pending_count() == 0
+    queue.close()
+
+
+def _worker(tmp_path: Path, responses: dict[str, str], max_attempts: int = 3) -> tuple:
+    repo = SqliteJobsRepository(tmp_path / "jobs.sqlite3", flush_interval=60)
+    queue = SqliteTaskQueue(tmp_path / "queue.sqlite3")
+    resolver = AsyncPubmedResolverManager(html_fetcher=AsyncStubFetcher(responses))
+    worker = Worker(
+        repo=repo,
+        queue=queue,
+        resolver=resolver,
+        concurrency=4,
+        visibility_timeout=30,
+        max_attempts=max_attempts,
+        retry_delay=0,
+    )
+    return repo, queue, worker
+
+
+@pytest.mark.asyncio
+async def test_worker_drains_job_and_sets_final_state(
+    tmp_path: Path, pubmed_external_html: str, external_pdf_html: str
+) -> None:
+    responses = {
+        "https://pubmed.ncbi.nlm.nih.gov/22223333/": pubmed_external_html,
+        "https://journals.example.com/article": external_pdf_html,
+    }
+    repo, queue, worker = _worker(tmp_path, responses)
+    record = repo.create(["https://pubmed.ncbi.nlm.nih.gov/22223333/"] * 6)
+    jobs._enqueue_job(record.id, record.items, queue)
+
+    while await worker.run_once():
+        pass
+
+    final = repo.get(record.id)
+    assert final is not None
+    assert final.state == "done"
+    assert {item.pdf_url for item in final.items} == {
+        "https://journals.example.com/pdfs/download.pdf"
+    }
+    assert queue.pending_count() == 0
+    repo.close()
+    queue.close()
+
+
+@pytest.mark.asyncio
+async def test_worker_renews_leases_of_a_slow_batch(
+    tmp_path: Path, pubmed_external_html: str, external_pdf_html: str
+) -> None:
+    responses = {
+        "https://pubmed.ncbi.nlm.nih.gov/22223333/": pubmed_external_html,
+        "https://journals.example.com/article": external_pdf_html,
+    }
+    repo = SqliteJobsRepository(tmp_path / "jobs.sqlite3", flush_interval=60)
+    queue = SqliteTaskQueue(tmp_path / "queue.sqlite3")
+    resolver = AsyncPubmedResolverManager(
+        html_fetcher=AsyncStubFetcher(responses, delay=0.3)
+    )
+    worker = Worker(
+        repo=repo,
+        queue=queue,
+        resolver=resolver,
+        concurrency=4,
+        visibility_timeout=0.3,
+        max_attempts=3,
+        retry_delay=0,
+    )
+    record = repo.create(["https://pubmed.ncbi.nlm.nih.gov/22223333/"])
+    queue.enqueue([jobs.item_task(record.id, record.items[0])])
+
+    batch = asyncio.create_task(worker.run_once())
+    await asyncio.sleep(0.45)
+    # Past the original visibility timeout, the task is still leased.
+    assert queue.lease(limit=1, visibility_timeout=30) == []
+    assert await batch == 1
+
+    assert repo.list_items(record.id)[0].status == "resolved"
+    assert queue.pending_count() == 0
+    repo.close()
+    queue.close()
+
+
+class GatedFetcher(AsyncStubFetcher):
+    def __init__(self, responses: dict[str, str], slow_url: str) -> None:
+        super().__init__(responses)
+        self.slow_url = slow_url
+        self.gate = asyncio.Event()
+
+    async def fetch(self, url: str) -> str:
+        if url == self.slow_url:
+            await self.gate.wait()
+        return await super().fetch(url)
+
+
+@pytest.mark.asyncio
+async def test_worker_refills_slots_while_a_slow_task_runs(tmp_path: Path) -> None:
+    urls = [f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/" for pmid in range(1, 6)]
+    fetcher = GatedFetcher(dict.fromkeys(urls, "<html></html>"), urls[0])
+    repo = InMemoryJobsRepository()
+    queue = SqliteTaskQueue(tmp_path / "queue.sqlite3")
+    worker = Worker(
+        repo=repo,
+        queue=queue,
+        resolver=AsyncPubmedResolverManager(html_fetcher=fetcher),
+        concurrency=2,
+        visibility_timeout=30,
+        max_attempts=3,
+    )
+    record = repo.create(urls)
+    jobs._enqueue_job(record.id, record.items, queue)
+    stop = asyncio.Event()
+
+    running = asyncio.create_task(worker.run(stop, poll_interval=0.01))
+    for _ in range(200):
+        if [item.status for item in repo.list_items(record.id)][1:] == ["failed"] * 4:
+            break
+        await asyncio.sleep(0.01)
+    # Every other item ran through the second slot while the first was stuck.
+    assert [item.status for item in repo.list_items(record.id)] == ["pending"] + ["failed"] * 4
+    fetcher.gate.set()
+    stop.set()
+    await asyncio.wait_for(running, 2)
+    queue.close()
+
+    assert repo.list_items(record.id)[0].status == "failed"
+
+
+@pytest.mark.asyncio
+async def test_worker_gives_up_after_max_attempts(tmp_path: Path) -> None:
+    repo, queue, worker = _worker(tmp_path, {}, max_attempts=1)
+    record = repo.create(["https://pubmed.ncbi.nlm.nih.gov/1/"])
+    queue.enqueue([jobs.item_task(record.id, record.items[0])])
+    # Simulate a worker that crashed after leasing the task.
+    queue.lease(limit=1, visibility_timeout=0)
+
+    await worker.run_once()
+
+    items = repo.list_items(record.id)
+    assert [(item.status, item.reason) for item in items] == [
+        ("failed", "Gave up after 1 attempts")
+    ]
+    repo.close()
+    queue.close()
+
+
+def test_create_job_enqueues_in_queue_mode(tmp_path: Path) -> None:
+    repo = SqliteJobsRepository(tmp_path / "jobs.sqlite3")
+    queue = SqliteTaskQueue(tmp_path / "queue.sqlite3")
+    app.dependency_overrides[jobs.get_jobs_repo] = lambda: repo
+    app.dependency_overrides[jobs.get_task_queue] = lambda: queue
+    try:
+        response = TestClient(app).post(
+            "/jobs",
+            json={
+                "urls": ["https://pubmed.ncbi.nlm.nih.gov/1/", "https://pubmed.ncbi.nlm.nih.gov/2/"]
+            },
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 201
+    tasks = queue.lease(limit=10, visibility_timeout=30)
+    assert [task.payload["kind"] for task in tasks] == ["item", "item", "finish"]
+    assert repo.summary(response.json()["id"]).state == "queued"
+    repo.close()
+    queue.close()
+
+
+@pytest.mark.asyncio
+async def test_ranks_interleave_jobs_and_cancelled_jobs_are_skipped(tmp_path: Path) -> None:
+    repo, queue, worker = _worker(tmp_path, {})
+    bulk = repo.create([f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/" for pmid in range(1, 7)])
+    urgent = repo.create(["https://pubmed.ncbi.nlm.nih.gov/99/"])
+    jobs._enqueue_job(bulk.id, bulk.items, queue)
+    jobs._enqueue_job(urgent.id, urgent.items, queue, priority=2)
+
+    # The urgent job joins at the bulk job's current rank, then takes turns
+    # at twice its rate, so it finishes before the bulk backlog.
+    leased = queue.lease(limit=4, visibility_timeout=30)
+    assert [(task.payload["job_id"], task.payload["kind"]) for task in leased] == [
+        (bulk.id, "item"),
+        (urgent.id, "item"),
+        (bulk.id, "item"),
+        (urgent.id, "finish"),
+    ]
+    for task in leased:
+        queue.release(task)
+
+    repo.set_state(bulk.id, "cancelled")
+    repo.set_state(urgent.id, "cancelled")
+    assert await worker.run_once() == 4
+    assert await worker.run_once() == 4
+    assert await worker.run_once() == 1
+    assert queue.pending_count() == 0
+    assert repo.summary(bulk.id).counts == {"pending": 6}
+    repo.close()
+    queue.close()
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+
+from app.services.resolver.fetcher import AsyncHttpxHtmlFetcher
+from app.services.resolver.rate_limit import (
+    HostRateLimiter,
+    parse_retry_after,
+    registrable_domain,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_registrable_domain_collapses_subdomains() -> None:
+    assert registrable_domain("pubmed.ncbi.nlm.nih.gov") == "nih.gov"
+    assert registrable_domain("pmc.ncbi.nlm.nih.gov") == "nih.gov"
+    assert registrable_domain("academic.oup.co.uk") == "oup.co.uk"
+    assert registrable_domain("localhost") == "localhost"
+
+
+def test_parse_retry_after_accepts_seconds_and_dates() -> None:
+    now = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after("Mon, 01 Jan 2024 12:00:30 GMT", now=now) == 30.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_token_bucket_is_shared_per_domain() -> None:
+    clock = FakeClock()
+    limiter = HostRateLimiter(requests_per_second=2.0, burst=2, clock=clock)
+
+    assert limiter.reserve("nih.gov") == 0.0
+    assert limiter.reserve("nih.gov") == 0.0
+    assert limiter.reserve("nih.gov") == pytest.approx(0.5)
+    assert limiter.reserve("example.com") == 0.0
+
+    clock.now += 1.5
+    assert limiter.reserve("nih.gov") == 0.0
+
+
+def test_penalize_blocks_domain_until_retry_after() -> None:
+    clock = FakeClock()
+    limiter = HostRateLimiter(requests_per_second=0.0, clock=clock)
+
+    limiter.penalize("https://pubmed.ncbi.nlm.nih.gov/1/", retry_after=5.0)
+
+    assert limiter.reserve("nih.gov") == pytest.approx(5.0)
+    assert limiter.reserve("example.com") == 0.0
+
+
+def test_throttle_paces_only_the_host() -> None:
+    clock = FakeClock()
+    limiter = HostRateLimiter(requests_per_second=0.0, clock=clock)
+
+    limiter.throttle("https://www.ncbi.nlm.nih.gov", 0.5)
+
+    assert limiter.reserve("nih.gov", host="www.ncbi.nlm.nih.gov") == 0.0
+    assert limiter.reserve("nih.gov", host="www.ncbi.nlm.nih.gov") == pytest.approx(2.0)
+    assert limiter.reserve("nih.gov", host="eutils.ncbi.nlm.nih.gov") == 0.0
+    assert limiter.reserve("nih.gov", host="eutils.ncbi.nlm.nih.gov") == 0.0
+
+    limiter.unthrottle("https://www.ncbi.nlm.nih.gov")
+    assert limiter.reserve("nih.gov", host="www.ncbi.nlm.nih.gov") == 0.0
+
+
+@pytest.mark.asyncio
+async def test_alimit_caps_in_flight_per_host() -> None:
+    limiter = HostRateLimiter(requests_per_second=0.0, max_in_flight=2)
+    active = 0
+    peak = 0
+
+    async def request(url: str) -> None:
+        nonlocal active, peak
+        async with limiter.alimit(url):
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    await asyncio.gather(*(request(f"https://example.com/{n}") for n in range(10)))
+
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_async_fetcher_honours_retry_after() -> None:
+    calls: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(str(request.url))
+        if len(calls) == 1:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        return httpx.Response(200, text="<html>ok</html>")
+
+    limiter = HostRateLimiter(requests_per_second=0.0)
+    fetcher = AsyncHttpxHtmlFetcher(
+        timeout=1.0,
+        retries=1,
+        user_agent="test",
+        rate_limiter=limiter,
+        transport=httpx.MockTransport(handler),
+    )
+
+    html = await fetcher.fetch("https://example.com/article")
+    await fetcher.aclose()
+
+    assert html == "<html>ok</html>"
+    assert len(calls) == 2
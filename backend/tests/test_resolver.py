@@ -1,15 +1,20 @@
 from __future__ import annotations
 
+from pathlib import Path
+
 from app.services.resolver.fetcher import HtmlFetcher
 from app.services.resolver.manager import PubmedResolverManager
-from app.services.resolver.results import ResolutionSource
+from app.services.resolver.resolution_cache import ResolutionCache
+from app.services.resolver.results import PdfResolutionResult, ResolutionSource
 
 
 class StubFetcher(HtmlFetcher):
     def __init__(self, responses: dict[str, str]) -> None:
         self._responses = responses
+        self.calls: list[str] = []
 
     def fetch(self, url: str) -> str:
+        self.calls.append(url)
         return self._responses[url]
 
 
@@ -54,3 +59,37 @@ def test_resolver_reports_failure_when_no_sources() -> None:
     assert result.pdf_url is None
     assert result.reason == "No PDF source discovered"
 
+
+def test_resolution_cache_hit_skips_fetching(
+    tmp_path: Path, pubmed_pmc_html: str, pmc_pdf_html: str
+) -> None:
+    fetcher = StubFetcher(
+        {
+            "https://pubmed.ncbi.nlm.nih.gov/12345678/": pubmed_pmc_html,
+            "https://pmc.ncbi.nlm.nih.gov/articles/PMC7654321/": pmc_pdf_html,
+        }
+    )
+    cache = ResolutionCache(tmp_path / "resolutions.sqlite3", ttl=60, failure_ttl=10)
+    resolver = PubmedResolverManager(html_fetcher=fetcher, resolution_cache=cache)
+
+    first = resolver.resolve("https://pubmed.ncbi.nlm.nih.gov/12345678/")
+    second = resolver.resolve("https://pubmed.ncbi.nlm.nih.gov/12345678")
+
+    assert second == first
+    assert len(fetcher.calls) == 2
+
+
+def test_resolution_cache_expires_failures_sooner(tmp_path: Path) -> None:
+    now = [1000.0]
+    cache = ResolutionCache(
+        tmp_path / "resolutions.sqlite3", ttl=60, failure_ttl=10, clock=lambda: now[0]
+    )
+    cache.put("1", PdfResolutionResult.failure("No PDF source discovered"))
+    cache.put("2", PdfResolutionResult.success(ResolutionSource.pmc, "https://example.com/a.pdf"))
+
+    now[0] += 30
+
+    assert cache.get("1") is None
+    assert cache.get("2") == PdfResolutionResult.success(
+        ResolutionSource.pmc, "https://example.com/a.pdf"
+    )
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import httpx
+import pytest
+
+from app.api import jobs
+from app.repositories.jobs_repo import InMemoryJobsRepository
+from app.repositories.sqlite_jobs_repo import SqliteJobsRepository
+from app.services.queue import SqliteTaskQueue
+from app.services.resolver.exceptions import FetchError
+from app.services.resolver.fetcher import AsyncHttpxHtmlFetcher
+from app.services.resolver.idconv import StaticIdConverter
+from app.services.resolver.manager import AsyncPubmedResolverManager
+from app.services.resolver.resolution_cache import ResolutionCache
+from app.services.resolver.retry import RetryPolicy, is_transient
+from app.worker import Worker
+
+from .test_queue import FakeClock
+
+
+PUBMED_URL = "https://pubmed.ncbi.nlm.nih.gov/22223333/"
+
+
+def _status_error(status_code: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "https://a.example/")
+    response = httpx.Response(status_code, request=request)
+    return httpx.HTTPStatusError("error", request=request, response=response)
+
+
+@pytest.mark.parametrize(
+    ("error", "transient"),
+    [
+        (_status_error(503), True),
+        (_status_error(429), True),
+        (_status_error(404), False),
+        (httpx.ConnectError("refused"), True),
+        (httpx.ReadTimeout("slow"), True),
+        (httpx.TooManyRedirects("loop"), False),
+        (FetchError("gone"), False),
+        (FetchError("busy", transient=True), True),
+    ],
+)
+def test_errors_are_classified(error: Exception, transient: bool) -> None:
+    assert is_transient(error) is transient
+
+
+def test_backoff_is_jittered_capped_and_budgeted() -> None:
+    policy = RetryPolicy(
+        max_attempts=3, base_delay=2.0, max_delay=5.0, job_budget=3, random_fn=lambda: 1.0
+    )
+
+    assert [policy.backoff(attempt) for attempt in (1, 2, 3)] == [2.0, 4.0, 5.0]
+    assert policy.backoff(1, retry_after=4.0) == 4.0
+    assert RetryPolicy(random_fn=lambda: 0.0).backoff(5) == 0.0
+
+    assert policy.schedule("job", 1) == 2.0
+    assert policy.schedule("job", 3) is None
+    assert policy.schedule("job", 2) == 4.0
+    assert policy.schedule("job", 1) == 2.0
+    # The job has spent its budget; other jobs have their own.
+    assert policy.schedule("job", 1) is None
+    assert policy.schedule("other", 1) == 2.0
+    policy.forget("job")
+    assert policy.schedule("job", 1) == 2.0
+
+
+def _resolver(
+    routes: dict[str, list[httpx.Response]], seen: list[str], *, retries: int = 0, **options
+) -> AsyncPubmedResolverManager:
+    def handler(request: httpx.Request) -> httpx.Response:
+        url = str(request.url)
+        seen.append(url)
+        responses = routes.get(url)
+        if not responses:
+            return httpx.Response(404)
+        return responses.pop(0) if len(responses) > 1 else responses[0]
+
+    fetcher = AsyncHttpxHtmlFetcher(
+        timeout=1.0,
+        retries=retries,
+        user_agent="pubmed-pdf-scraper/0.1",
+        transport=httpx.MockTransport(handler),
+        retry_policy=RetryPolicy(random_fn=lambda: 0.0),
+    )
+    return AsyncPubmedResolverManager(html_fetcher=fetcher, **options)
+
+
+@pytest.mark.asyncio
+async def test_fetcher_retries_only_transient_errors() -> None:
+    seen: list[str] = []
+    routes = {
+        "https://a.example/busy": [httpx.Response(503), httpx.Response(200, text="ok")],
+        "https://a.example/down": [httpx.Response(502)],
+    }
+    resolver = _resolver(routes, seen, retries=2)
+    fetcher = resolver._fetcher
+
+    assert await fetcher.fetch("https://a.example/busy") == "ok"
+    with pytest.raises(FetchError) as missing:
+        await fetcher.fetch("https://a.example/missing")
+    with pytest.raises(FetchError) as down:
+        await fetcher.fetch("https://a.example/down")
+    await resolver.aclose()
+
+    assert seen.count("https://a.example/busy") == 2
+    assert seen.count("https://a.example/missing") == 1
+    assert seen.count("https://a.example/down") == 3
+    assert not missing.value.transient
+    assert down.value.transient
+
+
+@pytest.mark.asyncio
+async def test_transient_pmc_failure_stays_retryable(
+    tmp_path: Path, pubmed_pmc_html: str
+) -> None:
+    seen: list[str] = []
+    routes = {
+        "https://pubmed.ncbi.nlm.nih.gov/12345678/": [
+            httpx.Response(200, text=pubmed_pmc_html)
+        ],
+        "https://pmc.ncbi.nlm.nih.gov/articles/PMC7654321/": [httpx.Response(503)],
+    }
+    cache = ResolutionCache(tmp_path / "resolutions.sqlite3", ttl=3600, failure_ttl=3600)
+    resolver = _resolver(
+        routes,
+        seen,
+        id_converter=StaticIdConverter({"12345678": "7654321"}),
+        resolution_cache=cache,
+    )
+    url = "https://pubmed.ncbi.nlm.nih.gov/12345678/"
+
+    pmc_ids = await resolver.lookup_pmc_ids([url])
+    result = await resolver.resolve(url, pmc_id=pmc_ids.get(url))
+    assert result.retryable
+    assert cache.get("12345678") is None
+    await resolver.aclose()
+
+
+@pytest.mark.asyncio
+async def test_inline_job_requeues_transient_failures(
+    pubmed_external_html: str, external_pdf_html: str
+) -> None:
+    seen: list[str] = []
+    routes = {
+        PUBMED_URL: [httpx.Response(503), httpx.Response(200, text=pubmed_external_html)],
+        "https://pubmed.ncbi.nlm.nih.gov/1/": [httpx.Response(404)],
+        "https://journals.example.com/article": [httpx.Response(200, text=external_pdf_html)],
+    }
+    resolver = _resolver(routes, seen)
+    repo = InMemoryJobsRepository()
+    record = repo.create([PUBMED_URL, "https://pubmed.ncbi.nlm.nih.gov/1/"])
+    policy = RetryPolicy(base_delay=0.0)
+
+    await jobs._resolve_job(record.id, repo, resolver, 2, retry_policy=policy)
+    await resolver.aclose()
+
+    final = repo.get(record.id)
+    assert final is not None
+    assert [item.status for item in final.items] == ["resolved", "failed"]
+    assert seen.count(PUBMED_URL) == 2
+    # A 404 is permanent and is not tried again.
+    assert seen.count("https://pubmed.ncbi.nlm.nih.gov/1/") == 1
+
+
+@pytest.mark.asyncio
+async def test_worker_releases_transient_failures_with_backoff(
+    tmp_path: Path, pubmed_external_html: str, external_pdf_html: str
+) -> None:
+    seen: list[str] = []
+    routes = {
+        PUBMED_URL: [httpx.Response(503), httpx.Response(200, text=pubmed_external_html)],
+        "https://journals.example.com/article": [httpx.Response(200, text=external_pdf_html)],
+    }
+    clock = FakeClock()
+    repo = SqliteJobsRepository(tmp_path / "jobs.sqlite3", flush_interval=60)
+    queue = SqliteTaskQueue(tmp_path / "queue.sqlite3", clock=clock)
+    resolver = _resolver(routes, seen)
+    policy = RetryPolicy(base_delay=10.0, random_fn=lambda: 0.5)
+    worker = Worker(
+        repo=repo,
+        queue=queue,
+        resolver=resolver,
+        concurrency=4,
+        visibility_timeout=30,
+        # Deliberate releases for retries do not count as lost deliveries.
+        max_attempts=1,
+        retry_delay=1,
+        retry_policy=policy,
+    )
+    record = repo.create([PUBMED_URL])
+    jobs._enqueue_job(record.id, record.items, queue)
+
+    while await worker.run_once():
+        pass
+    assert repo.get(record.id).items[0].status == "pending"
+
+    # The item becomes visible again once its backoff has passed; the finish
+    # task leased beside it runs once more after `retry_delay`.
+    for _ in range(2):
+        clock.now += 5
+        while await worker.run_once():
+            pass
+    await resolver.aclose()
+
+    final = repo.get(record.id)
+    assert final.items[0].status == "resolved"
+    assert final.state == "done"
+    assert seen.count(PUBMED_URL) == 2
+    # Finishing the job released its retry budget.
+    assert record.id not in policy._spent
+    repo.close()
+    queue.close()
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import httpx
+import pytest
+
+from app.services.resolver.exceptions import RobotsDisallowedError
+from app.services.resolver.fetcher import AsyncHttpxHtmlFetcher
+from app.services.resolver.manager import AsyncPubmedResolverManager
+from app.services.resolver.rate_limit import HostRateLimiter
+from app.services.resolver.robots import RobotsPolicy, RobotsStore, parse_robots
+
+
+ROBOTS = """
+User-agent: *
+Disallow: /
+
+User-agent: pubmed-pdf-scraper
+User-agent: other-bot
+Disallow: /private
+Allow: /private/open
+Disallow: /*.cgi$
+Crawl-delay: 2
+"""
+
+
+def test_parser_picks_our_group_and_longest_match() -> None:
+    rules = parse_robots(ROBOTS, "pubmed-pdf-scraper/0.1")
+    generic = parse_robots(ROBOTS, "someone-else/1.0")
+
+    assert rules.allows("https://a.example/article/1")
+    assert not rules.allows("https://a.example/private/x")
+    assert rules.allows("https://a.example/private/open/x")
+    assert not rules.allows("https://a.example/bin/search.cgi")
+    assert rules.allows("https://a.example/bin/search.cgi?q=1")
+    assert rules.crawl_delay == 2
+    assert not generic.allows("https://a.example/article/1")
+    assert generic.allows("https://a.example/robots.txt")
+
+
+def _fetcher(robots: RobotsPolicy, routes: dict[str, httpx.Response], seen: list[str]):
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(str(request.url))
+        return routes.get(str(request.url), httpx.Response(404))
+
+    return AsyncHttpxHtmlFetcher(
+        timeout=1.0,
+        retries=0,
+        user_agent="pubmed-pdf-scraper/0.1",
+        transport=httpx.MockTransport(handler),
+        robots=robots,
+    )
+
+
+@pytest.mark.asyncio
+async def test_fetcher_checks_robots_once_per_origin(tmp_path: Path) -> None:
+    routes = {
+        "https://a.example/robots.txt": httpx.Response(200, text=ROBOTS),
+        "https://a.example/article/1": httpx.Response(200, text="one"),
+        "https://a.example/article/2": httpx.Response(200, text="two"),
+        "https://b.example/page": httpx.Response(200, text="b"),
+    }
+    seen: list[str] = []
+    limiter = HostRateLimiter(requests_per_second=0)
+    store = RobotsStore(tmp_path / "robots.sqlite3")
+    fetcher = _fetcher(
+        RobotsPolicy(user_agent="pubmed-pdf-scraper/0.1", store=store, rate_limiter=limiter),
+        routes,
+        seen,
+    )
+
+    assert await fetcher.fetch("https://a.example/article/1") == "one"
+    assert await fetcher.fetch("https://a.example/article/2") == "two"
+    with pytest.raises(RobotsDisallowedError):
+        await fetcher.fetch("https://a.example/private/x")
+    # b.example has no robots.txt; that answer is cached as well.
+    assert await fetcher.fetch("https://b.example/page") == "b"
+    assert await fetcher.fetch("https://b.example/page") == "b"
+    await fetcher.aclose()
+
+    assert seen.count("https://a.example/robots.txt") == 1
+    assert seen.count("https://b.example/robots.txt") == 1
+    assert "https://a.example/private/x" not in seen
+    # The crawl delay caps a.example at one request every two seconds.
+    assert limiter.reserve("a.example", host="a.example") == 0
+    assert limiter.reserve("a.example", host="a.example") == pytest.approx(2, abs=0.05)
+
+    # Another process sharing the store does not fetch robots.txt again.
+    other_seen: list[str] = []
+    other_policy = RobotsPolicy(user_agent="pubmed-pdf-scraper/0.1", store=store)
+    other = _fetcher(other_policy, routes, other_seen)
+    with pytest.raises(RobotsDisallowedError):
+        await other.fetch("https://a.example/private/y")
+    await other.aclose()
+    store.close()
+    assert other_seen == []
+
+
+@pytest.mark.asyncio
+async def test_disallowed_branch_has_its_own_failure_reason() -> None:
+    routes = {
+        "https://pubmed.ncbi.nlm.nih.gov/robots.txt": httpx.Response(404),
+        "https://pubmed.ncbi.nlm.nih.gov/5/": httpx.Response(
+            200,
+            text="<div class='full-text-links'><a href='https://j.example/a/5'>Journal</a></div>",
+        ),
+        "https://j.example/robots.txt": httpx.Response(200, text="User-agent: *\nDisallow: /a/"),
+    }
+    seen: list[str] = []
+    fetcher = _fetcher(RobotsPolicy(user_agent="pubmed-pdf-scraper/0.1"), routes, seen)
+    resolver = AsyncPubmedResolverManager(html_fetcher=fetcher)
+
+    result = await resolver.resolve("https://pubmed.ncbi.nlm.nih.gov/5/")
+    await resolver.aclose()
+
+    assert result.reason == "Disallowed by robots.txt"
+    assert "https://j.example/a/5" not in seen
+
+
+@pytest.mark.asyncio
+async def test_unreachable_robots_txt_blocks_transiently() -> None:
+    routes = {
+        "https://pubmed.ncbi.nlm.nih.gov/robots.txt": httpx.Response(503),
+        "https://pubmed.ncbi.nlm.nih.gov/5/": httpx.Response(200, text="page"),
+    }
+    seen: list[str] = []
+    policy = RobotsPolicy(user_agent="pubmed-pdf-scraper/0.1", failure_ttl=60)
+    fetcher = _fetcher(policy, routes, seen)
+    resolver = AsyncPubmedResolverManager(html_fetcher=fetcher)
+
+    with pytest.raises(RobotsDisallowedError) as blocked:
+        await fetcher.fetch("https://pubmed.ncbi.nlm.nih.gov/5/")
+    result = await resolver.resolve("https://pubmed.ncbi.nlm.nih.gov/5/")
+    await resolver.aclose()
+
+    assert blocked.value.transient
+    assert blocked.value.retry_after == 60
+    assert result.retryable
+    assert result.retry_after == 60
+    assert "https://pubmed.ncbi.nlm.nih.gov/5/" not in seen
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+
+import pytest
+
+from app.services.scheduler import FairScheduler
+
+
+def _recorder(order: list[str], label: str, delay: float = 0.0):
+    async def run(item: int) -> None:
+        order.append(f"{label}{item}")
+        await asyncio.sleep(delay)
+
+    return run
+
+
+@pytest.mark.asyncio
+async def test_jobs_share_workers_by_weight() -> None:
+    scheduler = FairScheduler(workers=1)
+    order: list[str] = []
+    light = scheduler.submit("a", run=_recorder(order, "a"), weight=1)
+    heavy = scheduler.submit("b", run=_recorder(order, "b"), weight=2)
+    light.add(range(3))
+    heavy.add(range(6))
+    for job in (light, heavy):
+        job.close()
+
+    await asyncio.gather(light.wait(), heavy.wait())
+    await scheduler.stop()
+
+    assert order[:6] == ["a0", "b0", "b1", "a1", "b2", "b3"]
+    assert sorted(order) == sorted([*(f"a{n}" for n in range(3)), *(f"b{n}" for n in range(6))])
+
+
+@pytest.mark.asyncio
+async def test_late_job_runs_before_earlier_backlog() -> None:
+    scheduler = FairScheduler(workers=2)
+    order: list[str] = []
+    bulk = scheduler.submit("bulk", run=_recorder(order, "bulk", 0.01), max_in_flight=2)
+    bulk.add(range(50))
+    bulk.close()
+    await asyncio.sleep(0.03)
+
+    single = scheduler.submit("single", run=_recorder(order, "single"), max_in_flight=2)
+    single.add([0])
+    single.close()
+    await single.wait()
+
+    assert len(order) < 15
+    bulk.cancel()
+    await bulk.wait()
+    await scheduler.stop()
+
+
+@pytest.mark.asyncio
+async def test_cancel_drops_queued_items_and_respects_in_flight_cap() -> None:
+    scheduler = FairScheduler(workers=4)
+    order: list[str] = []
+    job = scheduler.submit("a", run=_recorder(order, "a", 0.02), max_in_flight=2)
+    job.add(range(10))
+    await asyncio.sleep(0.01)
+    assert job.in_flight == 2
+
+    job.cancel()
+    await job.wait()
+    await scheduler.stop()
+
+    assert order == ["a0", "a1"]
+    assert scheduler.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_escaping_errors_are_logged_and_the_worker_survives(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    scheduler = FairScheduler(workers=1)
+    done: list[int] = []
+
+    async def run(item: int) -> None:
+        if item == 0:
+            raise RuntimeError("boom")
+        done.append(item)
+
+    job = scheduler.submit("a", run=run)
+    job.add(range(3))
+    job.close()
+    with caplog.at_level(logging.ERROR, logger="app.services.scheduler"):
+        await asyncio.wait_for(job.wait(), 2)
+    await scheduler.stop()
+
+    assert done == [1, 2]
+    assert "boom" in caplog.text
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import jobs
+from app.main import app
+from app.repositories.jobs_repo import InMemoryJobsRepository
+from app.services.resolver.manager import AsyncPubmedResolverManager
+from app.services.queue import SqliteTaskQueue
+from app.services.search import PubmedSearchClient, SearchError
+
+from .test_async_resolver import AsyncStubFetcher
+
+
+def _client(base_url: str, batch_size: int) -> PubmedSearchClient:
+    return PubmedSearchClient(
+        base_url=base_url, batch_size=batch_size, timeout=5.0, user_agent="test"
+    )
+
+
+async def _collect(client: PubmedSearchClient, query: str, max_results: int) -> list[list[str]]:
+    batches = [batch async for batch in client.iter_pmids(query, max_results=max_results)]
+    await client.aclose()
+    return batches
+
+
+@pytest.mark.asyncio
+async def test_search_pages_through_history(esearch_server) -> None:
+    esearch_server.results = {"asthma": [str(pmid) for pmid in range(1, 26)]}
+
+    batches = await _collect(_client(esearch_server.base_url, 10), "asthma", 1_000)
+
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+    assert [pmid for batch in batches for pmid in batch] == esearch_server.results["asthma"]
+    first, *rest = esearch_server.requests
+    assert first["term"] == "asthma" and first["usehistory"] == "y"
+    assert all(request["WebEnv"] == "WEBENV_0" and "term" not in request for request in rest)
+    assert [request["retstart"] for request in rest] == ["10", "20"]
+
+
+@pytest.mark.asyncio
+async def test_search_stops_at_max_results(esearch_server) -> None:
+    esearch_server.results = {"asthma": [str(pmid) for pmid in range(1, 26)]}
+
+    batches = await _collect(_client(esearch_server.base_url, 10), "asthma", 12)
+
+    assert [len(batch) for batch in batches] == [10, 2]
+    assert esearch_server.requests[-1]["retmax"] == "2"
+
+
+class _GatedSearcher:
+    """Yields one batch, then waits until the test releases the second."""
+
+    def __init__(self) -> None:
+        self.release = asyncio.Event()
+
+    async def iter_pmids(self, query: str, *, max_results: int):
+        yield ["1"]
+        await self.release.wait()
+        yield ["2"]
+
+
+@pytest.mark.asyncio
+async def test_resolution_starts_before_search_finishes() -> None:
+    no_links = "<html><body>No links</body></html>"
+    fetcher = AsyncStubFetcher(
+        {
+            "https://pubmed.ncbi.nlm.nih.gov/1/": no_links,
+            "https://pubmed.ncbi.nlm.nih.gov/2/": no_links,
+        }
+    )
+    resolver = AsyncPubmedResolverManager(html_fetcher=fetcher)
+    searcher = _GatedSearcher()
+    repo = InMemoryJobsRepository()
+    record = repo.create([])
+
+    task = asyncio.create_task(
+        jobs._search_job(record.id, "q", 10, repo, resolver, searcher, 2)
+    )
+    for _ in range(100):
+        items = repo.list_items(record.id)
+        if items and items[0].status != "pending":
+            break
+        await asyncio.sleep(0.01)
+    assert [item.status for item in repo.list_items(record.id)] == ["failed"]
+    searcher.release.set()
+    await task
+
+    final = repo.get(record.id)
+    assert final is not None
+    assert [item.url for item in final.items] == [
+        "https://pubmed.ncbi.nlm.nih.gov/1/",
+        "https://pubmed.ncbi.nlm.nih.gov/2/",
+    ]
+    assert final.state == "failed"
+
+
+class _FailingSearcher:
+    async def iter_pmids(self, query: str, *, max_results: int):
+        yield ["1"]
+        raise SearchError("esearch request failed: 502")
+
+
+@pytest.mark.asyncio
+async def test_queued_search_failure_is_logged_and_fails_the_job(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    repo = InMemoryJobsRepository()
+    queue = SqliteTaskQueue(tmp_path / "queue.sqlite3")
+    record = repo.create([])
+
+    with caplog.at_level(logging.ERROR, logger="app.api.jobs"):
+        await jobs._enqueue_search_job(record.id, "q", 10, repo, _FailingSearcher(), queue)
+    tasks = queue.lease(limit=10, visibility_timeout=30)
+    queue.close()
+
+    assert [task.payload["kind"] for task in tasks] == ["item", "finish"]
+    assert tasks[-1].payload["source_failed"]
+    assert "Search for job" in caplog.text
+
+
+def test_create_job_requires_exactly_one_source(monkeypatch: pytest.MonkeyPatch) -> None:
+    captured: list[tuple[str, int]] = []
+
+    async def fake_search_job(job_id, query, max_results, *args, **options) -> None:
+        captured.append((query, max_results))
+
+    monkeypatch.setattr(jobs, "_search_job", fake_search_job)
+    app.dependency_overrides[jobs.get_jobs_repo] = InMemoryJobsRepository
+    try:
+        client = TestClient(app)
+        accepted = client.post("/jobs", json={"query": "asthma", "max_results": 10**9})
+        neither = client.post("/jobs", json={})
+        both = client.post(
+            "/jobs", json={"query": "asthma", "urls": ["https://pubmed.ncbi.nlm.nih.gov/1/"]}
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert accepted.status_code == 201
+    assert captured == [("asthma", jobs.get_settings().search_max_results)]
+    assert neither.status_code == 422
+    assert both.status_code == 422
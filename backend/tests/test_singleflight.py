@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.services.resolver.manager import AsyncPubmedResolverManager
+from app.services.resolver.singleflight import AsyncSingleFlightHtmlFetcher, SingleFlight
+
+from .test_async_resolver import AsyncStubFetcher
+
+
+@pytest.mark.asyncio
+async def test_concurrent_resolves_for_same_pmid_share_one_pipeline() -> None:
+    fetcher = AsyncStubFetcher(
+        {"https://pubmed.ncbi.nlm.nih.gov/42/": "<html><body>No links</body></html>"},
+        delay=0.01,
+    )
+    resolver = AsyncPubmedResolverManager(html_fetcher=fetcher)
+
+    results = await asyncio.gather(
+        resolver.resolve("https://pubmed.ncbi.nlm.nih.gov/42/"),
+        resolver.resolve("https://pubmed.ncbi.nlm.nih.gov/42"),
+        resolver.resolve("https://pubmed.ncbi.nlm.nih.gov/42/"),
+    )
+
+    assert len({result.reason for result in results}) == 1
+    assert fetcher.max_in_flight == 1
+    assert resolver.inflight_stats.calls == 3
+    assert resolver.inflight_stats.coalesced == 2
+
+
+@pytest.mark.asyncio
+async def test_async_fetcher_coalesces_equivalent_urls() -> None:
+    inner = AsyncStubFetcher({"https://Example.com/page#top": "<html></html>"}, delay=0.01)
+    fetcher = AsyncSingleFlightHtmlFetcher(inner)
+
+    await asyncio.gather(
+        fetcher.fetch("https://Example.com/page#top"),
+        fetcher.fetch("https://example.com/page"),
+    )
+
+    assert inner.max_in_flight == 1
+    assert fetcher.stats.coalesced == 1
+
+
+def test_thread_single_flight_shares_result_and_errors() -> None:
+    group: SingleFlight[str] = SingleFlight()
+    started = threading.Event()
+    calls: list[int] = []
+
+    def slow() -> str:
+        calls.append(1)
+        started.set()
+        time.sleep(0.05)
+        return "value"
+
+    results: list[str] = []
+    leader = threading.Thread(target=lambda: results.append(group.do("k", slow)))
+    leader.start()
+    started.wait()
+    followers = [
+        threading.Thread(target=lambda: results.append(group.do("k", slow))) for _ in range(3)
+    ]
+    for thread in followers:
+        thread.start()
+    for thread in [leader, *followers]:
+        thread.join()
+
+    assert results == ["value"] * 4
+    assert len(calls) == 1
+
+    def boom() -> str:
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        group.do("k", boom)
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import multiprocessing
+from pathlib import Path
+
+import pytest
+
+from app.api import jobs
+from app.repositories.sqlite_jobs_repo import SqliteJobsRepository
+from app.services.resolver.manager import AsyncPubmedResolverManager
+
+from .test_async_resolver import AsyncStubFetcher
+
+
+def test_jobs_survive_reopen(tmp_path: Path) -> None:
+    path = tmp_path / "jobs.sqlite3"
+    repo = SqliteJobsRepository(path, batch_size=100, flush_interval=60)
+    record = repo.create(["https://a.example/1", "https://a.example/2"])
+    repo.append_items(record.id, ["https://a.example/3"])
+    repo.update_item(record.id, 1, status="resolved", pdf_url="https://p/2")
+    repo.set_state(record.id, "done")
+    repo.close()
+
+    reopened = SqliteJobsRepository(path)
+    stored = reopened.get(record.id)
+    reopened.close()
+
+    assert stored is not None
+    assert stored.state == "done"
+    assert stored.created_at == record.created_at
+    assert [(item.index, item.url, item.status, item.pdf_url) for item in stored.items] == [
+        (0, "https://a.example/1", "pending", None),
+        (1, "https://a.example/2", "resolved", "https://p/2"),
+        (2, "https://a.example/3", "pending", None),
+    ]
+
+
+def test_buffered_updates_are_visible_to_reads(tmp_path: Path) -> None:
+    repo = SqliteJobsRepository(tmp_path / "jobs.sqlite3", batch_size=100, flush_interval=60)
+    record = repo.create(["https://a.example/1"])
+
+    repo.update_item(record.id, 0, status="failed", reason="nope")
+
+    assert [(item.status, item.reason) for item in repo.list_items(record.id)] == [
+        ("failed", "nope")
+    ]
+    assert repo.get("missing") is None
+    assert repo.append_items("missing", ["https://a.example/2"]) == []
+    repo.close()
+
+
+@pytest.mark.asyncio
+async def test_resolve_job_on_sqlite_repo(tmp_path: Path) -> None:
+    responses = {
+        f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/": "<html><body>No links</body></html>"
+        for pmid in range(1, 11)
+    }
+    resolver = AsyncPubmedResolverManager(html_fetcher=AsyncStubFetcher(responses))
+    repo = SqliteJobsRepository(tmp_path / "jobs.sqlite3", batch_size=4)
+    record = repo.create(list(responses))
+
+    await jobs._resolve_job(record.id, repo, resolver, 3)
+
+    final = repo.get(record.id)
+    repo.close()
+    assert final is not None
+    assert final.state == "failed"
+    assert {item.reason for item in final.items} == {"No PDF source discovered"}
+
+
+def _update_items(path: str, job_id: str, indexes: list[int]) -> None:
+    repo = SqliteJobsRepository(path, batch_size=4, flush_interval=60)
+    for index in indexes:
+        repo.update_item(job_id, index, status="resolved", pdf_url=f"https://p/{index}")
+    repo.close()
+
+
+def test_processes_share_the_database_without_losing_updates(tmp_path: Path) -> None:
+    path = str(tmp_path / "jobs.sqlite3")
+    repo = SqliteJobsRepository(path)
+    record = repo.create([f"https://a.example/{index}" for index in range(400)])
+
+    context = multiprocessing.get_context("spawn")
+    workers = [
+        context.Process(target=_update_items, args=(path, record.id, list(range(start, 400, 4))))
+        for start in range(4)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=60)
+
+    summary = repo.summary(record.id)
+    repo.close()
+    assert [worker.exitcode for worker in workers] == [0, 0, 0, 0]
+    assert summary is not None
+    assert summary.counts == {"resolved": 400}
+    assert summary.version == 800
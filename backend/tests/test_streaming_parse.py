@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from typing import AsyncIterator
+
+import httpx
+import pytest
+
+from app.services.resolver.fetcher import AsyncHttpxHtmlFetcher
+from app.services.resolver.html_parser import PubmedPageParser, PubmedStreamScanner
+from app.services.resolver.manager import AsyncPubmedResolverManager
+from app.services.resolver.results import ResolutionSource
+
+from .conftest import FIXTURES
+from .test_async_resolver import AsyncStubFetcher
+
+
+@pytest.mark.parametrize("path", sorted(FIXTURES.glob("pubmed_*.html")), ids=lambda p: p.name)
+def test_stream_scanner_matches_full_parse(path) -> None:
+    html = path.read_text(encoding="utf-8")
+    scanner = PubmedStreamScanner(pmid="12345678")
+
+    for start in range(0, len(html), 17):
+        if scanner.feed(html[start : start + 17]):
+            break
+
+    assert scanner.metadata() == PubmedPageParser().parse(html, pmid="12345678")
+
+
+def test_stream_scanner_can_stop_at_pmcid_meta() -> None:
+    scanner = PubmedStreamScanner(pmid="1", stop_at_pmcid=True)
+
+    assert scanner.feed('<html><head><meta name="citation_pmcid" content="PMC42">')
+    assert scanner.metadata().pmc_id == "42"
+
+
+@pytest.mark.asyncio
+async def test_fetch_partial_hangs_up_after_links_block(
+    pubmed_pmc_html: str, pmc_pdf_html: str
+) -> None:
+    served_chunks: list[int] = []
+    padding = ["<p>" + "x" * 1000 + "</p>"] * 200
+
+    async def body() -> AsyncIterator[bytes]:
+        head, _, tail = pubmed_pmc_html.partition("</body>")
+        for index, chunk in enumerate([head, *padding, "</body>" + tail]):
+            served_chunks.append(index)
+            yield chunk.encode("utf-8")
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=body(), headers={"Content-Type": "text/html"})
+
+    streamer = AsyncHttpxHtmlFetcher(
+        timeout=1.0, retries=0, user_agent="test", transport=httpx.MockTransport(handler)
+    )
+    resolver = AsyncPubmedResolverManager(
+        html_fetcher=AsyncStubFetcher(
+            {"https://pmc.ncbi.nlm.nih.gov/articles/PMC7654321/": pmc_pdf_html}
+        ),
+        page_streamer=streamer,
+    )
+
+    result = await resolver.resolve("https://pubmed.ncbi.nlm.nih.gov/12345678/")
+    await streamer.aclose()
+
+    assert result.source == ResolutionSource.pmc
+    assert len(served_chunks) == 1